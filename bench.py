@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Script to benchmark the site tooling offline and catch performance regressions.
+
+Suites (everything runs locally, nothing is downloaded):
+    extract   generate_project_pages.extract_fields over synthetic corpora of
+              10, 1k and 10k cards (copies of project_cards/ with numbered titles)
+    generate  build_card_data + the streamed TEMPLATE render for the same corpora
+    serve     server.py's engine under server.run_load on a local port
+    encode    converter.make_videos on an ffmpeg testsrc clip at every --quality
+              preset (skipped when ffmpeg is not installed)
+
+Results are written as JSON and compared with a stored baseline; the run fails
+when any result is more than --threshold worse than its baseline:
+    python bench.py --save-baseline             # record this machine's numbers
+    python bench.py                             # run, compare, exit 1 on a regression
+    python bench.py --suites extract generate --sizes 10 1000
+    python bench.py --threshold 0.25 -o /tmp/bench.json
+
+Baselines only mean something on the machine that recorded them, so the
+machine is stored alongside and a mismatch is pointed out.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+import converter
+import generate_project_pages
+import server
+
+BASE_DIR = Path(__file__).resolve().parent
+RESULTS_FILE = BASE_DIR / 'bench_results.json'
+BASELINE_FILE = BASE_DIR / 'bench_baseline.json'
+SUITES = ['extract', 'generate', 'serve', 'encode']
+CORPUS_SIZES = [10, 1000, 10000]
+THRESHOLD = 0.20
+QUALITIES = ['low', 'medium', 'high']
+# Synthetic clip for the encode suite: 720p testsrc, encoded down like a real project clip
+TESTSRC = 'testsrc=duration=4:size=1280x720:rate=30'
+CLIP = {'width': 480, 'fps': 12, 'speed': 1.0, 'seconds': 4.0}
+
+def best_of(repeat, fn):
+    """Fastest of `repeat` samples of fn(), in seconds per call.
+
+    Each sample loops fn() for at least 0.2 s (timeit's autorange), so small
+    corpora aren't timed on a handful of microseconds.
+    """
+    timer = timeit.Timer(fn)
+    number, first = timer.autorange()
+    samples = [first] + (timer.repeat(repeat - 1, number) if repeat > 1 else [])
+    return min(samples) / number
+
+def result(value, unit, better, **extra):
+    return {'value': round(value, 6), 'unit': unit, 'better': better, **extra}
+
+def card_corpus(size):
+    """`size` card documents, cycling through project_cards/ with numbered titles."""
+    cards = [path.read_text(encoding='utf-8')
+             for path in sorted((BASE_DIR / 'project_cards').rglob('*.html'))]
+    titles = [generate_project_pages.extract_fields(card)['title'] for card in cards]
+    corpus = []
+    for i in range(size):
+        card, title = cards[i % len(cards)], titles[i % len(cards)]
+        corpus.append(card.replace(title, f"{title} {i}", 1) if title else card)
+    return corpus
+
+def bench_extract(sizes, repeat):
+    results = {}
+    for size in sizes:
+        corpus = card_corpus(size)
+        seconds = best_of(repeat if size < 10000 else 1,
+                          lambda: [generate_project_pages.extract_fields(card) for card in corpus])
+        results[f'extract/{size}'] = result(seconds / size * 1e6, 'us/card', 'lower', cards=size)
+        print(f"  extract  {size:>6} cards: {seconds / size * 1e6:8.1f} µs/card")
+    return results
+
+def bench_generate(sizes, repeat):
+    results = {}
+    variants = generate_project_pages.responsive_images.load_variants(BASE_DIR)
+    for size in sizes:
+        fields = [generate_project_pages.extract_fields(card) for card in card_corpus(size)]
+        seconds = best_of(repeat if size < 10000 else 1, lambda: [
+            generate_project_pages.write_page(io.BytesIO(),
+                                              generate_project_pages.build_card_data(f, variants))
+            for f in fields])
+        results[f'generate/{size}'] = result(seconds / size * 1e6, 'us/page', 'lower', cards=size)
+        print(f"  generate {size:>6} pages: {seconds / size * 1e6:8.1f} µs/page")
+    return results
+
+def bench_serve(requests, concurrency):
+    paths = [path for path in server.BENCH_PATHS if (BASE_DIR / path).is_file()]
+    httpd = server.make_server(0, quiet=True)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{httpd.server_address[1]}"
+        server.run_load(url, paths, min(200, requests), concurrency)  # warm the file cache
+        stats = server.run_load(url, paths, requests, concurrency)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+    print(f"  serve    {stats['rps']:8.1f} req/s  p50 {stats['p50_ms']:.2f} ms  "
+          f"p99 {stats['p99_ms']:.2f} ms  {stats['errors']} errors")
+    extra = {'requests': requests, 'concurrency': concurrency}
+    return {
+        'serve/rps': result(stats['rps'], 'req/s', 'higher', **extra),
+        'serve/p50': result(stats['p50_ms'], 'ms', 'lower', **extra),
+        'serve/p99': result(stats['p99_ms'], 'ms', 'lower', **extra),
+        'serve/errors': result(stats['errors'], 'errors', 'lower', **extra),
+    }
+
+@contextlib.contextmanager
+def captured_stderr(log_path):
+    """Send this process's (and its children's) stderr to a file; ffmpeg is chatty."""
+    sys.stderr.flush()
+    saved = os.dup(2)
+    with open(log_path, 'wb') as log:
+        os.dup2(log.fileno(), 2)
+        try:
+            yield
+        finally:
+            os.dup2(saved, 2)
+            os.close(saved)
+
+def bench_encode():
+    if not converter.has_ffmpeg():
+        print("  ⚠️  ffmpeg not found, skipping the encode suite")
+        return {}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        tmp = Path(tmp)
+        source = tmp / 'testsrc.mp4'
+        subprocess.run(['ffmpeg', '-y', '-nostdin', '-loglevel', 'error', '-f', 'lavfi', '-i', TESTSRC,
+                        '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', str(source)],
+                       check=True)
+        for quality in QUALITIES:
+            out_base = tmp / f'clip-{quality}'
+            started = time.perf_counter()
+            try:
+                with captured_stderr(tmp / 'ffmpeg.log'):
+                    converter.make_videos(source, 0.0, CLIP['seconds'], out_base, CLIP['width'],
+                                          CLIP['fps'], CLIP['speed'], quality)
+            except subprocess.CalledProcessError:
+                print((tmp / 'ffmpeg.log').read_text(errors='replace')[-2000:])
+                raise
+            seconds = time.perf_counter() - started
+            size = sum(out_base.with_suffix(ext).stat().st_size for ext in ('.mp4', '.webm'))
+            results[f'encode/{quality}'] = result(seconds, 's', 'lower', bytes=size, **CLIP)
+            results[f'encode/{quality}/bytes'] = result(size, 'bytes', 'lower', **CLIP)
+            print(f"  encode   {quality:>6}: {seconds:6.2f} s  {size / 1e3:7.1f} kB (mp4 + webm)")
+    return results
+
+def machine():
+    return {'platform': platform.platform(), 'python': platform.python_version(),
+            'cpus': os.cpu_count(), 'node': platform.node()}
+
+def compare(results, baseline, threshold):
+    """Print each result against the baseline; returns the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<24} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<24} {'-':>12} {current['value']:>12,.2f} {'new':>8}")
+            continue
+        base, value = previous['value'], current['value']
+        change = (value - base) / base if base else 0.0
+        worse = change if current['better'] == 'lower' else -change
+        if base == 0:
+            worse = 1.0 if value > 0 and current['better'] == 'lower' else 0.0
+        flag = ''
+        if worse > threshold:
+            regressions.append(name)
+            flag = '  ❌'
+        print(f"{name:<24} {base:>12,.2f} {value:>12,.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main():
+    """Run the selected suites, save the results and compare them with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--sizes', nargs='+', type=int, default=CORPUS_SIZES,
+                        help='card corpus sizes for extract/generate')
+    parser.add_argument('--repeat', type=int, default=5, help='samples per case, the fastest counts')
+    parser.add_argument('--requests', type=int, default=2000, help='serve: total requests')
+    parser.add_argument('--concurrency', type=int, default=16, help='serve: client threads')
+    parser.add_argument('-o', '--output', type=Path, default=RESULTS_FILE, help='results JSON')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help='baseline JSON')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store these results as the new baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='allowed slowdown before a result counts as a regression (0.2 = 20%%)')
+    args = parser.parse_args()
+
+    print(f"Benchmarking {', '.join(args.suites)} on {platform.node()} ({os.cpu_count()} cpus)")
+    results = {}
+    if 'extract' in args.suites:
+        results.update(bench_extract(args.sizes, args.repeat))
+    if 'generate' in args.suites:
+        results.update(bench_generate(args.sizes, args.repeat))
+    if 'serve' in args.suites:
+        results.update(bench_serve(args.requests, args.concurrency))
+    if 'encode' in args.suites:
+        results.update(bench_encode())
+
+    report = {'version': 1, 'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+              'machine': machine(), 'results': results}
+    args.output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"✓ Results written to {args.output}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"\n✅ Saved {len(results)} results as the baseline ({args.baseline.name})")
+        return
+    try:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        print(f"\n⚠️  No baseline at {args.baseline}, run with --save-baseline to record one")
+        return
+    if baseline.get('machine') != report['machine']:
+        print(f"⚠️  Baseline was recorded on {baseline.get('machine', {}).get('node', 'another machine')} "
+              f"({baseline.get('created', '?')}), numbers may not be comparable")
+
+    regressions = compare(results, baseline.get('results', {}), args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        raise SystemExit(1)
+    print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
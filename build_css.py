@@ -0,0 +1,790 @@
+#!/usr/bin/env python3
+"""
+Script to compile the site's stylesheet ahead of time, replacing the Tailwind CDN.
+
+The pages used to load https://cdn.tailwindcss.com, a JIT compiler that scans
+the DOM and generates CSS in the browser on every visit, before the page can
+paint correctly. This does the same job once, at build time. It collects the
+classes used by the top-level pages, projects/*.html, the project_cards/
+fragments and the TEMPLATE in generate_project_pages.py, plus the class names
+the scripts add at runtime (string literals in js/ and inline <script>s). It
+compiles the ones it knows with Tailwind v3 semantics, including arbitrary
+values such as bg-[#111714]/80 or font-['Space_Grotesk',_sans-serif] and the
+sm:/md:/lg:/hover:/focus:/group-hover: variants, and writes them to
+css/site.css together with Preflight and the rules in css/site.src.css:
+    python build_css.py
+    python build_css.py --minify
+    python build_css.py --check      # exit 1 if css/site.css is out of date
+
+css/site.src.css is what used to be the <style type="text/tailwindcss"> block:
+@tailwind directives mark where the base, components and utilities layers go,
+@layer base rules are always kept, and @layer components/utilities rules are
+kept only when a page uses their class. Classes in the markup that neither
+compile nor appear in the source are listed at the end, since they style
+nothing.
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+SOURCE_CSS = 'css/site.src.css'
+OUTPUT_CSS = 'css/site.css'
+# Markup whose class attributes are compiled (and reported when unknown)
+CONTENT_GLOBS = ['*.html', 'projects/*.html', 'project_cards/**/*.html']
+# Generators whose HTML snippets hold class attributes (compiled, never reported)
+TEMPLATE_GLOBS = ['generate_project_pages.py']
+# Scripts whose string literals may hold class names; vendored *.min.js are skipped
+SCRIPT_GLOBS = ['js/*.js']
+# Classes that only mark an element for other selectors (group-hover:, peer-*)
+MARKER_RE = re.compile(r'^(?:group|peer)(?:/[\w-]+)?$')
+
+CLASS_ATTR_RE = re.compile(r'''\bclass=(["'])(.*?)\1''', re.DOTALL)
+SCRIPT_RE = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+SCRIPT_TOKEN_RE = re.compile(r'''[^\s'"`<>{};]+''')
+CLASS_SELECTOR_RE = re.compile(r'\.((?:\\.|[\w-])+)')
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+HEX_RE = re.compile(r'#([0-9a-fA-F]{3}|[0-9a-fA-F]{6})')
+RGB_RE = re.compile(r'rgb\((\d+ \d+ \d+)')
+COLOR_RE = re.compile(r'#[0-9a-fA-F]{3,8}|(?:rgba?|hsla?)\(.*\)|transparent|currentColor')
+NUMBER_RE = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+LENGTH_RE = re.compile(NUMBER_RE.pattern + r'(?:px|rem|em|ch|ex|vh|vw|dvh|svh|lvh|vmin|vmax|pt|pc|cm|mm|in)')
+
+PREFLIGHT = """
+*, ::before, ::after { box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb; }
+::before, ::after { --tw-content: ''; }
+html, :host { line-height: 1.5; -webkit-text-size-adjust: 100%; -moz-tab-size: 4; tab-size: 4; font-family: ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"; font-feature-settings: normal; font-variation-settings: normal; -webkit-tap-highlight-color: transparent; }
+body { margin: 0; line-height: inherit; }
+hr { height: 0; color: inherit; border-top-width: 1px; }
+abbr:where([title]) { -webkit-text-decoration: underline dotted; text-decoration: underline dotted; }
+h1, h2, h3, h4, h5, h6 { font-size: inherit; font-weight: inherit; }
+a { color: inherit; text-decoration: inherit; }
+b, strong { font-weight: bolder; }
+code, kbd, samp, pre { font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace; font-feature-settings: normal; font-variation-settings: normal; font-size: 1em; }
+small { font-size: 80%; }
+sub, sup { font-size: 75%; line-height: 0; position: relative; vertical-align: baseline; }
+sub { bottom: -0.25em; }
+sup { top: -0.5em; }
+table { text-indent: 0; border-color: inherit; border-collapse: collapse; }
+button, input, optgroup, select, textarea { font-family: inherit; font-feature-settings: inherit; font-variation-settings: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; letter-spacing: inherit; color: inherit; margin: 0; padding: 0; }
+button, select { text-transform: none; }
+button, input:where([type='button']), input:where([type='reset']), input:where([type='submit']) { -webkit-appearance: button; background-color: transparent; background-image: none; }
+:-moz-focusring { outline: auto; }
+:-moz-ui-invalid { box-shadow: none; }
+progress { vertical-align: baseline; }
+::-webkit-inner-spin-button, ::-webkit-outer-spin-button { height: auto; }
+[type='search'] { -webkit-appearance: textfield; outline-offset: -2px; }
+::-webkit-search-decoration { -webkit-appearance: none; }
+::-webkit-file-upload-button { -webkit-appearance: button; font: inherit; }
+summary { display: list-item; }
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre { margin: 0; }
+fieldset { margin: 0; padding: 0; }
+legend { padding: 0; }
+ol, ul, menu { list-style: none; margin: 0; padding: 0; }
+dialog { padding: 0; }
+textarea { resize: vertical; }
+input::placeholder, textarea::placeholder { opacity: 1; color: #9ca3af; }
+button, [role="button"] { cursor: pointer; }
+:disabled { cursor: default; }
+img, svg, video, canvas, audio, iframe, embed, object { display: block; vertical-align: middle; }
+img, video { max-width: 100%; height: auto; }
+[hidden] { display: none; }
+*, ::before, ::after, ::backdrop { --tw-translate-x: 0; --tw-translate-y: 0; --tw-rotate: 0; --tw-skew-x: 0; --tw-skew-y: 0; --tw-scale-x: 1; --tw-scale-y: 1; --tw-gradient-from-position: ; --tw-gradient-via-position: ; --tw-gradient-to-position: ; --tw-ring-inset: ; --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / 0.5); --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000; --tw-shadow-colored: 0 0 #0000; --tw-backdrop-blur: ; --tw-backdrop-brightness: ; --tw-backdrop-contrast: ; --tw-backdrop-grayscale: ; --tw-backdrop-hue-rotate: ; --tw-backdrop-invert: ; --tw-backdrop-opacity: ; --tw-backdrop-saturate: ; --tw-backdrop-sepia: ; }
+"""
+
+# Base styles of the forms plugin the CDN was loaded with (text fields only, the site has no others)
+FORMS = """
+input:where([type='text']), input:where(:not([type])), input:where([type='email']), input:where([type='url']), input:where([type='password']), input:where([type='number']), input:where([type='search']), input:where([type='tel']), textarea, select { appearance: none; background-color: #fff; border-color: #6b7280; border-width: 1px; border-radius: 0px; padding-top: 0.5rem; padding-right: 0.75rem; padding-bottom: 0.5rem; padding-left: 0.75rem; font-size: 1rem; line-height: 1.5rem; --tw-shadow: 0 0 #0000; }
+input:where([type='text']):focus, input:where(:not([type])):focus, input:where([type='email']):focus, input:where([type='url']):focus, input:where([type='password']):focus, input:where([type='number']):focus, input:where([type='search']):focus, input:where([type='tel']):focus, textarea:focus, select:focus { outline: 2px solid transparent; outline-offset: 2px; --tw-ring-inset: var(--tw-empty, ); --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: #2563eb; --tw-ring-offset-shadow: var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color); --tw-ring-shadow: var(--tw-ring-inset) 0 0 0 calc(1px + var(--tw-ring-offset-width)) var(--tw-ring-color); box-shadow: var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow); border-color: #2563eb; }
+input::placeholder, textarea::placeholder { color: #6b7280; opacity: 1; }
+"""
+
+SCREENS = {'sm': '640px', 'md': '768px', 'lg': '1024px', 'xl': '1280px', '2xl': '1536px'}
+PSEUDO_CLASSES = {
+    'first': ':first-child', 'last': ':last-child', 'odd': ':nth-child(odd)',
+    'even': ':nth-child(even)', 'visited': ':visited', 'checked': ':checked',
+    'focus-within': ':focus-within', 'hover': ':hover', 'focus': ':focus',
+    'focus-visible': ':focus-visible', 'active': ':active', 'disabled': ':disabled',
+}
+# Same order as Tailwind: plain states, then group-*; screens always come last
+VARIANT_ORDER = list(PSEUDO_CLASSES) + [f'group-{name}' for name in PSEUDO_CLASSES]
+
+# --- Theme (Tailwind v3 defaults) ---
+
+SPACING = {'0': '0px', 'px': '1px'}
+SPACING.update({key: f"{float(key) / 4:g}rem" for key in
+                '0.5 1 1.5 2 2.5 3 3.5 4 5 6 7 8 9 10 11 12 14 16 20 24 28 32 36 40 44 48 52 56 60 64 72 80 96'.split()})
+FRACTIONS = {'1/2': '50%', '1/3': '33.333333%', '2/3': '66.666667%', '1/4': '25%', '3/4': '75%',
+             '1/5': '20%', '2/5': '40%', '3/5': '60%', '4/5': '80%', 'full': '100%'}
+CONTENT_SIZES = {'min': 'min-content', 'max': 'max-content', 'fit': 'fit-content'}
+WIDTHS = {**SPACING, 'auto': 'auto', **FRACTIONS, 'screen': '100vw', **CONTENT_SIZES}
+HEIGHTS = {**SPACING, 'auto': 'auto', **FRACTIONS, 'screen': '100vh', **CONTENT_SIZES}
+MIN_SIZES = {**SPACING, 'full': '100%', **CONTENT_SIZES}
+MAX_WIDTHS = {'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+              '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+              '7xl': '80rem', 'full': '100%', 'prose': '65ch', **CONTENT_SIZES,
+              **{f'screen-{name}': width for name, width in SCREENS.items()}}
+MAX_HEIGHTS = {**SPACING, 'none': 'none', 'full': '100%', 'screen': '100vh', **CONTENT_SIZES}
+INSETS = {**SPACING, 'auto': 'auto', **FRACTIONS}
+MARGINS = {**SPACING, 'auto': 'auto'}
+TRANSLATES = {**SPACING, **FRACTIONS}
+
+COLORS = {'inherit': 'inherit', 'current': 'currentColor', 'transparent': 'transparent',
+          'black': '#000', 'white': '#fff'}
+PALETTE = {
+    'gray': '#f9fafb #f3f4f6 #e5e7eb #d1d5db #9ca3af #6b7280 #4b5563 #374151 #1f2937 #111827 #030712',
+    'red': '#fef2f2 #fee2e2 #fecaca #fca5a5 #f87171 #ef4444 #dc2626 #b91c1c #991b1b #7f1d1d #450a0a',
+    'amber': '#fffbeb #fef3c7 #fde68a #fcd34d #fbbf24 #f59e0b #d97706 #b45309 #92400e #78350f #451a03',
+    'green': '#f0fdf4 #dcfce7 #bbf7d0 #86efac #4ade80 #22c55e #16a34a #15803d #166534 #14532d #052e16',
+    'emerald': '#ecfdf5 #d1fae5 #a7f3d0 #6ee7b7 #34d399 #10b981 #059669 #047857 #065f46 #064e3b #022c22',
+}
+for family, shades in PALETTE.items():
+    for shade, value in zip((50, 100, 200, 300, 400, 500, 600, 700, 800, 900, 950), shades.split()):
+        COLORS[f'{family}-{shade}'] = value
+OPACITIES = {str(step): f"{step / 100:g}" for step in range(0, 101, 5)}
+
+FONT_FAMILIES = {
+    'sans': 'ui-sans-serif, system-ui, sans-serif, "Apple Color Emoji", "Segoe UI Emoji", "Segoe UI Symbol", "Noto Color Emoji"',
+    'serif': 'ui-serif, Georgia, Cambria, "Times New Roman", Times, serif',
+    'mono': 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace',
+}
+FONT_SIZES = {'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+              'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+              '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+              '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1')}
+FONT_WEIGHTS = {'thin': '100', 'extralight': '200', 'light': '300', 'normal': '400', 'medium': '500',
+                'semibold': '600', 'bold': '700', 'extrabold': '800', 'black': '900'}
+LINE_HEIGHTS = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625',
+                'loose': '2', **{str(n): f"{n / 4:g}rem" for n in range(3, 11)}}
+LETTER_SPACINGS = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em',
+                   'wider': '0.05em', 'widest': '0.1em'}
+RADII = {'none': '0px', 'sm': '0.125rem', 'DEFAULT': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+         'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+BORDER_WIDTHS = {'DEFAULT': '1px', '0': '0px', '2': '2px', '4': '4px', '8': '8px'}
+RING_WIDTHS = {'DEFAULT': '3px', '0': '0px', '1': '1px', '2': '2px', '4': '4px', '8': '8px'}
+SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    'DEFAULT': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+BLURS = {'none': '0', 'sm': '4px', 'DEFAULT': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px',
+         '2xl': '40px', '3xl': '64px'}
+SCALES = {'0': '0', '50': '.5', '75': '.75', '90': '.9', '95': '.95', '100': '1', '105': '1.05',
+          '110': '1.1', '125': '1.25', '150': '1.5'}
+ROTATIONS = {key: f'{key}deg' for key in ('0', '1', '2', '3', '6', '12', '45', '90', '180')}
+Z_INDEXES = {key: key for key in ('0', '10', '20', '30', '40', '50', 'auto')}
+GRID_TEMPLATES = {**{str(n): f'repeat({n}, minmax(0, 1fr))' for n in range(1, 13)}, 'none': 'none'}
+COLUMN_SPANS = {**{str(n): f'span {n} / span {n}' for n in range(1, 13)}, 'full': '1 / -1'}
+ASPECT_RATIOS = {'auto': 'auto', 'square': '1 / 1', 'video': '16 / 9'}
+TRANSITIONS = {
+    'none': 'none', 'all': 'all',
+    'DEFAULT': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, '
+               'box-shadow, transform, filter, backdrop-filter',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity', 'shadow': 'box-shadow', 'transform': 'transform',
+}
+DURATIONS = {key: f'{key}ms' for key in ('0', '75', '100', '150', '200', '300', '500', '700', '1000')}
+EASINGS = {'linear': 'linear', 'in': 'cubic-bezier(0.4, 0, 1, 1)', 'out': 'cubic-bezier(0, 0, 0.2, 1)',
+           'in-out': 'cubic-bezier(0.4, 0, 0.2, 1)'}
+
+TRANSFORM = ('translate(var(--tw-translate-x), var(--tw-translate-y)) rotate(var(--tw-rotate)) '
+             'skewX(var(--tw-skew-x)) skewY(var(--tw-skew-y)) scaleX(var(--tw-scale-x)) scaleY(var(--tw-scale-y))')
+BACKDROP_FILTER = ('var(--tw-backdrop-blur) var(--tw-backdrop-brightness) var(--tw-backdrop-contrast) '
+                   'var(--tw-backdrop-grayscale) var(--tw-backdrop-hue-rotate) var(--tw-backdrop-invert) '
+                   'var(--tw-backdrop-opacity) var(--tw-backdrop-saturate) var(--tw-backdrop-sepia)')
+EASE = 'cubic-bezier(0.4, 0, 0.2, 1)'
+
+# Tailwind's core plugin order; later plugins win when two utilities set the same property
+PLUGIN_ORDER = [
+    'accessibility', 'pointerEvents', 'visibility', 'position', 'inset', 'zIndex', 'gridColumn',
+    'margin', 'boxSizing', 'display', 'aspectRatio', 'size', 'height', 'maxHeight', 'minHeight',
+    'width', 'minWidth', 'maxWidth', 'flex', 'flexShrink', 'flexGrow', 'flexBasis', 'translate',
+    'rotate', 'scale', 'transform', 'cursor', 'userSelect', 'listStyleType', 'gridTemplateColumns',
+    'flexDirection', 'flexWrap', 'alignItems', 'justifyContent', 'justifyItems', 'gap', 'space',
+    'alignSelf', 'overflow', 'textOverflow', 'whitespace', 'wordBreak', 'borderRadius', 'borderWidth',
+    'borderStyle', 'borderColor', 'backgroundColor', 'backgroundImage', 'gradientColorStops',
+    'backgroundSize', 'backgroundPosition', 'backgroundRepeat', 'objectFit', 'padding', 'textAlign',
+    'verticalAlign', 'fontFamily', 'fontSize', 'fontWeight', 'textTransform', 'fontStyle',
+    'lineHeight', 'letterSpacing', 'textColor', 'textDecoration', 'placeholderColor', 'opacity',
+    'boxShadow', 'outlineStyle', 'ringWidth', 'ringColor', 'backdropBlur', 'transitionProperty',
+    'transitionDuration', 'transitionTimingFunction',
+]
+
+STATIC_UTILITIES = [
+    ('accessibility', {'sr-only': 'position: absolute; width: 1px; height: 1px; padding: 0; margin: -1px; '
+                                  'overflow: hidden; clip: rect(0, 0, 0, 0); white-space: nowrap; border-width: 0'}),
+    ('pointerEvents', {'pointer-events-none': 'pointer-events: none', 'pointer-events-auto': 'pointer-events: auto'}),
+    ('visibility', {'visible': 'visibility: visible', 'invisible': 'visibility: hidden'}),
+    ('position', {name: f'position: {name}' for name in ('static', 'fixed', 'absolute', 'relative', 'sticky')}),
+    ('boxSizing', {'box-border': 'box-sizing: border-box', 'box-content': 'box-sizing: content-box'}),
+    ('display', {**{name: f'display: {name}' for name in
+                    ('block', 'inline-block', 'inline', 'flex', 'inline-flex', 'table', 'grid',
+                     'inline-grid', 'contents', 'list-item', 'flow-root')},
+                 'hidden': 'display: none'}),
+    ('flex', {'flex-1': 'flex: 1 1 0%', 'flex-auto': 'flex: 1 1 auto', 'flex-initial': 'flex: 0 1 auto',
+              'flex-none': 'flex: none'}),
+    ('flexShrink', {'shrink': 'flex-shrink: 1', 'shrink-0': 'flex-shrink: 0'}),
+    ('flexGrow', {'grow': 'flex-grow: 1', 'grow-0': 'flex-grow: 0'}),
+    ('transform', {'transform': f'transform: {TRANSFORM}', 'transform-none': 'transform: none'}),
+    ('cursor', {f'cursor-{name}': f'cursor: {name}' for name in
+                ('auto', 'default', 'pointer', 'wait', 'text', 'move', 'not-allowed')}),
+    ('userSelect', {f'select-{name}': f'user-select: {name}' for name in ('none', 'text', 'all', 'auto')}),
+    ('listStyleType', {'list-none': 'list-style-type: none', 'list-disc': 'list-style-type: disc',
+                       'list-decimal': 'list-style-type: decimal'}),
+    ('flexDirection', {'flex-row': 'flex-direction: row', 'flex-row-reverse': 'flex-direction: row-reverse',
+                       'flex-col': 'flex-direction: column', 'flex-col-reverse': 'flex-direction: column-reverse'}),
+    ('flexWrap', {'flex-wrap': 'flex-wrap: wrap', 'flex-wrap-reverse': 'flex-wrap: wrap-reverse',
+                  'flex-nowrap': 'flex-wrap: nowrap'}),
+    ('alignItems', {'items-start': 'align-items: flex-start', 'items-end': 'align-items: flex-end',
+                    'items-center': 'align-items: center', 'items-baseline': 'align-items: baseline',
+                    'items-stretch': 'align-items: stretch'}),
+    ('justifyContent', {'justify-normal': 'justify-content: normal', 'justify-start': 'justify-content: flex-start',
+                        'justify-end': 'justify-content: flex-end', 'justify-center': 'justify-content: center',
+                        'justify-between': 'justify-content: space-between',
+                        'justify-around': 'justify-content: space-around',
+                        'justify-evenly': 'justify-content: space-evenly',
+                        'justify-stretch': 'justify-content: stretch'}),
+    ('justifyItems', {f'justify-items-{name}': f'justify-items: {name}' for name in
+                      ('start', 'end', 'center', 'stretch')}),
+    ('alignSelf', {'self-auto': 'align-self: auto', 'self-start': 'align-self: flex-start',
+                   'self-end': 'align-self: flex-end', 'self-center': 'align-self: center',
+                   'self-stretch': 'align-self: stretch', 'self-baseline': 'align-self: baseline'}),
+    ('overflow', {f'overflow{axis}-{name}': f'overflow{axis}: {name}' for axis in ('', '-x', '-y')
+                  for name in ('auto', 'hidden', 'clip', 'visible', 'scroll')}),
+    ('textOverflow', {'truncate': 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap',
+                      'text-ellipsis': 'text-overflow: ellipsis', 'text-clip': 'text-overflow: clip'}),
+    ('whitespace', {f'whitespace-{name}': f'white-space: {name}' for name in
+                    ('normal', 'nowrap', 'pre', 'pre-line', 'pre-wrap', 'break-spaces')}),
+    ('wordBreak', {'break-normal': 'overflow-wrap: normal; word-break: normal',
+                   'break-words': 'overflow-wrap: break-word', 'break-all': 'word-break: break-all'}),
+    ('borderStyle', {f'border-{name}': f'border-style: {name}' for name in
+                     ('solid', 'dashed', 'dotted', 'double', 'hidden', 'none')}),
+    ('backgroundImage', {'bg-none': 'background-image: none',
+                         **{f'bg-gradient-to-{side}': f'background-image: linear-gradient(to {direction}, var(--tw-gradient-stops))'
+                            for side, direction in (('t', 'top'), ('tr', 'top right'), ('r', 'right'),
+                                                    ('br', 'bottom right'), ('b', 'bottom'),
+                                                    ('bl', 'bottom left'), ('l', 'left'), ('tl', 'top left'))}}),
+    ('backgroundSize', {f'bg-{name}': f'background-size: {name}' for name in ('auto', 'cover', 'contain')}),
+    ('backgroundPosition', {f'bg-{name}': f'background-position: {name}' for name in
+                            ('center', 'top', 'bottom', 'left', 'right')}),
+    ('backgroundRepeat', {'bg-repeat': 'background-repeat: repeat', 'bg-no-repeat': 'background-repeat: no-repeat',
+                          'bg-repeat-x': 'background-repeat: repeat-x', 'bg-repeat-y': 'background-repeat: repeat-y'}),
+    ('objectFit', {f'object-{name}': f'object-fit: {name}' for name in
+                   ('contain', 'cover', 'fill', 'none', 'scale-down')}),
+    ('textAlign', {f'text-{name}': f'text-align: {name}' for name in
+                   ('left', 'center', 'right', 'justify', 'start', 'end')}),
+    ('verticalAlign', {f'align-{name}': f'vertical-align: {name}' for name in
+                       ('baseline', 'top', 'middle', 'bottom', 'text-top', 'text-bottom', 'sub', 'super')}),
+    ('textTransform', {'uppercase': 'text-transform: uppercase', 'lowercase': 'text-transform: lowercase',
+                       'capitalize': 'text-transform: capitalize', 'normal-case': 'text-transform: none'}),
+    ('fontStyle', {'italic': 'font-style: italic', 'not-italic': 'font-style: normal'}),
+    ('textDecoration', {'underline': 'text-decoration-line: underline',
+                        'overline': 'text-decoration-line: overline',
+                        'line-through': 'text-decoration-line: line-through',
+                        'no-underline': 'text-decoration-line: none'}),
+    ('outlineStyle', {'outline-none': 'outline: 2px solid transparent; outline-offset: 2px',
+                      'outline': 'outline-style: solid', 'outline-dashed': 'outline-style: dashed'}),
+    ('ringWidth', {'ring-inset': '--tw-ring-inset: inset'}),
+]
+
+# --- Value handling ---
+
+def hex_rgb(color):
+    """'r g b' channels of a #rgb/#rrggbb color, or None."""
+    match = HEX_RE.fullmatch(color)
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = ''.join(ch * 2 for ch in digits)
+    return ' '.join(str(int(digits[i:i + 2], 16)) for i in (0, 2, 4))
+
+def value_type(value):
+    """Rough data type of an arbitrary value, used to pick between utilities sharing a prefix."""
+    if value.startswith('var('):
+        return 'var'
+    if COLOR_RE.fullmatch(value):
+        return 'color'
+    if value.startswith('url('):
+        return 'url'
+    if re.match(r'(?:repeating-)?(?:linear|radial|conic)-gradient\(', value):
+        return 'image'
+    if NUMBER_RE.fullmatch(value):
+        return 'number'
+    if value.endswith('%') and NUMBER_RE.fullmatch(value[:-1]):
+        return 'percentage'
+    if LENGTH_RE.fullmatch(value) or re.match(r'(?:calc|min|max|clamp)\(', value):
+        return 'length'
+    return 'other'
+
+def decode_arbitrary(raw):
+    """CSS value of an arbitrary [...] value: underscores are spaces, \\_ is an underscore."""
+    if raw.startswith('url('):
+        return raw
+    return re.sub(r'(?<!\\)_', ' ', raw).replace('\\_', '_')
+
+def lookup(value, values, types):
+    """CSS value for a theme key, or for an [arbitrary] value of an accepted type; else None."""
+    if value in values:
+        return values[value]
+    if not (value.startswith('[') and value.endswith(']')):
+        return None
+    raw = value[1:-1]
+    hint = re.match(r'([a-z-]+):(?!/)', raw)
+    if hint and hint.group(1) in ('color', 'length', 'number', 'percentage', 'url', 'image', 'family-name'):
+        kind = {'family-name': 'other'}.get(hint.group(1), hint.group(1))
+        raw = raw[hint.end():]
+    else:
+        kind = value_type(decode_arbitrary(raw))
+    if 'any' not in types and kind not in types:
+        return None
+    return decode_arbitrary(raw)
+
+def split_modifier(value):
+    """('[#111714]', '80') for '[#111714]/80'; the modifier is None when there is none."""
+    if value.endswith(']') or '/' not in value:
+        return value, None
+    head, _, modifier = value.rpartition('/')
+    return head, modifier
+
+def negate(value):
+    if value in ('0', '0px'):
+        return value
+    if value.startswith(('calc(', 'var(')):
+        return f'calc({value} * -1)'
+    return value[1:] if value.startswith('-') else f'-{value}'
+
+def transparent(color):
+    """The fully transparent version of a color, for gradient stops."""
+    rgb = hex_rgb(color)
+    if rgb is None:
+        match = RGB_RE.match(color)
+        rgb = match.group(1) if match else '255 255 255'
+    return f'rgb({rgb} / 0)'
+
+# --- Declaration builders ---
+
+def props(*names):
+    return lambda value: [(name, value) for name in names]
+
+def color_props(*names, opacity=None):
+    """Builder for a color utility; plain hex colors get Tailwind's --tw-*-opacity variable."""
+    def build(color):
+        rgb = hex_rgb(color)
+        if rgb and opacity:
+            return [(opacity, '1')] + [(name, f'rgb({rgb} / var({opacity}))') for name in names]
+        return [(name, color) for name in names]
+    return build
+
+def font_size(value):
+    size, line_height = value if isinstance(value, tuple) else (value, None)
+    return [('font-size', size)] + ([('line-height', line_height)] if line_height else [])
+
+def scale(*axes):
+    return lambda value: [(f'--tw-scale-{axis}', value) for axis in axes] + [('transform', TRANSFORM)]
+
+def translate(axis):
+    return lambda value: [(f'--tw-translate-{axis}', value), ('transform', TRANSFORM)]
+
+def space(axis):
+    before, after = ('margin-top', 'margin-bottom') if axis == 'y' else ('margin-left', 'margin-right')
+    reverse = f'--tw-space-{axis}-reverse'
+    return lambda value: [(reverse, '0'), (before, f'calc({value} * calc(1 - var({reverse})))'),
+                          (after, f'calc({value} * var({reverse}))')]
+
+def shadow(value):
+    colored = re.sub(r'rgb\([^)]*\)', 'var(--tw-shadow-color)', value)
+    return [('--tw-shadow', value), ('--tw-shadow-colored', colored),
+            ('box-shadow', 'var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)')]
+
+def ring_width(value):
+    return [('--tw-ring-offset-shadow', 'var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)'),
+            ('--tw-ring-shadow', f'var(--tw-ring-inset) 0 0 0 calc({value} + var(--tw-ring-offset-width)) var(--tw-ring-color)'),
+            ('box-shadow', 'var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)')]
+
+def gradient_from(color):
+    return [('--tw-gradient-from', f'{color} var(--tw-gradient-from-position)'),
+            ('--tw-gradient-to', f'{transparent(color)} var(--tw-gradient-to-position)'),
+            ('--tw-gradient-stops', 'var(--tw-gradient-from), var(--tw-gradient-to)')]
+
+def gradient_via(color):
+    return [('--tw-gradient-to', f'{transparent(color)} var(--tw-gradient-to-position)'),
+            ('--tw-gradient-stops', f'var(--tw-gradient-from), {color} var(--tw-gradient-via-position), var(--tw-gradient-to)')]
+
+def backdrop_blur(value):
+    return [('--tw-backdrop-blur', f'blur({value})'), ('-webkit-backdrop-filter', BACKDROP_FILTER),
+            ('backdrop-filter', BACKDROP_FILTER)]
+
+def transition(value):
+    if value == 'none':
+        return [('transition-property', 'none')]
+    return [('transition-property', value), ('transition-timing-function', EASE),
+            ('transition-duration', '150ms')]
+
+ANY = {'any'}
+COLOR = {'color', 'var'}
+LENGTH = {'length', 'percentage'}
+SIDES = [('t', 'top'), ('r', 'right'), ('b', 'bottom'), ('l', 'left')]
+
+def sided(prefix, plugin, prop, values, types=ANY, negative=False):
+    """p/px/py/pt/pr/pb/pl-style utilities for a box property (margin, padding, ...)."""
+    return ([(prefix, plugin, values, types, props(prop), '', negative),
+             (f'{prefix}x', plugin, values, types, props(f'{prop}-left', f'{prop}-right'), '', negative),
+             (f'{prefix}y', plugin, values, types, props(f'{prop}-top', f'{prop}-bottom'), '', negative),
+             (f'{prefix}s', plugin, values, types, props(f'{prop}-inline-start'), '', negative),
+             (f'{prefix}e', plugin, values, types, props(f'{prop}-inline-end'), '', negative)]
+            + [(f'{prefix}{side}', plugin, values, types, props(f'{prop}-{name}'), '', negative)
+               for side, name in SIDES])
+
+# (prefix, plugin, theme values, accepted arbitrary types, declaration builder, selector suffix, negatable)
+UTILITIES = [
+    ('inset', 'inset', INSETS, ANY, props('inset'), '', True),
+    ('inset-x', 'inset', INSETS, ANY, props('left', 'right'), '', True),
+    ('inset-y', 'inset', INSETS, ANY, props('top', 'bottom'), '', True),
+    *[(name, 'inset', INSETS, ANY, props(name), '', True) for name in ('top', 'right', 'bottom', 'left')],
+    ('z', 'zIndex', Z_INDEXES, ANY, props('z-index'), '', True),
+    ('col-span', 'gridColumn', COLUMN_SPANS, ANY, props('grid-column'), '', False),
+    *sided('m', 'margin', 'margin', MARGINS, negative=True),
+    ('aspect', 'aspectRatio', ASPECT_RATIOS, ANY, props('aspect-ratio'), '', False),
+    ('size', 'size', WIDTHS, ANY, props('width', 'height'), '', False),
+    ('h', 'height', HEIGHTS, ANY, props('height'), '', False),
+    ('max-h', 'maxHeight', MAX_HEIGHTS, ANY, props('max-height'), '', False),
+    ('min-h', 'minHeight', {**MIN_SIZES, 'screen': '100vh'}, ANY, props('min-height'), '', False),
+    ('w', 'width', WIDTHS, ANY, props('width'), '', False),
+    ('min-w', 'minWidth', MIN_SIZES, ANY, props('min-width'), '', False),
+    ('max-w', 'maxWidth', MAX_WIDTHS, ANY, props('max-width'), '', False),
+    ('basis', 'flexBasis', {**SPACING, 'auto': 'auto', **FRACTIONS}, ANY, props('flex-basis'), '', False),
+    ('translate-x', 'translate', TRANSLATES, ANY, translate('x'), '', True),
+    ('translate-y', 'translate', TRANSLATES, ANY, translate('y'), '', True),
+    ('rotate', 'rotate', ROTATIONS, ANY, lambda value: [('--tw-rotate', value), ('transform', TRANSFORM)], '', True),
+    ('scale', 'scale', SCALES, ANY, scale('x', 'y'), '', True),
+    ('scale-x', 'scale', SCALES, ANY, scale('x'), '', True),
+    ('scale-y', 'scale', SCALES, ANY, scale('y'), '', True),
+    ('grid-cols', 'gridTemplateColumns', GRID_TEMPLATES, ANY, props('grid-template-columns'), '', False),
+    ('gap', 'gap', SPACING, ANY, props('gap'), '', False),
+    ('gap-x', 'gap', SPACING, ANY, props('column-gap'), '', False),
+    ('gap-y', 'gap', SPACING, ANY, props('row-gap'), '', False),
+    ('space-x', 'space', SPACING, ANY, space('x'), ' > :not([hidden]) ~ :not([hidden])', True),
+    ('space-y', 'space', SPACING, ANY, space('y'), ' > :not([hidden]) ~ :not([hidden])', True),
+    ('rounded', 'borderRadius', RADII, ANY, props('border-radius'), '', False),
+    *[(f'rounded-{side}', 'borderRadius', RADII, ANY, props(*corners), '', False)
+      for side, corners in (('t', ('border-top-left-radius', 'border-top-right-radius')),
+                            ('r', ('border-top-right-radius', 'border-bottom-right-radius')),
+                            ('b', ('border-bottom-right-radius', 'border-bottom-left-radius')),
+                            ('l', ('border-top-left-radius', 'border-bottom-left-radius')))],
+    ('border', 'borderWidth', BORDER_WIDTHS, LENGTH, props('border-width'), '', False),
+    ('border-x', 'borderWidth', BORDER_WIDTHS, LENGTH, props('border-left-width', 'border-right-width'), '', False),
+    ('border-y', 'borderWidth', BORDER_WIDTHS, LENGTH, props('border-top-width', 'border-bottom-width'), '', False),
+    *[(f'border-{side}', 'borderWidth', BORDER_WIDTHS, LENGTH, props(f'border-{name}-width'), '', False)
+      for side, name in SIDES],
+    ('border', 'borderColor', COLORS, COLOR, color_props('border-color', opacity='--tw-border-opacity'), '', False),
+    ('border-x', 'borderColor', COLORS, COLOR,
+     color_props('border-left-color', 'border-right-color', opacity='--tw-border-opacity'), '', False),
+    ('border-y', 'borderColor', COLORS, COLOR,
+     color_props('border-top-color', 'border-bottom-color', opacity='--tw-border-opacity'), '', False),
+    *[(f'border-{side}', 'borderColor', COLORS, COLOR,
+       color_props(f'border-{name}-color', opacity='--tw-border-opacity'), '', False) for side, name in SIDES],
+    ('bg', 'backgroundColor', COLORS, COLOR, color_props('background-color', opacity='--tw-bg-opacity'), '', False),
+    ('bg', 'backgroundImage', {}, {'url', 'image'}, props('background-image'), '', False),
+    ('from', 'gradientColorStops', COLORS, COLOR, gradient_from, '', False),
+    ('via', 'gradientColorStops', COLORS, COLOR, gradient_via, '', False),
+    ('to', 'gradientColorStops', COLORS, COLOR,
+     lambda color: [('--tw-gradient-to', f'{color} var(--tw-gradient-to-position)')], '', False),
+    *sided('p', 'padding', 'padding', SPACING),
+    ('font', 'fontFamily', FONT_FAMILIES, {'other'}, props('font-family'), '', False),
+    ('text', 'fontSize', FONT_SIZES, LENGTH, font_size, '', False),
+    ('font', 'fontWeight', FONT_WEIGHTS, {'number', 'var'}, props('font-weight'), '', False),
+    ('leading', 'lineHeight', LINE_HEIGHTS, ANY, props('line-height'), '', False),
+    ('tracking', 'letterSpacing', LETTER_SPACINGS, ANY, props('letter-spacing'), '', True),
+    ('text', 'textColor', COLORS, COLOR, color_props('color', opacity='--tw-text-opacity'), '', False),
+    ('placeholder', 'placeholderColor', COLORS, COLOR,
+     color_props('color', opacity='--tw-placeholder-opacity'), '::placeholder', False),
+    ('opacity', 'opacity', OPACITIES, ANY, props('opacity'), '', False),
+    ('shadow', 'boxShadow', SHADOWS, ANY, shadow, '', False),
+    ('ring', 'ringWidth', RING_WIDTHS, LENGTH, ring_width, '', False),
+    ('ring', 'ringColor', COLORS, COLOR, color_props('--tw-ring-color', opacity='--tw-ring-opacity'), '', False),
+    ('backdrop-blur', 'backdropBlur', BLURS, ANY, backdrop_blur, '', False),
+    ('transition', 'transitionProperty', TRANSITIONS, ANY, transition, '', False),
+    ('duration', 'transitionDuration', DURATIONS, ANY, props('transition-duration'), '', False),
+    ('ease', 'transitionTimingFunction', EASINGS, ANY, props('transition-timing-function'), '', False),
+]
+
+STATIC = {name: (plugin, [tuple(decl.split(': ', 1)) for decl in decls.split('; ')])
+          for plugin, entries in STATIC_UTILITIES for name, decls in entries.items()}
+
+def resolve_utility(name):
+    """(sort rank, declarations, selector suffix) for a utility without variants, or None."""
+    if name in STATIC:
+        plugin, decls = STATIC[name]
+        return (PLUGIN_ORDER.index(plugin), 0), decls, ''
+    negative = name.startswith('-')
+    bare = name[1:] if negative else name
+    for index, (prefix, plugin, values, types, build, suffix, negatable) in enumerate(UTILITIES):
+        if bare == prefix:
+            value = 'DEFAULT'
+        elif bare.startswith(prefix + '-'):
+            value = bare[len(prefix) + 1:]
+        else:
+            continue
+        if negative and not negatable:
+            continue
+        alpha = None
+        if types is COLOR:
+            value, modifier = split_modifier(value)
+            if modifier is not None:
+                alpha = OPACITIES.get(modifier) or (modifier[1:-1] if modifier.startswith('[') else None)
+                if alpha is None:
+                    continue
+        css = lookup(value, values, types)
+        if css is None:
+            continue
+        if alpha is not None:
+            rgb = hex_rgb(css)
+            if rgb is None:
+                return None  # like the CDN, an opacity modifier only works on literal colors
+            css = f'rgb({rgb} / {alpha})'
+        if negative:
+            css = negate(css)
+        return (PLUGIN_ORDER.index(plugin), index + 1), build(css), suffix
+    return None
+
+# --- Class names and variants ---
+
+def split_variants(name):
+    """['md', 'hover', 'bg-[#111714]'] for 'md:hover:bg-[#111714]' (colons in [...] don't split)."""
+    parts, depth, start = [], 0, 0
+    for i, ch in enumerate(name):
+        if ch == '[':
+            depth += 1
+        elif ch == ']':
+            depth -= 1
+        elif ch == ':' and depth == 0:
+            parts.append(name[start:i])
+            start = i + 1
+    parts.append(name[start:])
+    return parts
+
+def escape_class(name):
+    """A class name escaped for use in a selector."""
+    escaped = ''.join(ch if ch.isalnum() or ch in '-_' or ord(ch) > 127 else '\\' + ch for ch in name)
+    if escaped[0].isdigit():
+        escaped = f'\\3{escaped[0]} {escaped[1:]}'
+    return escaped
+
+def compile_class(name):
+    """(sort key, rule node) for a class name, or None if it isn't a known utility."""
+    *variants, utility = split_variants(name)
+    resolved = resolve_utility(utility)
+    if resolved is None:
+        return None
+    rank, decls, suffix = resolved
+    selector, screen, states = '.' + escape_class(name), -1, []
+    for variant in variants:
+        if variant in SCREENS and screen < 0:
+            screen = list(SCREENS).index(variant)
+        elif variant in PSEUDO_CLASSES:
+            selector += PSEUDO_CLASSES[variant]
+            states.append(VARIANT_ORDER.index(variant))
+        elif variant.startswith('group-') and variant[6:] in PSEUDO_CLASSES:
+            selector = f'.group{PSEUDO_CLASSES[variant[6:]]} {selector}'
+            states.append(VARIANT_ORDER.index(variant))
+        else:
+            return None
+    node = ('block', selector + suffix, [('decl', f'{prop}: {value}') for prop, value in decls])
+    if screen >= 0:
+        node = ('block', f'@media (min-width: {list(SCREENS.values())[screen]})', [node])
+    return (screen, tuple(sorted(states, reverse=True)), rank, name), node
+
+# --- Stylesheet parsing and output ---
+
+def parse_css(text):
+    """Parse a stylesheet into ('decl', text) statements and ('block', prelude, children) nodes."""
+    text = COMMENT_RE.sub('', text)
+    root, stack = [], []
+    current, start, quote, depth = root, 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote and text[i - 1] != '\\':
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif depth:
+            continue
+        elif ch == '{':
+            block = ('block', ' '.join(text[start:i].split()), [])
+            current.append(block)
+            stack.append(current)
+            current, start = block[2], i + 1
+        elif ch in ';}':
+            statement = ' '.join(text[start:i].split())
+            if statement:
+                current.append(('decl', statement))
+            if ch == '}' and stack:
+                current = stack.pop()
+            start = i + 1
+    return root
+
+def serialize(nodes, minify=False, indent=''):
+    """Write parsed/generated nodes back out as CSS."""
+    out = []
+    for node in nodes:
+        if node[0] == 'decl':
+            prop, sep, value = node[1].partition(':')
+            decl = f"{prop.strip()}{sep}{' ' if sep and (not minify or not value.strip()) else ''}{value.strip()}"
+            out.append(decl + ';' if minify else f"{indent}{decl};")
+        elif minify:
+            out.append(f"{node[1]}{{{serialize(node[2], True).rstrip(';')}}}")
+        else:
+            body = serialize(node[2], False, indent + '  ')
+            out.append(f"{indent}{node[1]} {{\n{body}\n{indent}}}")
+    if minify:
+        return ''.join(out)
+    separator = '\n' if nodes and all(node[0] == 'decl' for node in nodes) else '\n\n'
+    return separator.join(out)
+
+def selector_classes(selector):
+    return {re.sub(r'\\(.)', r'\1', name) for name in CLASS_SELECTOR_RE.findall(selector)}
+
+def used_rules(nodes, candidates):
+    """Rules of an @layer components/utilities block whose classes appear in the content."""
+    kept = []
+    for node in nodes:
+        if node[0] != 'block':
+            continue
+        if node[1].startswith('@'):
+            children = used_rules(node[2], candidates)
+            if children:
+                kept.append(('block', node[1], children))
+        elif selector_classes(node[1]) & candidates:
+            kept.append(node)
+    return kept
+
+def group_media(nodes):
+    """Merge consecutive rules under the same @media into one block."""
+    grouped = []
+    for node in nodes:
+        if (grouped and node[1].startswith('@media') and grouped[-1][1] == node[1]):
+            grouped[-1][2].extend(node[2])
+        else:
+            grouped.append((node[0], node[1], list(node[2])) if node[1].startswith('@media') else node)
+    return grouped
+
+def collect_classes(root):
+    """(classes in class attributes of the pages, extra candidates from templates and scripts)."""
+    markup, scripts = set(), set()
+    for pattern in CONTENT_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            text = path.read_text(encoding='utf-8', errors='replace')
+            for _, value in CLASS_ATTR_RE.findall(text):
+                markup.update(name for name in value.split() if not re.search(r'[{}$]', name))
+            for body in SCRIPT_RE.findall(text):
+                scripts.update(SCRIPT_TOKEN_RE.findall(body))
+    for pattern in TEMPLATE_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            for _, value in CLASS_ATTR_RE.findall(path.read_text(encoding='utf-8')):
+                scripts.update(value.split())
+    for pattern in SCRIPT_GLOBS:
+        for path in sorted(root.glob(pattern)):
+            if not path.name.endswith('.min.js'):
+                scripts.update(SCRIPT_TOKEN_RE.findall(path.read_text(encoding='utf-8', errors='replace')))
+    return markup, scripts - markup
+
+def build_stylesheet(root=BASE_DIR, minify=False):
+    """Compile the site stylesheet; returns (css text, utility count, unresolved class names)."""
+    source = parse_css((root / SOURCE_CSS).read_text(encoding='utf-8'))
+    markup, scripts = collect_classes(root)
+    candidates = markup | scripts
+
+    compiled = {}
+    for name in candidates:
+        result = compile_class(name)
+        if result:
+            compiled[name] = result
+    ordered = sorted(compiled.values(), key=lambda item: item[0])
+    plain = [node for (screen, states, *_), node in ordered if screen < 0 and not states]
+    with_variants = [node for (screen, states, *_), node in ordered if screen >= 0 or states]
+
+    layers = {'base': [], 'components': [], 'utilities': []}
+    body, source_classes = [], set()
+    for node in source:
+        if node[0] == 'block' and node[1].startswith('@layer '):
+            layers[node[1].split()[1]].extend(node[2])
+        else:
+            body.append(node)
+    for node in source:
+        if node[0] == 'block':
+            source_classes |= selector_classes(node[1])
+            for child in node[2]:
+                if child[0] == 'block':
+                    source_classes |= selector_classes(child[1])
+
+    sections = {
+        'base': parse_css(PREFLIGHT) + parse_css(FORMS) + layers['base'],
+        'components': used_rules(layers['components'], candidates),
+        'utilities': plain + used_rules(layers['utilities'], candidates) + group_media(with_variants),
+    }
+    output = []
+    for node in body:
+        if node[0] == 'decl' and node[1].startswith('@tailwind '):
+            output.extend(sections[node[1].split()[1]])
+        else:
+            output.append(node)
+
+    header = f"/* Generated by build_css.py from {SOURCE_CSS}; do not edit. */"
+    css = header + ('' if minify else '\n\n') + serialize(output, minify) + '\n'
+    unresolved = sorted(name for name in markup
+                        if name not in compiled and name not in source_classes and not MARKER_RE.match(name))
+    return css, len(compiled), unresolved
+
+def write_stylesheet(root=BASE_DIR, minify=False):
+    """Rebuild css/site.css; returns its path if the contents changed, else None."""
+    css, _, _ = build_stylesheet(root, minify)
+    output = root / OUTPUT_CSS
+    if output.exists() and output.read_text(encoding='utf-8') == css:
+        return None
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(css, encoding='utf-8')
+    return output
+
+def main():
+    """Compile css/site.css and list the classes nothing defines."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='site root')
+    parser.add_argument('--minify', action='store_true', help='write compact CSS')
+    parser.add_argument('--check', action='store_true',
+                        help="don't write; exit with an error if the stylesheet is out of date")
+    args = parser.parse_args()
+    root = args.root.resolve()
+
+    css, count, unresolved = build_stylesheet(root, args.minify)
+    output = root / OUTPUT_CSS
+    current = output.read_text(encoding='utf-8') if output.exists() else None
+    if args.check:
+        if current != css:
+            raise SystemExit(f"❌ {OUTPUT_CSS} is out of date, run: python build_css.py")
+        print(f"✅ {OUTPUT_CSS} is up to date")
+        return
+    if current != css:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(css, encoding='utf-8')
+    print(f"✓ Compiled {count} utilities -> {OUTPUT_CSS} ({len(css.encode()) / 1e3:.1f} kB)")
+
+    if unresolved:
+        print(f"\n⚠️  {len(unresolved)} classes match no utility and no rule in {SOURCE_CSS}:")
+        print('  ' + ' '.join(unresolved))
+    print(f"\n✅ {OUTPUT_CSS} {'written' if current != css else 'unchanged'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Script to build the deploy artifact from the files the site actually uses.
+
+Starting from the HTML entry points (index.html, projects.html, contact.html,
+projects/*.html and the project_cards/ fragments) it follows every local
+reference: src/href/poster/srcset/data-include attributes and CSS url()s in
+HTML, and path-like string literals in the scripts those pages load (including
+`images/logos/${name}`-style prefixes, for names listed in the same script).
+Only reachable files are placed in the output directory:
+    python build_dist.py              # -> dist/
+    python build_dist.py -o public --report
+
+Media is hardlinked when possible; HTML, scripts and JSON are always copied,
+because later build steps (inline_partials.py, fingerprint_assets.py) rewrite
+them in place. The run ends with a report of broken links and, with --report,
+of every file nothing links to.
+"""
+
+import argparse
+import os
+import re
+import shutil
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import unquote
+
+BASE_DIR = Path(__file__).resolve().parent
+ENTRY_GLOBS = ['*.html', 'projects/*.html', 'project_cards/**/*.html']
+# Shipped even though no page links to them
+ALWAYS_INCLUDE = ['CNAME', '.nojekyll', 'robots.txt', 'favicon.ico', '404.html']
+# Fragments included into root-level pages resolve their URLs from the site root
+ROOT_RELATIVE_DIRS = ['project_cards']
+# Rewritten in place by later build steps, so never hardlinked
+COPY_EXTS = {'.html', '.js', '.json', '.css', '.txt', '.xml'}
+# Not reported as unreferenced: build tooling and repo metadata
+SOURCE_EXTS = {'.py', '.md', '.jsonl'}
+
+ATTR_RE = re.compile(r'''\b(?:src|href|poster|data-src|data-include)=(["'])([^"']*)\1''')
+SRCSET_RE = re.compile(r'''\b(?:srcset|data-srcset)=(["'])([^"']*)\1''')
+CSS_URL_RE = re.compile(r'''url\((["']?)([^"')]+)\1\)''')
+JS_STRING_RE = re.compile(r'''(["'`])([\w@./-]+\.(?:html|json|js|css|webp|png|jpe?g|gif|svg|avif|mp4|webm|pdf))\1''')
+JS_PREFIX_RE = re.compile(r'''`([\w@./-]+/)\$\{''')
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+
+def html_refs(text):
+    """Every URL referenced by an HTML page."""
+    refs = [url for _, url in ATTR_RE.findall(text)]
+    for _, value in SRCSET_RE.findall(text):
+        refs += [candidate.split()[0] for candidate in value.split(',') if candidate.strip()]
+    refs += [url for _, url in CSS_URL_RE.findall(text)]
+    return refs
+
+def js_refs(text):
+    """Path-like string literals in a script, expanded with its template-literal prefixes."""
+    names = [name for _, name in JS_STRING_RE.findall(text)]
+    prefixes = JS_PREFIX_RE.findall(text)
+    return names + [prefix + name for prefix in prefixes for name in names if '/' not in name]
+
+def resolve(url, base, root):
+    """Site-relative path a local URL points to, or None for external URLs."""
+    if not url or EXTERNAL_RE.match(url):
+        return None
+    path = unquote(re.split(r'[?#]', url, maxsplit=1)[0])
+    if not path:
+        return None
+    target = root / path.lstrip('/') if path.startswith('/') else base / path
+    target = Path(os.path.normpath(target))
+    if target.is_dir() or path.endswith('/'):
+        target = target / 'index.html'
+    try:
+        return target.relative_to(root).as_posix()
+    except ValueError:
+        return None  # points outside the site
+
+def url_base(root, rel_path):
+    """Directory that relative URLs in `rel_path` resolve against."""
+    if Path(rel_path).parts[0] in ROOT_RELATIVE_DIRS:
+        return root
+    return (root / rel_path).parent
+
+def crawl(root):
+    """Walk the reference graph from the entry points.
+
+    Returns (reachable site-relative paths, broken {target: [referrers]}).
+    """
+    entries = sorted({p.relative_to(root).as_posix()
+                      for pattern in ENTRY_GLOBS for p in root.glob(pattern)})
+    reachable, broken = set(), defaultdict(list)
+    pending = list(entries) + [name for name in ALWAYS_INCLUDE if (root / name).is_file()]
+    script_pages = {}  # script -> a page that loads it (scripts resolve against the page)
+
+    while pending:
+        rel_path = pending.pop()
+        if rel_path in reachable:
+            continue
+        reachable.add(rel_path)
+        suffix = Path(rel_path).suffix.lower()
+        if suffix == '.html':
+            base = url_base(root, rel_path)
+            refs = html_refs((root / rel_path).read_text(encoding='utf-8', errors='replace'))
+        elif suffix == '.js':
+            base = url_base(root, script_pages.get(rel_path, 'index.html'))
+            refs = js_refs((root / rel_path).read_text(encoding='utf-8', errors='replace'))
+        else:
+            continue
+        for url in refs:
+            target = resolve(url, base, root)
+            if target is None:
+                continue
+            if not (root / target).is_file():
+                if suffix == '.html':  # script literals are only guesses, don't report them
+                    broken[target].append(rel_path)
+                continue
+            if target.endswith('.js'):
+                script_pages.setdefault(target, rel_path)
+            pending.append(target)
+    return reachable, broken
+
+def unreferenced(root, reachable, out_dir):
+    """Files in the tree that nothing reaches (skipping tooling, dotfiles and the output)."""
+    unused = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith('.') and d != '__pycache__'
+                             and (current / d).resolve() != out_dir)
+        for name in filenames:
+            path = current / name
+            rel_path = path.relative_to(root).as_posix()
+            if (name.startswith('.') or path.suffix in SOURCE_EXTS
+                    or rel_path in reachable or name in ALWAYS_INCLUDE):
+                continue
+            unused.append((rel_path, path.stat().st_size))
+    return unused
+
+def place(src, dest):
+    """Hardlink media into the output; copy files later steps rewrite."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if src.suffix.lower() not in COPY_EXTS:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass  # other filesystem, or links unsupported
+    shutil.copy2(src, dest)
+
+def format_size(size):
+    return f"{size / 1e6:.1f} MB" if size >= 1e6 else f"{size / 1e3:.0f} kB"
+
+def main():
+    """Copy every reachable file into the output directory and report dead weight."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='site root')
+    parser.add_argument('-o', '--out', type=Path, default=BASE_DIR / 'dist',
+                        help='output directory, replaced on every run (default: dist/)')
+    parser.add_argument('--report', action='store_true',
+                        help='list every file no page references')
+    parser.add_argument('--strict', action='store_true', help='exit with an error on broken links')
+    args = parser.parse_args()
+    root, out_dir = args.root.resolve(), args.out.resolve()
+    if out_dir == root or root.is_relative_to(out_dir):
+        parser.error('the output directory must not contain the site root')
+
+    reachable, broken = crawl(root)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    total = 0
+    for rel_path in sorted(reachable):
+        place(root / rel_path, out_dir / rel_path)
+        total += (root / rel_path).stat().st_size
+    print(f"✓ {len(reachable)} reachable files ({format_size(total)}) -> {out_dir}")
+
+    unused = unreferenced(root, reachable, out_dir)
+    unused_size = sum(size for _, size in unused)
+    print(f"✓ Left out {len(unused)} unreferenced files ({format_size(unused_size)})")
+    if args.report:
+        for rel_path, size in sorted(unused, key=lambda item: -item[1]):
+            print(f"    {format_size(size):>9}  {rel_path}")
+
+    if broken:
+        print(f"\n⚠️  {len(broken)} broken links:")
+        for target, referrers in sorted(broken.items()):
+            print(f"  {target}  (from {', '.join(sorted(set(referrers)))})")
+        if args.strict:
+            raise SystemExit(1)
+    print(f"\n✅ Built {out_dir.name}/")
+
+if __name__ == "__main__":
+    main()
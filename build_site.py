@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Script to build the project cards, project pages and search index into an output tree.
+
+One pass over project_cards/ driven by project_manifest.json, which lists every
+linked card, its dedicated page and whether that page is generated. Each card
+is read once and feeds both stages:
+    link   the card wrapped in a link to its page (update_project_cards.py)
+    page   the dedicated page rendered from the card (generate_project_pages.py)
+and the search index is built from the same extracted fields. Nothing under
+--root is modified; results go to --out, mirroring the site layout:
+    <out>/project_cards/<card>.html, <out>/projects/<page>.html, <out>/project_index.json
+
+In the deploy, build_dist.py stages the rest of the site first and this
+regenerates the card-derived files on top of it:
+    python build_dist.py && python build_site.py --out dist
+    python build_site.py --root ~/site --out /tmp/site --profile site.trace.json
+
+Files are only rewritten when their bytes change, so rebuilding is cheap and
+the output is the same on any machine.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import generate_project_pages as generator
+import instrument
+import project_manifest
+import responsive_images
+import update_project_cards as linker
+
+BASE_DIR = Path(__file__).resolve().parent
+
+def write_output(path, data):
+    """Write bytes into the output tree; returns True if the file changed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with instrument.span('write', path=path.name, bytes=len(data)) as info:
+        info['written'] = generator.write_atomic(path, data)
+    return info['written']
+
+def build_card(card_html, card_path, project, root, variants, out):
+    """Link and render one card; returns (search record, output files changed)."""
+    changed = []
+    if project and not linker.is_linked(card_html):
+        with instrument.span('link', card=card_path):
+            linked = linker.wrap_with_link(card_html, project['page'])
+    else:
+        linked = card_html
+    if write_output(out / generator.CARDS_DIR.name / card_path, linked.encode('utf-8')):
+        changed.append(f"{generator.CARDS_DIR.name}/{card_path}")
+
+    with instrument.span('extract', card=card_path):
+        fields = generator.extract_fields(card_html)
+    if project and project['generated']:
+        page_file = out / project['page']
+        page_file.parent.mkdir(parents=True, exist_ok=True)
+        with instrument.span('render', card=card_path) as info:
+            data = generator.build_card_data(fields, variants, root)
+            written, info['bytes'] = generator.write_page_atomic(page_file, data)
+        if written:
+            changed.append(project['page'])
+    return generator.card_record(fields), changed
+
+def build_site(root, out, manifest_file):
+    """Build every card-derived file of `root` into `out`; returns the files changed."""
+    projects = {project['card']: project
+                for project in project_manifest.load_projects(manifest_file)}
+    variants = responsive_images.load_variants(root)
+    cards_dir = root / generator.CARDS_DIR.name
+    records, changed = {}, []
+
+    for card_file in sorted(cards_dir.rglob('*.html')):
+        card_path = card_file.relative_to(cards_dir).as_posix()
+        with instrument.span('read', card=card_path) as info:
+            card_bytes = card_file.read_bytes()
+            info['bytes'] = len(card_bytes)
+        card_html = card_bytes.decode('utf-8')
+        record, card_changed = build_card(card_html, card_path, projects.get(card_path),
+                                          root, variants, out)
+        records[card_path] = record
+        changed += card_changed
+        for rel_path in card_changed:
+            print(f"  ✓ {rel_path}")
+    for card_path in sorted(set(projects) - set(records)):
+        print(f"⚠️  Card file not found: {card_path}")
+
+    generated = {card_path: Path(project['page']).name
+                 for card_path, project in projects.items()
+                 if project['generated'] and card_path in records}
+    with instrument.span('search index'):
+        index = generator.build_search_index(records, generated)
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if write_output(out / generator.SEARCH_INDEX_FILE.name, index_bytes):
+        changed.append(generator.SEARCH_INDEX_FILE.name)
+        print(f"  ✓ {generator.SEARCH_INDEX_FILE.name} ({len(index['projects'])} projects, "
+              f"{len(index['tokens'])} tokens)")
+    print(f"✓ {len(records)} cards read once, {len(generated)} pages rendered")
+    return changed
+
+def main():
+    """Build the card-derived files of the site root into the output tree."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='site root (read only)')
+    parser.add_argument('-o', '--out', type=Path, help='output tree (default: <root>/dist)')
+    parser.add_argument('--manifest', type=Path,
+                        help='project manifest (default: <root>/project_manifest.json)')
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    root = args.root.resolve()
+    out = (args.out or root / 'dist').resolve()
+    if out == root or root.is_relative_to(out):
+        parser.error('the output tree must not contain the site root')
+    manifest_file = args.manifest or root / project_manifest.PROJECT_MANIFEST_FILE.name
+
+    with instrument.session(args, 'build_site'):
+        changed = build_site(root, out, manifest_file)
+    print(f"\n✅ Built {out} ({len(changed)} files changed)")
+
+if __name__ == "__main__":
+    main()
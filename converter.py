@@ -4,10 +4,56 @@ Example:
 python converter.py --url "https://www.youtube.com/watch?v=1AvmbjeHvxk" \
     --start 0:02 --end 0:09 --width 320 --fps 8 -o out --quality high
 → Produces out.mp4 and out.webm
+
+Add --single-pass to decode and scale the clip once and encode MP4 + WebM
+concurrently from a single ffmpeg process (--threads sets each encoder's budget).
+
+Batch mode converts every clip listed in a manifest (JSON, YAML or CSV):
+python converter.py --manifest clips.json --quality high --report report.json
+where clips.json is e.g.
+[{"url": "https://youtu.be/1AvmbjeHvxk", "start": "0:02", "end": "0:09",
+  "output": "images/projects/ibvs/out", "width": 320}]
+
+Sources are kept in a persistent cache (~/.cache/converter, LRU-evicted above
+--cache-max-gb), so re-cutting or re-encoding the same video skips the
+download. Inspect it with --cache-list and clean it with --cache-prune.
+
+--range-fetch pulls only the bytes/segments around [start, end] (plus
+--range-margin seconds for keyframes) and falls back to a full download when
+the source can't be range-fetched. To try it offline, serve a local file:
+python converter.py --stand-in long.mp4 --start 41:10 --end 41:15 --range-fetch
+
+--target-kb 400 (or --target-quality 0.97 for SSIM) replaces the fixed CRF of
+--quality: a few short windows are sample-encoded at several CRFs to predict
+the result, and the chosen CRF per codec is cached for the same inputs.
+
+--chunked splits long clips at keyframes, encodes the pieces on all cores and
+joins them without re-encoding (frame count and duration are verified). It
+applies to a single clip without --widths; batch mode already spreads clips
+over the cores.
+
+--widths 320,480,720 encodes a rendition ladder from one decode pass and also
+writes a WebP poster (--poster, seconds into the clip) and out.json, a sidecar
+listing every file with its dimensions, duration and byte size.
+
+Every ffmpeg run reports live progress (fps, speed, % done) from its -progress
+pipe when stderr is a terminal. --profile encode.trace.json records a span per
+download and encode (with bytes in/out and the final fps/speed) plus fps/speed
+counters, and --cprofile adds cProfile stats (see instrument.py).
 """
-import argparse, re, subprocess, sys, tempfile
+import argparse, contextlib, hashlib, http.server, json, math, multiprocessing, os, queue, re
+import shutil, subprocess, sys, tempfile, threading, time, urllib.request
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, decisions may race between parallel encodes
+    fcntl = None
+
+import instrument
+
 def parse_time(ts: str) -> float:
     ts = str(ts).strip()
     if re.fullmatch(r"\d+(\.\d+)?", ts):
@@ -27,6 +73,70 @@ def has_ffmpeg() -> bool:
     except Exception:
         return False
 
+def progress_blocks(lines):
+    """Group ffmpeg -progress output (key=value lines) into one dict per report.
+
+    Each report ends with progress=continue, or progress=end for the last one.
+    """
+    block = {}
+    for line in lines:
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            continue
+        block[key] = value.strip()
+        if key == "progress":
+            yield block
+            block = {}
+
+def _progress_number(value: str | None) -> float | None:
+    try:
+        return float(str(value).rstrip("x"))
+    except ValueError:
+        return None
+
+def print_progress(stage: str, block: dict, duration: float | None = None):
+    """Overwrite the terminal's last line with one -progress report."""
+    fps = _progress_number(block.get("fps"))
+    speed = _progress_number(block.get("speed"))
+    done = _progress_number(block.get("out_time_us", block.get("out_time_ms")))
+    pct = f"{min(100.0, done / 1e4 / duration):5.1f}% " if done is not None and duration else ""
+    print(f"\r\033[K  {stage}: {pct}frame {block.get('frame', '?')}  "
+          f"{fps or 0:.1f} fps  {speed or 0:.2f}x", end="", file=sys.stderr)
+
+def run_ffmpeg(cmd: list[str], stage: str, duration: float | None = None,
+               inputs: list[Path] = (), outputs: list[Path] = (), report=None):
+    """Run an ffmpeg command in a trace span, following its -progress pipe.
+
+    duration is the expected output length in seconds (for the % shown on a
+    terminal). report, when given, is called with every -progress block
+    instead of printing it (workers hand progress to the parent this way).
+    The span records bytes in/out, frames and the final fps/speed.
+    Raises CalledProcessError like subprocess.run(check=True).
+    """
+    live = report is None and sys.stderr.isatty()
+    quiet = report is not None or live  # ffmpeg's own stats line would clash
+    cmd = [cmd[0], "-progress", "pipe:1", *(["-nostats"] if quiet else []), *cmd[1:]]
+    with instrument.span(stage) as info:
+        info["bytes_in"] = sum(Path(p).stat().st_size for p in inputs if Path(p).is_file())
+        last = {}
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+            for last in progress_blocks(proc.stdout):
+                fps = _progress_number(last.get("fps"))
+                speed = _progress_number(last.get("speed"))
+                instrument.counter(f"{stage} progress", fps=fps or 0.0, speed=speed or 0.0)
+                if report is not None:
+                    report(last)
+                elif live:
+                    print_progress(stage, last, duration)
+        if live:
+            print("\r\033[K", end="", file=sys.stderr)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+        info.update(frames=int(_progress_number(last.get("frame")) or 0),
+                    fps=_progress_number(last.get("fps")),
+                    speed=_progress_number(last.get("speed")),
+                    bytes_out=sum(Path(p).stat().st_size for p in outputs if Path(p).is_file()))
+
 def canonical_watch_url(url: str) -> str:
     m = re.match(r"https?://youtu\.be/([A-Za-z0-9_-]{6,})", url)
     if m:
@@ -36,95 +146,1087 @@ def canonical_watch_url(url: str) -> str:
         return base
     return url
 
-def download_with_ytdlp(url: str, outdir: Path) -> Path:
+SOURCE_FORMAT = "bv*+ba/b"
+
+def download_with_ytdlp(url: str, outdir: Path, fmt: str = SOURCE_FORMAT) -> Path:
     import yt_dlp
     outtmpl = str(outdir / "%(title).200B.%(ext)s")
     ydl_opts = {
         "quiet": True, "no_warnings": True, "noplaylist": True,
-        "format": "bv*+ba/b", "merge_output_format": "mp4", "outtmpl": outtmpl,
+        "format": fmt, "merge_output_format": "mp4", "outtmpl": outtmpl,
     }
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+    with instrument.span("download", url=url) as span, yt_dlp.YoutubeDL(ydl_opts) as ydl:
         info = ydl.extract_info(url, download=True)
         filepath = Path(ydl.prepare_filename(info))
         if not filepath.suffix.lower() == ".mp4":
             alt = filepath.with_suffix(".mp4")
             if alt.exists():
                 filepath = alt
+        span["bytes"] = filepath.stat().st_size if filepath.exists() else 0
         return filepath
 
-def make_videos(in_video: Path, start: float, end: float, out_base: Path,
-                width: int, fps: int, speed: float, quality: str):
-    dur = end - start
-    if dur <= 0: raise ValueError("end must be greater than start.")
+# ---------------------------------------------------------------------------
+# Persistent source cache
+# ---------------------------------------------------------------------------
+DEFAULT_CACHE_DIR = Path(os.environ.get("CONVERTER_CACHE_DIR", "~/.cache/converter"))
+DEFAULT_CACHE_MAX_GB = 10.0
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class SourceCache:
+    """On-disk cache of downloaded sources, keyed by (canonical URL, format).
+
+    Each entry lives in <dir>/<key>/ and is described in <dir>/index.json with
+    its size, SHA-256 and last-use time. Downloads land in <key>.partial/ and
+    are only renamed into place once complete, so an interrupted download never
+    looks like a hit. Entries are evicted least-recently-used first once the
+    total size exceeds max_bytes.
+    """
+
+    def __init__(self, root: Path = DEFAULT_CACHE_DIR,
+                 max_gb: float = DEFAULT_CACHE_MAX_GB):
+        self.root = Path(root).expanduser()
+        self.max_bytes = int(max_gb * 1024**3)
+        self.index_path = self.root / "index.json"
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(url: str, fmt: str = SOURCE_FORMAT) -> str:
+        ident = f"{canonical_watch_url(url)}\n{fmt}"
+        return hashlib.sha256(ident.encode()).hexdigest()[:24]
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, index: dict):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(index, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _valid(self, key: str, entry: dict, deep: bool = False) -> bool:
+        path = self.root / key / entry["file"]
+        try:
+            if path.stat().st_size != entry["size"]:
+                return False
+        except FileNotFoundError:
+            return False
+        return not deep or _sha256(path) == entry["sha256"]
+
+    def lookup(self, url: str, fmt: str = SOURCE_FORMAT) -> Path | None:
+        key = self.key(url, fmt)
+        with self._lock:
+            index = self._load()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            if not self._valid(key, entry):
+                self._drop(index, key)
+                self._save(index)
+                return None
+            entry["last_used"] = time.time()
+            self._save(index)
+            return self.root / key / entry["file"]
+
+    def fetch(self, url: str, fmt: str = SOURCE_FORMAT) -> tuple[Path, bool]:
+        """Return (path, hit); downloads into the cache on a miss."""
+        cached = self.lookup(url, fmt)
+        if cached is not None:
+            return cached, True
+
+        key = self.key(url, fmt)
+        partial = self.root / f"{key}.partial"
+        shutil.rmtree(partial, ignore_errors=True)
+        partial.mkdir(parents=True)
+        src = download_with_ytdlp(url, partial, fmt)
+        leftovers = [p for p in partial.iterdir() if p.suffix in (".part", ".ytdl")]
+        if not src.exists() or src.stat().st_size == 0 or leftovers:
+            shutil.rmtree(partial, ignore_errors=True)
+            raise RuntimeError(f"incomplete download for {url}")
+
+        entry = {"url": canonical_watch_url(url), "format": fmt, "file": src.name,
+                 "size": src.stat().st_size, "sha256": _sha256(src),
+                 "created": time.time(), "last_used": time.time()}
+        with self._lock:
+            shutil.rmtree(self.root / key, ignore_errors=True)
+            os.replace(partial, self.root / key)
+            index = self._load()
+            index[key] = entry
+            self._evict(index, keep=key)
+            self._save(index)
+        return self.root / key / src.name, False
+
+    def _drop(self, index: dict, key: str):
+        index.pop(key, None)
+        shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def _evict(self, index: dict, keep: str | None = None) -> list[str]:
+        evicted = []
+        total = sum(e["size"] for e in index.values())
+        for key, entry in sorted(index.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry["size"]
+            self._drop(index, key)
+            evicted.append(key)
+        return evicted
 
+    def entries(self) -> list[tuple[str, dict]]:
+        index = self._load()
+        return sorted(index.items(), key=lambda kv: kv[1]["last_used"], reverse=True)
+
+    def prune(self, verify: bool = False) -> list[str]:
+        """Drop broken entries, stray partial downloads and anything over the cap."""
+        removed = []
+        with self._lock:
+            index = self._load()
+            for key, entry in list(index.items()):
+                if not self._valid(key, entry, deep=verify):
+                    self._drop(index, key)
+                    removed.append(key)
+            if self.root.exists():
+                for path in self.root.iterdir():
+                    if path.is_dir() and path.name not in index:
+                        shutil.rmtree(path, ignore_errors=True)
+                        removed.append(path.name)
+            removed += self._evict(index)
+            self._save(index)
+        return removed
+
+def print_cache(cache: SourceCache):
+    entries = cache.entries()
+    total = sum(e["size"] for _, e in entries)
+    print(f"Cache: {cache.root} — {len(entries)} sources, "
+          f"{total / 1024**2:.1f} MiB of {cache.max_bytes / 1024**2:.0f} MiB")
+    for key, e in entries:
+        used = time.strftime("%Y-%m-%d %H:%M", time.localtime(e["last_used"]))
+        print(f"  {key}  {e['size'] / 1024**2:9.1f} MiB  {used}  {e['url']}")
+
+# ---------------------------------------------------------------------------
+# Range-only fetching
+# ---------------------------------------------------------------------------
+RANGE_FORMAT = "bv*[protocol^=http][ext=mp4]/bv*[protocol^=http]/b[protocol^=http]"
+RANGE_MARGIN = 3.0   # seconds fetched on each side so the cut lands after a keyframe
+MEDIA_EXTS = (".mp4", ".m4v", ".mov", ".webm", ".mkv")
+
+def is_direct_media(url: str) -> bool:
+    """True for plain media files (local paths or URLs) that need no yt-dlp."""
+    path = url.split("?", 1)[0].lower()
+    return path.endswith(MEDIA_EXTS) or url.startswith("file://") or Path(url).is_file()
+
+def resolve_media_url(url: str, fmt: str = RANGE_FORMAT) -> tuple[str, dict, str]:
+    """Ask yt-dlp for the direct stream URL (and headers) without downloading."""
+    import yt_dlp
+    ydl_opts = {"quiet": True, "no_warnings": True, "noplaylist": True, "format": fmt}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+    f = (info.get("requested_formats") or [info])[0]
+    return f["url"], f.get("http_headers") or {}, f.get("protocol", "")
+
+def supports_ranges(media_url: str, headers: dict | None = None,
+                    protocol: str = "") -> bool:
+    """Whether ffmpeg can seek into media_url without reading it from the start."""
+    if not media_url.startswith(("http://", "https://")):
+        return True                      # local file: seeking is free
+    if "m3u8" in protocol or ".m3u8" in media_url or ".mpd" in media_url:
+        return True                      # segmented: ffmpeg only pulls the needed segments
+    req = urllib.request.Request(media_url, headers={**(headers or {}), "Range": "bytes=0-0"})
+    try:
+        with urllib.request.urlopen(req, timeout=15) as resp:
+            return resp.status == 206
+    except Exception:
+        return False
+
+def probe_start_time(path: str) -> float:
+    out = subprocess.run(["ffprobe","-v","error","-show_entries","format=start_time",
+                          "-of","default=nw=1:nk=1", path],
+                         capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        return float(out)
+    except ValueError:
+        return 0.0
+
+def fetch_range(media_url: str, start: float, end: float, outdir: Path,
+                margin: float = RANGE_MARGIN, headers: dict | None = None) -> tuple[Path, float]:
+    """Stream-copy only [start - margin, end + margin] of the video track.
+
+    ffmpeg seeks with HTTP range requests, so only the bytes around the clip
+    are transferred. Source timestamps are kept (-copyts); the returned offset
+    is where the segment begins on the source timeline, i.e. the clip spans
+    [start - offset, end - offset] inside the segment.
+    """
+    seg_start = max(0.0, start - margin)
+    out = outdir / "segment.mkv"
+    cmd = ["ffmpeg","-y","-nostdin","-loglevel","error"]
+    if headers:
+        cmd += ["-headers", "".join(f"{k}: {v}\r\n" for k, v in headers.items())]
+    cmd += ["-ss", f"{seg_start:.3f}","-t", f"{end + margin - seg_start:.3f}",
+            "-i", media_url,"-map","0:v:0","-c","copy","-copyts", str(out)]
+    run_ffmpeg(cmd, "fetch range", duration=end + margin - seg_start, outputs=[out])
+    offset = probe_start_time(str(out)) - probe_start_time(media_url)
+    if offset > start + 1e-3:
+        raise RuntimeError(f"fetched segment starts at {offset:.3f}s, after the clip start")
+    return out, max(0.0, offset)
+
+def fetch_clip_source(url: str, start: float, end: float, workdir: Path,
+                      margin: float = RANGE_MARGIN,
+                      cache: SourceCache | None = None) -> tuple[Path, float, str | None]:
+    """Fetch just the clip's range, falling back to a full download.
+
+    Returns (path, offset, source_id) where offset is the source time at which
+    the returned file begins (0.0 for full downloads). A fetched segment is a
+    new file on every run, so source_id identifies it by the URL and requested
+    range instead (pick_crf caches on it); it is None for full downloads.
+    """
+    try:
+        if is_direct_media(url):
+            media_url, headers, protocol = url.removeprefix("file://"), {}, ""
+        else:
+            media_url, headers, protocol = resolve_media_url(url)
+        if not supports_ranges(media_url, headers, protocol):
+            raise RuntimeError("server does not honour Range requests")
+        workdir.mkdir(parents=True, exist_ok=True)
+        src, offset = fetch_range(media_url, start, end, workdir, margin, headers)
+        return src, offset, f"{url}#{max(0.0, start - margin):.3f}-{end + margin:.3f}"
+    except Exception as e:
+        print(f"Range fetch unavailable ({e}); downloading the full video…", file=sys.stderr)
+    if cache is not None:
+        return cache.fetch(url)[0], 0.0, None
+    workdir.mkdir(parents=True, exist_ok=True)
+    return download_with_ytdlp(url, workdir), 0.0, None
+
+class _RangeFileHandler(http.server.SimpleHTTPRequestHandler):
+    """Serves one file with single-range (206) support, like a CDN would."""
+    served: Path = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._send(body=False)
+
+    def do_GET(self):
+        self._send(body=True)
+
+    def _send(self, body: bool):
+        size = self.served.stat().st_size
+        first, last = 0, size - 1
+        m = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+        if m and (m.group(1) or m.group(2)):
+            if m.group(1):
+                first = int(m.group(1))
+                last = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+            else:
+                first = max(0, size - int(m.group(2)))
+            if first > last:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", self.guess_type(str(self.served)))
+        self.send_header("Content-Length", str(last - first + 1))
+        self.end_headers()
+        if body:
+            with open(self.served, "rb") as f:
+                f.seek(first)
+                remaining = last - first + 1
+                while remaining > 0:
+                    chunk = f.read(min(1 << 16, remaining))
+                    if not chunk:
+                        break
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+@contextlib.contextmanager
+def serve_file(path: Path):
+    """Serve a local file over HTTP with Range support; yields its URL.
+
+    Offline stand-in for a remote source when exercising --range-fetch.
+    """
+    handler = type("Handler", (_RangeFileHandler,), {"served": Path(path).resolve()})
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}/{Path(path).name}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+def encoder_threads(threads: int | None) -> int:
+    """Per-encoder thread budget; by default split the cores between the two encoders."""
+    if threads:
+        return max(1, threads)
+    return max(1, (os.cpu_count() or 2) // 2)
+
+def video_filter(width: int, fps: int, speed: float = 1.0) -> str:
     core = f"fps={fps},scale={width}:trunc(ow/a/2)*2:flags=lanczos"
     if abs(speed - 1.0) > 1e-6:
         core = f"setpts=PTS/{speed},{core}"
+    return core
 
-    # Quality presets
+def quality_params(quality: str) -> tuple[str, str, str]:
+    """(mp4 crf, webm crf, preset) for a --quality level."""
     if quality == "low":
-        mp4_crf, webm_crf, preset = "28", "34", "faster"
-    elif quality == "medium":
-        mp4_crf, webm_crf, preset = "23", "30", "medium"
-    else:  # high
-        mp4_crf, webm_crf, preset = "18", "28", "slow"
+        return "28", "34", "faster"
+    if quality == "medium":
+        return "23", "30", "medium"
+    return "18", "28", "slow"  # high
 
-    # MP4
-    mp4_out = out_base.with_suffix(".mp4")
-    cmd_mp4 = [
-        "ffmpeg","-y","-nostdin",
-        "-ss", f"{start:.3f}","-i", str(in_video),"-t", f"{dur:.3f}",
-        "-vf", core,"-an",
-        "-c:v","libx264","-pix_fmt","yuv420p",
-        "-preset", preset,"-crf", mp4_crf,
-        "-movflags","faststart", str(mp4_out)
-    ]
-    subprocess.run(cmd_mp4, check=True)
+def encoder_args(codec: str, crf, preset: str) -> list[str]:
+    if codec == "libx264":
+        return ["-c:v","libx264","-pix_fmt","yuv420p",
+                "-preset", preset,"-crf", str(crf),
+                "-movflags","faststart"]
+    return ["-c:v","libvpx-vp9","-b:v","0","-crf", str(crf),"-preset", preset]
 
-    # WebM
-    webm_out = out_base.with_suffix(".webm")
-    cmd_webm = [
-        "ffmpeg","-y","-nostdin",
-        "-ss", f"{start:.3f}","-i", str(in_video),"-t", f"{dur:.3f}",
-        "-vf", core,"-an",
-        "-c:v","libvpx-vp9","-b:v","0","-crf", webm_crf,"-preset", preset,
+# ---------------------------------------------------------------------------
+# Rate control: target size / target quality
+# ---------------------------------------------------------------------------
+SAMPLE_CRFS = {"libx264": (18, 24, 30, 36), "libvpx-vp9": (20, 30, 40, 50)}
+CRF_RANGE = {"libx264": (0, 51), "libvpx-vp9": (0, 63)}
+CRF_CACHE_NAME = "crf_decisions.json"   # stored next to the source cache
+
+def sample_windows(start: float, end: float, count: int = 3,
+                   length: float = 2.0) -> list[tuple[float, float]]:
+    """Evenly spread sample windows; short clips are sampled whole."""
+    dur = end - start
+    if dur <= count * length:
+        return [(start, dur)]
+    step = (dur - length) / (count - 1)
+    return [(start + k * step, length) for k in range(count)]
+
+def _encode_sample(in_video: Path, at: float, length: float, core: str,
+                   codec: str, crf: int, preset: str, out: Path,
+                   measure_ssim: bool) -> tuple[int, float | None]:
+    subprocess.run(["ffmpeg","-y","-nostdin","-loglevel","error",
+                    "-ss", f"{at:.3f}","-i", str(in_video),"-t", f"{length:.3f}",
+                    "-vf", core,"-an", *encoder_args(codec, crf, preset), str(out)],
+                   check=True)
+    size = out.stat().st_size
+    if not measure_ssim:
+        return size, None
+    # Compare against the same window of the source, run through the same filters
+    res = subprocess.run(["ffmpeg","-nostdin","-i", str(out),
+                          "-ss", f"{at:.3f}","-t", f"{length:.3f}","-i", str(in_video),
+                          "-lavfi", f"[1:v]{core}[ref];[0:v][ref]ssim","-f","null","-"],
+                         capture_output=True, text=True, check=True)
+    m = re.findall(r"All:([\d.]+)", res.stderr)
+    return size, float(m[-1]) if m else None
+
+def _solve_crf(points: list[tuple[int, float]], target: float, log: bool) -> float:
+    """Least-squares line through (crf, metric) points, solved for target."""
+    xs = [p[0] for p in points]
+    ys = [math.log(p[1]) if log else p[1] for p in points]
+    t = math.log(target) if log else target
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    sxx = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sxx if sxx else 0.0
+    if abs(slope) < 1e-12:
+        return xs[0]
+    return mx + (t - my) / slope
+
+@contextlib.contextmanager
+def _locked(path: Path):
+    """Hold an exclusive flock on <path>.lock, serialising updates across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+def _source_id(in_video: Path) -> str:
+    st = in_video.stat()
+    return f"{in_video.name}:{st.st_size}:{st.st_mtime_ns}"
+
+def pick_crf(in_video: Path, start: float, end: float, core: str, codec: str,
+             preset: str, target_kb: float | None = None,
+             target_quality: float | None = None,
+             cache_path: Path | None = None, source_id: str | None = None) -> int:
+    """Choose the CRF that meets a size (KiB) or SSIM target for one codec.
+
+    A few short windows are encoded at SAMPLE_CRFS; the clip size is predicted
+    from the sampled bytes/second (log-size is close to linear in CRF) and
+    SSIM is interpolated linearly. Decisions are cached per source, range,
+    filters, codec, preset and target in cache_path. The source is source_id
+    when given (see fetch_clip_source), else the file's name, size and mtime.
+    Parallel encodes share cache_path: the decision is merged into the file's
+    current contents under a lock, so none of theirs are lost.
+    """
+    key = hashlib.sha256(json.dumps(
+        [source_id or _source_id(in_video), round(start, 3), round(end, 3), core, codec, preset,
+         target_kb, target_quality]).encode()).hexdigest()[:24]
+    if cache_path is not None and cache_path.exists():  # replaced atomically, so no lock needed
+        cached = json.loads(cache_path.read_text(encoding="utf-8")).get(key)
+        if cached:
+            return cached["crf"]
+
+    windows = sample_windows(start, end)
+    sampled = sum(length for _, length in windows)
+    ext = ".mp4" if codec == "libx264" else ".webm"
+    sizes, ssims = [], []
+    with tempfile.TemporaryDirectory() as td, instrument.span("rate control", codec=codec):
+        for crf in SAMPLE_CRFS[codec]:
+            total, scores = 0, []
+            for n, (at, length) in enumerate(windows):
+                size, ssim = _encode_sample(in_video, at, length, core, codec, crf, preset,
+                                            Path(td) / f"s{n}{ext}", target_quality is not None)
+                total += size
+                if ssim is not None:
+                    scores.append(ssim)
+            sizes.append((crf, max(1.0, total * (end - start) / sampled / 1024)))
+            if scores:
+                ssims.append((crf, sum(scores) / len(scores)))
+
+    lo, hi = CRF_RANGE[codec]
+    if target_quality is not None:
+        crf = math.floor(_solve_crf(ssims, target_quality, log=False))
+    else:
+        crf = math.ceil(_solve_crf(sizes, target_kb, log=True))
+    crf = min(hi, max(lo, crf))
+
+    if cache_path is not None:
+        with _locked(cache_path):
+            cache = (json.loads(cache_path.read_text(encoding="utf-8"))
+                     if cache_path.exists() else {})
+            cache[key] = {"crf": crf, "codec": codec, "source": in_video.name,
+                          "predicted_kb": [[c, round(kb, 1)] for c, kb in sizes]}
+            tmp = cache_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cache, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, cache_path)
+    return crf
+
+def single_pass_cmd(src: list[str], core: str, mp4_enc: list[str],
+                    webm_enc: list[str], mp4_out: Path, webm_out: Path,
+                    threads: int) -> list[str]:
+    n = str(threads)
+    return src + [
+        "-filter_complex", f"[0:v]{core},split=2[mp4][webm]",
+        "-map","[mp4]","-an", *mp4_enc,"-threads", n, str(mp4_out),
+        "-map","[webm]","-an", *webm_enc,"-threads", n,"-row-mt","1",
         str(webm_out)
     ]
-    subprocess.run(cmd_webm, check=True)
+
+# ---------------------------------------------------------------------------
+# Chunked (segment-parallel) encoding
+# ---------------------------------------------------------------------------
+MIN_CHUNK_SECONDS = 2.0
+
+def probe_keyframes(in_video: Path, start: float, end: float) -> list[float]:
+    """Source keyframe times inside [start, end], relative to the file start."""
+    t0 = probe_start_time(str(in_video))
+    out = subprocess.run(["ffprobe","-v","error","-select_streams","v:0",
+                          "-skip_frame","nokey","-show_entries","frame=pts_time",
+                          "-read_intervals", f"{t0 + start:.3f}%{t0 + end:.3f}",
+                          "-of","csv=p=0", str(in_video)],
+                         capture_output=True, text=True, check=True).stdout
+    times = []
+    for line in out.split():
+        try:
+            times.append(float(line.strip(",")) - t0)
+        except ValueError:
+            continue
+    return sorted(t for t in times if start < t < end)
+
+def plan_chunks(start: float, end: float, n: int, fps: int, speed: float,
+                keyframes: list[float] = ()) -> list[tuple[float, float]]:
+    """Split [start, end] into ~n (at, length) pieces.
+
+    Each cut is taken at the source keyframe nearest to an even split (so the
+    chunk seeks are cheap) and then snapped onto the output frame grid, so the
+    fps filter yields exactly the frames a single-pass encode would.
+    """
+    frame = speed / fps            # source seconds per output frame
+    bounds = [start]
+    for k in range(1, n):
+        ideal = start + (end - start) * k / n
+        cut = min(keyframes, key=lambda t: abs(t - ideal)) if keyframes else ideal
+        cut = start + round((cut - start) / frame) * frame
+        if bounds[-1] + MIN_CHUNK_SECONDS <= cut <= end - MIN_CHUNK_SECONDS:
+            bounds.append(cut)
+    bounds.append(end)
+    return [(a, b - a) for a, b in zip(bounds, bounds[1:])]
+
+def probe_frames(path: Path) -> tuple[int, float]:
+    """(video frame count, container duration) of an encoded file."""
+    out = subprocess.run(["ffprobe","-v","error","-select_streams","v:0","-count_packets",
+                          "-show_entries","stream=nb_read_packets:format=duration",
+                          "-of","json", str(path)],
+                         capture_output=True, text=True, check=True).stdout
+    info = json.loads(out)
+    return (int(info["streams"][0]["nb_read_packets"]),
+            float(info["format"].get("duration", 0.0)))
+
+_chunk_progress = None  # queue to the parent, set in each chunk worker
+
+def _init_chunk_worker(progress):
+    global _chunk_progress
+    _chunk_progress = progress
+
+def _encode_chunk(k: int, in_video: str, at: float, length: float, core: str,
+                  mp4_enc: list[str], webm_enc: list[str],
+                  mp4_out: str, webm_out: str, threads: int) -> list[dict]:
+    """Encode one chunk (runs on the chunk process pool); returns its trace events.
+
+    Progress goes to the parent as (k, block), which prints it for all chunks.
+    """
+    src = ["ffmpeg","-y","-nostdin","-loglevel","error",
+           "-ss", f"{at:.6f}","-i", in_video,"-t", f"{length:.6f}"]
+    run_ffmpeg(single_pass_cmd(src, core, mp4_enc, webm_enc,
+                               Path(mp4_out), Path(webm_out), threads),
+               "encode chunk", outputs=[mp4_out, webm_out],
+               report=lambda block: _chunk_progress.put((k, block)))
+    return instrument.drain()
+
+def combine_progress(blocks: list[dict]) -> dict:
+    """One -progress block for chunks encoding side by side: frames, output
+    time, fps and speed add up."""
+    def total(key):
+        return sum(v for v in (_progress_number(block.get(key)) for block in blocks) if v)
+
+    return {"frame": str(int(total("frame"))), "out_time_us": str(int(total("out_time_us"))),
+            "fps": f"{total('fps'):.2f}", "speed": f"{total('speed'):.2f}x"}
+
+def _concat(parts: list[Path], out: Path, extra: list[str] = ()):
+    listing = parts[0].parent / f"{out.name}.txt"
+    listing.write_text("".join(f"file '{p.as_posix()}'\n" for p in parts), encoding="utf-8")
+    try:
+        subprocess.run(["ffmpeg","-y","-nostdin","-loglevel","error",
+                        "-f","concat","-safe","0","-i", str(listing),
+                        "-c","copy", *extra, str(out)], check=True)
+    finally:
+        listing.unlink(missing_ok=True)
+
+def encode_chunked(in_video: Path, start: float, end: float, fps: int, speed: float,
+                   core: str, mp4_enc: list[str], webm_enc: list[str],
+                   mp4_out: Path, webm_out: Path, chunks: int = 0,
+                   threads: int | None = None):
+    """Encode keyframe-aligned pieces of the clip in parallel and concat them.
+
+    chunks=0 picks one chunk per core. Each worker runs a single-pass MP4 +
+    WebM encode of its piece; the pieces are joined with the concat demuxer
+    (stream copy, no re-encode) and the result is checked against the frame
+    count and duration a single-pass encode of the whole range produces.
+    """
+    cores = os.cpu_count() or 2
+    n = chunks if chunks > 0 else cores
+    n = max(1, min(n, int((end - start) // MIN_CHUNK_SECONDS)))
+    plan = plan_chunks(start, end, n, fps, speed, probe_keyframes(in_video, start, end))
+    per_chunk = threads or max(1, cores // (2 * len(plan)))
+
+    progress = multiprocessing.Queue()
+    live = sys.stderr.isatty()
+    with tempfile.TemporaryDirectory() as td, \
+         ProcessPoolExecutor(min(len(plan), cores), initializer=_init_chunk_worker,
+                             initargs=(progress,)) as pool:
+        parts = [(Path(td) / f"c{k:04d}.mp4", Path(td) / f"c{k:04d}.webm")
+                 for k in range(len(plan))]
+        futures = [pool.submit(_encode_chunk, k, str(in_video), at, length, core,
+                               mp4_enc, webm_enc, str(m), str(w), per_chunk)
+                   for k, ((at, length), (m, w)) in enumerate(zip(plan, parts))]
+        latest, pending = {}, set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.25)
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    k, block = progress.get_nowait()
+                    latest[k] = block
+            if live and latest:
+                print_progress(f"encode {len(plan)} chunks", combine_progress(list(latest.values())),
+                               (end - start) / speed)
+        if live:
+            print("\r\033[K", end="", file=sys.stderr)
+        for fut in futures:
+            instrument.merge(fut.result())
+        with instrument.span("concat", chunks=len(plan)):
+            _concat([m for m, _ in parts], mp4_out, ["-movflags","faststart"])
+            _concat([w for _, w in parts], webm_out)
+
+    expected_frames = round((end - start) / speed * fps)
+    expected_dur = expected_frames / fps
+    for out in (mp4_out, webm_out):
+        frames, duration = probe_frames(out)
+        if abs(frames - expected_frames) > 1 or abs(duration - expected_dur) > 2.0 / fps:
+            raise RuntimeError(
+                f"{out.name}: chunked encode has {frames} frames / {duration:.3f}s, "
+                f"expected {expected_frames} / {expected_dur:.3f}s")
+    print(f"Chunked encode: {len(plan)} chunks, {expected_frames} frames verified")
+
+# ---------------------------------------------------------------------------
+# Responsive rendition ladder + poster + sidecar
+# ---------------------------------------------------------------------------
+POSTER_QUALITY = 80
+
+def probe_video(path: Path) -> dict:
+    """Width, height and duration of an encoded file."""
+    out = subprocess.run(["ffprobe","-v","error","-select_streams","v:0",
+                          "-show_entries","stream=width,height:format=duration",
+                          "-of","json", str(path)],
+                         capture_output=True, text=True, check=True).stdout
+    info = json.loads(out)
+    stream = info["streams"][0]
+    return {"width": int(stream["width"]), "height": int(stream["height"]),
+            "duration": round(float(info["format"].get("duration", 0.0)), 3)}
+
+def make_ladder(in_video: Path, start: float, end: float, out_base: Path,
+                widths: list[int], fps: int, speed: float,
+                mp4_enc: list[str], webm_enc: list[str],
+                threads: int | None = None, poster_at: float = 0.0) -> Path:
+    """Encode every width in `widths` (MP4 + WebM) from one decode pass.
+
+    The frames are decoded and fps-converted once, split per width, scaled and
+    split again between the two encoders. Writes <base>-<width>.{mp4,webm},
+    a <base>-poster.webp taken poster_at seconds into the clip, and a
+    <base>.json sidecar describing every file; returns the sidecar path.
+    """
+    widths = sorted(set(widths))
+    dur = end - start
+    pre = f"fps={fps}"
+    if abs(speed - 1.0) > 1e-6:
+        pre = f"setpts=PTS/{speed},{pre}"
+    graph = (f"[0:v]{pre},split={len(widths)}" + "".join(f"[p{w}]" for w in widths) + ";"
+             + ";".join(f"[p{w}]scale={w}:trunc(ow/a/2)*2:flags=lanczos,split=2[m{w}][w{w}]"
+                        for w in widths))
+    n = str(threads or max(1, (os.cpu_count() or 2) // (2 * len(widths))))
+    cmd = ["ffmpeg","-y","-nostdin",
+           "-ss", f"{start:.3f}","-i", str(in_video),"-t", f"{dur:.3f}",
+           "-filter_complex", graph]
+    outputs = {}
+    for w in widths:
+        mp4 = out_base.with_name(f"{out_base.name}-{w}.mp4")
+        webm = out_base.with_name(f"{out_base.name}-{w}.webm")
+        outputs[w] = (mp4, webm)
+        cmd += ["-map", f"[m{w}]","-an", *mp4_enc,"-threads", n, str(mp4),
+                "-map", f"[w{w}]","-an", *webm_enc,"-threads", n,"-row-mt","1", str(webm)]
+    run_ffmpeg(cmd, "encode ladder", duration=dur / speed, inputs=[in_video],
+               outputs=[f for pair in outputs.values() for f in pair])
+
+    poster = out_base.with_name(f"{out_base.name}-poster.webp")
+    poster_src = start + min(max(0.0, poster_at) * speed, max(0.0, dur - 1e-3))
+    run_ffmpeg(["ffmpeg","-y","-nostdin","-loglevel","error",
+                "-ss", f"{poster_src:.3f}","-i", str(in_video),"-frames:v","1",
+                "-vf", f"scale={widths[-1]}:trunc(ow/a/2)*2:flags=lanczos",
+                "-c:v","libwebp","-quality", str(POSTER_QUALITY), str(poster)],
+               "poster", outputs=[poster])
+
+    renditions = []
+    for w in widths:
+        mp4, webm = outputs[w]
+        info = probe_video(mp4)
+        renditions.append({**info, "files": {
+            "mp4": {"src": mp4.name, "type": "video/mp4", "bytes": mp4.stat().st_size},
+            "webm": {"src": webm.name, "type": "video/webm", "bytes": webm.stat().st_size},
+        }})
+    poster_info = probe_video(poster)
+    sidecar = {
+        "version": 1, "fps": fps, "speed": speed,
+        "clip": {"start": round(start, 3), "end": round(end, 3)},
+        "poster": {"src": poster.name, "type": "image/webp",
+                   "width": poster_info["width"], "height": poster_info["height"],
+                   "at": poster_at, "bytes": poster.stat().st_size},
+        "renditions": renditions,
+    }
+    sidecar_path = out_base.with_suffix(".json")
+    sidecar_path.write_text(json.dumps(sidecar, indent=2), encoding="utf-8")
+    return sidecar_path
+
+def make_videos(in_video: Path, start: float, end: float, out_base: Path,
+                width: int, fps: int, speed: float, quality: str,
+                single_pass: bool = False, threads: int | None = None,
+                target_kb: float | None = None, target_quality: float | None = None,
+                crf_cache: Path | None = None, chunks: int | None = None,
+                widths: list[int] | None = None, poster_at: float = 0.0,
+                source_id: str | None = None):
+    dur = end - start
+    if dur <= 0: raise ValueError("end must be greater than start.")
+
+    core = video_filter(width, fps, speed)
+    mp4_crf, webm_crf, preset = quality_params(quality)
+
+    # Rate control: pick each codec's CRF from short sample encodes
+    if target_kb or target_quality:
+        if widths:  # one CRF per codec for the whole ladder, chosen at the top rung
+            core = video_filter(max(widths), fps, speed)
+        mp4_crf, webm_crf = (
+            str(pick_crf(in_video, start, end, core, codec, preset,
+                         target_kb=target_kb, target_quality=target_quality,
+                         cache_path=crf_cache, source_id=source_id))
+            for codec in ("libx264", "libvpx-vp9"))
+        print(f"Rate control → MP4 crf {mp4_crf}, WebM crf {webm_crf}")
+
+    mp4_out = out_base.with_suffix(".mp4")
+    webm_out = out_base.with_suffix(".webm")
+    mp4_enc = encoder_args("libx264", mp4_crf, preset)
+    webm_enc = encoder_args("libvpx-vp9", webm_crf, preset)
+    src = ["ffmpeg","-y","-nostdin",
+           "-ss", f"{start:.3f}","-i", str(in_video),"-t", f"{dur:.3f}"]
+
+    if widths:
+        sidecar = make_ladder(in_video, start, end, out_base, widths, fps, speed,
+                              mp4_enc, webm_enc, threads=threads, poster_at=poster_at)
+        print(f"Wrote {len(set(widths))} renditions + poster, described in {sidecar.name}")
+        return
+
+    if chunks is not None:
+        encode_chunked(in_video, start, end, fps, speed, core, mp4_enc, webm_enc,
+                       mp4_out, webm_out, chunks=chunks, threads=threads)
+        return
+
+    if single_pass:
+        # Decode + filter once, split the frames and feed both encoders
+        # from the same process so they run side by side.
+        cmd = single_pass_cmd(src, core, mp4_enc, webm_enc, mp4_out, webm_out,
+                              encoder_threads(threads))
+        run_ffmpeg(cmd, "encode mp4+webm", duration=dur / speed, inputs=[in_video],
+                   outputs=[mp4_out, webm_out])
+        return
+
+    # MP4
+    cmd_mp4 = src + ["-vf", core,"-an", *mp4_enc, str(mp4_out)]
+    if threads: cmd_mp4[-1:-1] = ["-threads", str(threads)]
+    run_ffmpeg(cmd_mp4, "encode mp4", duration=dur / speed, inputs=[in_video], outputs=[mp4_out])
+
+    # WebM
+    cmd_webm = src + ["-vf", core,"-an", *webm_enc, str(webm_out)]
+    if threads: cmd_webm[-1:-1] = ["-threads", str(threads),"-row-mt","1"]
+    run_ffmpeg(cmd_webm, "encode webm", duration=dur / speed, inputs=[in_video],
+               outputs=[webm_out])
+
+# ---------------------------------------------------------------------------
+# Batch mode: a manifest of clips scheduled over bounded worker pools
+# ---------------------------------------------------------------------------
+CLIP_DEFAULTS = {"output": "clip", "width": 480, "fps": 12, "speed": 1.0,
+                 "quality": "medium", "target_kb": None, "target_quality": None}
+
+def load_manifest(path: Path, defaults: dict) -> list[dict]:
+    """Read clips from a JSON, YAML or CSV manifest.
+
+    JSON/YAML may be a list of clips or {"clips": [...]}; CSV uses one row per
+    clip with the same column names as the CLI flags (url,start,end,output,...).
+    Relative outputs are resolved against the manifest's directory.
+    """
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding="utf-8")
+    if suffix in (".yaml", ".yml"):
+        import yaml
+        data = yaml.safe_load(text)
+    elif suffix == ".csv":
+        import csv, io
+        data = [{k: v for k, v in row.items() if v not in (None, "")}
+                for row in csv.DictReader(io.StringIO(text))]
+    else:
+        data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("clips", [])
+
+    jobs = []
+    for n, clip in enumerate(data, 1):
+        missing = [k for k in ("url", "start", "end") if k not in clip]
+        if missing:
+            raise ValueError(f"{path}: clip {n} is missing {', '.join(missing)}")
+        job = {**defaults, **clip}
+        out = Path(str(job["output"])).expanduser()
+        job["output"] = str(out if out.is_absolute() else (path.parent / out).resolve())
+        jobs.append(job)
+    return jobs
+
+def _download_job(url: str, outdir: Path, retries: int,
+                  cache: SourceCache | None = None,
+                  span: tuple[float, float] | None = None
+                  ) -> tuple[str, float, str | None, float]:
+    """Download one source (I/O-bound; runs on the download thread pool).
+
+    With span=(start, end) only that range is fetched (see fetch_clip_source).
+    Returns (path, offset, source_id, seconds).
+    """
+    t0 = time.perf_counter()
+    for attempt in range(retries + 1):
+        try:
+            offset, source_id = 0.0, None
+            if span is not None:
+                src, offset, source_id = fetch_clip_source(url, *span, outdir, cache=cache)
+            elif cache is not None:
+                src, _ = cache.fetch(url)
+            else:
+                outdir.mkdir(parents=True, exist_ok=True)
+                src = download_with_ytdlp(url, outdir)
+            return str(src), offset, source_id, time.perf_counter() - t0
+        except Exception:
+            if attempt == retries:
+                raise
+
+def _encode_job(src: str, job: dict, single_pass: bool, threads,
+                offset: float = 0.0, crf_cache: Path | None = None,
+                source_id: str | None = None) -> tuple[float, list[dict]]:
+    """Encode one clip (CPU-heavy; runs on the encode process pool).
+
+    Returns (seconds, trace events recorded in the worker).
+    """
+    t0 = time.perf_counter()
+    widths = job.get("widths")
+    if isinstance(widths, str):  # CSV: "320,480,720"
+        widths = [int(w) for w in widths.split(",") if w]
+    make_videos(Path(src), parse_time(job["start"]) - offset,
+                parse_time(job["end"]) - offset,
+                Path(job["output"]),
+                width=int(job["width"]), fps=int(job["fps"]),
+                speed=float(job["speed"]), quality=job["quality"],
+                single_pass=single_pass, threads=threads,
+                target_kb=float(job["target_kb"]) if job.get("target_kb") else None,
+                target_quality=(float(job["target_quality"])
+                                if job.get("target_quality") else None),
+                crf_cache=crf_cache, widths=widths,
+                poster_at=parse_time(job.get("poster", 0)), source_id=source_id)
+    return time.perf_counter() - t0, instrument.drain()
+
+def run_batch(jobs: list[dict], workdir: Path, download_workers: int = 4,
+              encode_workers: int | None = None, retries: int = 1,
+              single_pass: bool = False, threads: int | None = None,
+              cache: SourceCache | None = None,
+              range_fetch: bool = False, crf_cache: Path | None = None) -> list[dict]:
+    """Download each distinct source once and fan the encodes out to a process pool.
+
+    Downloads run on a thread pool; encodes start as soon as their source is
+    ready (immediately for sources already in the cache). The encode pool is
+    sized so that (workers x encoder threads) roughly matches the core count,
+    since VP9 encodes saturate the CPU. With range_fetch every clip fetches
+    its own range instead of sharing a full download.
+    """
+    if encode_workers is None:
+        per_job = 2 * encoder_threads(threads) if single_pass else encoder_threads(threads)
+        encode_workers = max(1, (os.cpu_count() or 2) // per_job)
+
+    by_url: dict[tuple[str, int | None], list[int]] = {}
+    for i, job in enumerate(jobs):
+        key = (canonical_watch_url(job["url"]), i if range_fetch else None)
+        by_url.setdefault(key, []).append(i)
+    results = [{"output": job["output"], "url": job["url"], "status": "pending",
+                "attempts": 0, "download_s": None, "encode_s": None, "error": None}
+               for job in jobs]
+
+    with ThreadPoolExecutor(download_workers) as dl_pool, \
+         ProcessPoolExecutor(encode_workers) as enc_pool:
+        downloads = {}
+        for (url, i), idx in by_url.items():
+            key = hashlib.sha1(f"{url}#{i}".encode()).hexdigest()[:12]
+            span = ((parse_time(jobs[idx[0]]["start"]), parse_time(jobs[idx[0]]["end"]))
+                    if range_fetch else None)
+            fut = dl_pool.submit(_download_job, url, workdir / key, retries, cache, span)
+            downloads[fut] = (url, i)
+        encodes = {}
+        pending = set(downloads)
+
+        def submit_encode(i, src, offset, source_id):
+            results[i]["attempts"] += 1
+            fut = enc_pool.submit(_encode_job, src, jobs[i], single_pass, threads,
+                                  offset, crf_cache, source_id)
+            encodes[fut] = (i, src, offset, source_id)
+            pending.add(fut)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                if fut in downloads:
+                    key = downloads.pop(fut)
+                    try:
+                        src, offset, source_id, secs = fut.result()
+                    except Exception as e:
+                        print(f"✗ Download failed: {key[0]} ({e})", file=sys.stderr)
+                        for i in by_url[key]:
+                            results[i].update(status="failed", error=f"download: {e}")
+                        continue
+                    print(f"Downloaded: {Path(src).name} ({secs:.1f}s)")
+                    for i in by_url[key]:
+                        results[i]["download_s"] = round(secs, 3)
+                        submit_encode(i, src, offset, source_id)
+                else:
+                    i, src, offset, source_id = encodes.pop(fut)
+                    try:
+                        secs, events = fut.result()
+                    except Exception as e:
+                        if results[i]["attempts"] <= retries:
+                            print(f"↻ Retrying {results[i]['output']} ({e})", file=sys.stderr)
+                            submit_encode(i, src, offset, source_id)
+                        else:
+                            results[i].update(status="failed", error=f"encode: {e}")
+                        continue
+                    instrument.merge(events)
+                    results[i].update(status="ok", encode_s=round(secs, 3))
+                    print(f"✓ Encoded {results[i]['output']} ({secs:.1f}s)")
+    return results
+
+def print_batch_report(results: list[dict]):
+    width = max([len(r["output"]) for r in results] + [6])
+    print(f"\n{'output':<{width}}  {'status':<7} {'tries':>5} {'download':>9} {'encode':>8}")
+    for r in results:
+        dl = f"{r['download_s']:.1f}s" if r["download_s"] is not None else "-"
+        enc = f"{r['encode_s']:.1f}s" if r["encode_s"] is not None else "-"
+        print(f"{r['output']:<{width}}  {r['status']:<7} {r['attempts']:>5} {dl:>9} {enc:>8}")
+    failed = sum(r["status"] != "ok" for r in results)
+    print(f"\n{len(results) - failed}/{len(results)} clips encoded")
 
 def main():
     ap = argparse.ArgumentParser(description="YouTube range → MP4 + WebM clip")
-    ap.add_argument("--url", required=True)
-    ap.add_argument("--start", required=True, help="SS | MM:SS | HH:MM:SS")
-    ap.add_argument("--end", required=True, help="SS | MM:SS | HH:MM:SS")
-    ap.add_argument("-o","--output", default="clip")
-    ap.add_argument("--width", type=int, default=480)
-    ap.add_argument("--fps", type=int, default=12)
-    ap.add_argument("--speed", type=float, default=1.0)
-    ap.add_argument("--quality", choices=["low","medium","high"], default="medium")
-    ap.add_argument("--keep-mp4", action="store_true")
+    ap.add_argument("--url")
+    ap.add_argument("--start", help="SS | MM:SS | HH:MM:SS")
+    ap.add_argument("--end", help="SS | MM:SS | HH:MM:SS")
+    ap.add_argument("-o","--output", default=CLIP_DEFAULTS["output"])
+    ap.add_argument("--width", type=int, default=CLIP_DEFAULTS["width"])
+    ap.add_argument("--fps", type=int, default=CLIP_DEFAULTS["fps"])
+    ap.add_argument("--speed", type=float, default=CLIP_DEFAULTS["speed"])
+    ap.add_argument("--quality", choices=["low","medium","high"],
+                    default=CLIP_DEFAULTS["quality"])
+    rate = ap.add_mutually_exclusive_group()
+    rate.add_argument("--target-kb", type=float,
+                      help="pick each codec's CRF so its file lands near this size (KiB)")
+    rate.add_argument("--target-quality", type=float,
+                      help="pick the highest CRF whose SSIM stays above this (e.g. 0.97)")
+    ap.add_argument("--keep-mp4", action="store_true",
+                    help="also copy the source into the cwd (it stays cached either way)")
+    ap.add_argument("--single-pass", action="store_true",
+                    help="decode/scale once and run both encoders in one ffmpeg process")
+    ap.add_argument("--threads", type=int, default=None,
+                    help="thread budget per encoder (default: half the cores with --single-pass)")
+    ap.add_argument("--widths", type=lambda v: [int(w) for w in v.split(",") if w],
+                    help="comma-separated rendition widths, e.g. 320,480,720 "
+                         "(writes <output>-<w>.mp4/.webm, a poster and a JSON sidecar)")
+    ap.add_argument("--poster", default="0",
+                    help="poster frame time within the clip with --widths (SS | MM:SS)")
+    ap.add_argument("--chunked", action="store_true",
+                    help="encode keyframe-aligned chunks in parallel and concat them losslessly")
+    ap.add_argument("--chunks", type=int, default=0,
+                    help="number of chunks with --chunked (default: one per core)")
+    ap.add_argument("--manifest", type=Path,
+                    help="JSON/YAML/CSV list of clips to convert in one batch")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="parallel encodes in batch mode (default: cores / encoder threads)")
+    ap.add_argument("--download-workers", type=int, default=4)
+    ap.add_argument("--retries", type=int, default=1,
+                    help="extra attempts per failed download/encode in batch mode")
+    ap.add_argument("--report", type=Path, help="write the batch summary as JSON")
+    ap.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR,
+                    help="persistent source cache (env: CONVERTER_CACHE_DIR)")
+    ap.add_argument("--cache-max-gb", type=float, default=DEFAULT_CACHE_MAX_GB,
+                    help="evict least-recently-used sources above this size")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="download into a temporary directory instead of the cache")
+    ap.add_argument("--cache-list", action="store_true", help="list cached sources and exit")
+    ap.add_argument("--cache-prune", action="store_true",
+                    help="drop broken/partial entries, evict down to --cache-max-gb and exit")
+    ap.add_argument("--cache-verify", action="store_true",
+                    help="with --cache-prune, also re-check every entry's SHA-256")
+    ap.add_argument("--range-fetch", action="store_true",
+                    help="fetch only the clip's byte range/segments (falls back to a full download)")
+    ap.add_argument("--range-margin", type=float, default=RANGE_MARGIN,
+                    help="seconds fetched around the clip so the cut lands after a keyframe")
+    ap.add_argument("--stand-in", type=Path,
+                    help="serve this local file over HTTP and use it as --url (offline testing)")
+    instrument.add_arguments(ap)
     args = ap.parse_args()
 
+    cache = None if args.no_cache else SourceCache(args.cache_dir, args.cache_max_gb)
+    if args.cache_list or args.cache_prune:
+        cache = cache or SourceCache(args.cache_dir, args.cache_max_gb)
+        if args.cache_prune:
+            removed = cache.prune(verify=args.cache_verify)
+            print(f"Pruned {len(removed)} cache entries")
+        print_cache(cache)
+        return
+    if not args.manifest and not ((args.url or args.stand_in) and args.start and args.end):
+        ap.error("--url, --start and --end are required unless --manifest is given")
+    if args.manifest and args.chunked:
+        ap.error("--chunked encodes a single clip; with --manifest, clips already run "
+                 "in parallel (see --jobs)")
+    if args.widths and args.chunked:
+        ap.error("--chunked can't be combined with --widths: the rendition ladder is "
+                 "encoded from one decode pass")
+
     if not has_ffmpeg():
         print("ffmpeg not found on PATH.", file=sys.stderr); sys.exit(2)
 
+    with instrument.session(args, "converter"):
+        if args.stand_in:
+            with serve_file(args.stand_in) as args.url:
+                print(f"Serving stand-in source at {args.url}")
+                convert(args, cache)
+        else:
+            convert(args, cache)
+
+def convert(args, cache: SourceCache | None):
+    if args.manifest:
+        defaults = {**CLIP_DEFAULTS, "width": args.width, "fps": args.fps,
+                    "speed": args.speed, "quality": args.quality,
+                    "target_kb": args.target_kb, "target_quality": args.target_quality}
+        jobs = load_manifest(args.manifest, defaults)
+        print(f"Converting {len(jobs)} clips from {args.manifest}…")
+        with tempfile.TemporaryDirectory() as td:
+            results = run_batch(jobs, Path(td),
+                                download_workers=args.download_workers,
+                                encode_workers=args.jobs, retries=args.retries,
+                                single_pass=args.single_pass, threads=args.threads,
+                                cache=cache, range_fetch=args.range_fetch,
+                                crf_cache=args.cache_dir.expanduser() / CRF_CACHE_NAME)
+        print_batch_report(results)
+        if args.report:
+            args.report.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        sys.exit(0 if all(r["status"] == "ok" for r in results) else 1)
+
     start_s = parse_time(args.start); end_s = parse_time(args.end)
     out_base = Path(args.output).expanduser().resolve()
     url = canonical_watch_url(args.url)
 
     with tempfile.TemporaryDirectory() as td:
         td = Path(td)
-        print("Downloading with yt-dlp…")
-        src = download_with_ytdlp(url, td)
-        print(f"Downloaded: {src.name}")
+        offset, source_id = 0.0, None
+        if args.range_fetch:
+            print(f"Fetching {args.start}–{args.end} (±{args.range_margin:g}s)…")
+            src, offset, source_id = fetch_clip_source(url, start_s, end_s, td,
+                                                       margin=args.range_margin, cache=cache)
+            print(f"Fetched: {src.name} ({src.stat().st_size / 1024**2:.1f} MiB)")
+        elif cache is not None:
+            src, hit = cache.fetch(url)
+            print(f"{'Cached' if hit else 'Downloaded'}: {src.name}")
+        else:
+            print("Downloading with yt-dlp…")
+            src = download_with_ytdlp(url, td)
+            print(f"Downloaded: {src.name}")
         print(f"Encoding MP4 + WebM at {args.quality} quality…")
-        make_videos(src, start_s, end_s, out_base,
+        make_videos(src, start_s - offset, end_s - offset, out_base,
                     width=args.width, fps=args.fps,
-                    speed=args.speed, quality=args.quality)
-        print(f"Done: {out_base.with_suffix('.mp4')} and {out_base.with_suffix('.webm')}")
+                    speed=args.speed, quality=args.quality,
+                    single_pass=args.single_pass, threads=args.threads,
+                    target_kb=args.target_kb, target_quality=args.target_quality,
+                    crf_cache=args.cache_dir.expanduser() / CRF_CACHE_NAME,
+                    chunks=args.chunks if args.chunked else None,
+                    widths=args.widths, poster_at=parse_time(args.poster),
+                    source_id=source_id)
+        if args.widths:
+            print(f"Done: {out_base.with_suffix('.json')}")
+        else:
+            print(f"Done: {out_base.with_suffix('.mp4')} and {out_base.with_suffix('.webm')}")
         if args.keep_mp4:
             kept = Path.cwd() / src.name
-            src.replace(kept)
+            shutil.copy2(src, kept)
             print(f"Kept source MP4 at: {kept}")
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Script to fingerprint static assets and rewrite the pages that reference them.
+
+Every stylesheet, image, video, PDF and script under css/, images/, js/ and
+res/ (plus the site logo) is renamed to a content-hashed name, e.g.
+    images/projects/ibvs/out.webm -> images/projects/ibvs/out.3f2a9c41d0.webm
+and every reference in the HTML pages (index.html, projects.html, contact.html,
+projects/*.html and the project_cards/ fragments) and the url()s in the
+stylesheets (rewritten before the stylesheets themselves are hashed) point to
+the hashed name, so browsers can cache them for good. The mapping is written
+to asset-manifest.json.
+
+An original is only kept (with the hashed name linked next to it) when
+something still refers to it by its plain path: a string literal in a script,
+or a path scripts build at runtime, listed in KEEP_ORIGINALS (e.g. the org
+logos in js/include-partials.js). Everything else exists once, under its hash.
+
+This rewrites the site tree it is given, so run it on a build copy (the CI
+checkout or a dist/ directory), not on your working tree:
+    python fingerprint_assets.py dist
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+ASSET_DIRS = ['css', 'images', 'js', 'res']
+ASSET_FILES = ['logo.png', 'logo.webp']
+ASSET_EXTS = {'.webp', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.avif', '.ico',
+              '.mp4', '.webm', '.pdf', '.js', '.css'}
+PAGE_GLOBS = ['*.html', 'projects/*.html', 'project_cards/**/*.html']
+# Fragments included into root-level pages resolve their URLs from the site root
+ROOT_RELATIVE_DIRS = ['project_cards']
+# Paths scripts assemble at runtime (`images/logos/${logo}`), which no scan can see
+KEEP_ORIGINALS = ['images/logos/*']
+
+MANIFEST_NAME = 'asset-manifest.json'
+HASH_LEN = 10
+HASHED_RE = re.compile(r'\.[0-9a-f]{%d}$' % HASH_LEN)
+URL_ATTR_RE = re.compile(r'''(?P<attr>\b(?:src|href|poster|data-src)=)(?P<q>["'])(?P<url>[^"']*)(?P=q)''')
+SRCSET_RE = re.compile(r'''(?P<attr>\b(?:srcset|data-srcset)=)(?P<q>["'])(?P<value>[^"']*)(?P=q)''')
+CSS_URL_RE = re.compile(r'''url\((?P<q>["']?)(?P<url>[^"')]+)(?P=q)\)''')
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#)', re.IGNORECASE)
+JS_STRING_RE = re.compile(r'''(["'`])([\w@./-]+\.[A-Za-z0-9]+)\1''')
+
+def content_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:HASH_LEN]
+
+def iter_assets(site):
+    """Yield site-relative paths of every asset to fingerprint."""
+    for name in ASSET_DIRS:
+        for path in sorted((site / name).rglob('*')):
+            if (path.is_file() and path.suffix.lower() in ASSET_EXTS
+                    and not HASHED_RE.search(path.stem)):
+                yield path.relative_to(site).as_posix()
+    for name in ASSET_FILES:
+        if (site / name).is_file():
+            yield name
+
+def hashed_name(rel_path, digest):
+    path = Path(rel_path)
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}").as_posix()
+
+def fingerprint(site):
+    """Work out the hashed name of every asset; returns {original: hashed} paths.
+
+    Stylesheets come last: their url()s are rewritten to the hashed names of
+    the assets they use first, so their own hash covers the final content.
+    Nothing is renamed yet (see place_assets).
+    """
+    assets = list(iter_assets(site))
+    manifest = {}
+    for rel_path in [path for path in assets if not path.endswith('.css')]:
+        manifest[rel_path] = hashed_name(rel_path, content_hash(site / rel_path))
+    for rel_path in [path for path in assets if path.endswith('.css')]:
+        stylesheet = site / rel_path
+        css = stylesheet.read_text(encoding='utf-8')
+        new_css = rewrite_css(css, stylesheet.parent, site, manifest)
+        if new_css != css:
+            stylesheet.unlink()  # may be hardlinked to a source file
+            stylesheet.write_text(new_css, encoding='utf-8')
+        manifest[rel_path] = hashed_name(rel_path, content_hash(stylesheet))
+    return manifest
+
+def still_referenced(site, manifest):
+    """Originals that something still refers to by their plain path.
+
+    Pages and stylesheets are rewritten, so that leaves string literals in the
+    scripts (resolved from the site root, like the pages loading them) and the
+    paths in KEEP_ORIGINALS.
+    """
+    keep = {rel for rel in manifest
+            if any(fnmatch.fnmatch(rel, pattern) for pattern in KEEP_ORIGINALS)}
+    for rel_path in manifest:
+        if rel_path.endswith('.js'):
+            script = (site / rel_path).read_text(encoding='utf-8', errors='replace')
+            for _, url in JS_STRING_RE.findall(script):
+                rel = os.path.normpath(url.lstrip('/')).replace(os.sep, '/')
+                if rel in manifest:
+                    keep.add(rel)
+    return keep
+
+def place_assets(site, manifest, keep):
+    """Rename every asset to its hashed name; those in `keep` get a hashed link instead."""
+    for rel_path, target in manifest.items():
+        if (site / target).exists():
+            if rel_path not in keep:
+                (site / rel_path).unlink()
+        elif rel_path in keep:
+            try:
+                os.link(site / rel_path, site / target)
+            except OSError:
+                shutil.copy2(site / rel_path, site / target)
+        else:
+            os.replace(site / rel_path, site / target)
+
+def url_base(site, page):
+    """Directory that relative URLs in `page` resolve against."""
+    rel = page.relative_to(site)
+    if rel.parts[0] in ROOT_RELATIVE_DIRS:
+        return site
+    return page.parent
+
+def rewrite_url(url, base, site, manifest):
+    """Return the fingerprinted form of `url`, or `url` unchanged."""
+    if not url or EXTERNAL_RE.match(url):
+        return url
+    path, suffix = url, ''
+    query = re.search(r'[?#]', url)
+    if query:
+        path, suffix = url[:query.start()], url[query.start():]
+    if path.startswith('/'):
+        target = site / path.lstrip('/')
+    else:
+        target = base / path
+    try:
+        rel = Path(os.path.normpath(target)).relative_to(site).as_posix()
+    except ValueError:
+        return url
+    if rel not in manifest:
+        return url
+    if path.startswith('/'):
+        new_path = '/' + manifest[rel]
+    else:
+        new_path = os.path.relpath(site / manifest[rel], base).replace(os.sep, '/')
+    return new_path + suffix
+
+def rewrite_page(page_html, base, site, manifest):
+    """Rewrite src/href/poster, srcset and CSS url() references in a page."""
+    def attr(match):
+        new = rewrite_url(match.group('url'), base, site, manifest)
+        return f"{match.group('attr')}{match.group('q')}{new}{match.group('q')}"
+
+    def srcset(match):
+        candidates = []
+        for candidate in match.group('value').split(','):
+            parts = candidate.strip().split(None, 1)
+            if parts:
+                parts[0] = rewrite_url(parts[0], base, site, manifest)
+                candidates.append(' '.join(parts))
+        return f"{match.group('attr')}{match.group('q')}{', '.join(candidates)}{match.group('q')}"
+
+    page_html = URL_ATTR_RE.sub(attr, page_html)
+    page_html = SRCSET_RE.sub(srcset, page_html)
+    return rewrite_css(page_html, base, site, manifest)
+
+def rewrite_css(css, base, site, manifest):
+    """Rewrite CSS url() references (in a stylesheet or a page's inline styles)."""
+    def css_url(match):
+        new = rewrite_url(match.group('url'), base, site, manifest)
+        return f"url({match.group('q')}{new}{match.group('q')})"
+
+    return CSS_URL_RE.sub(css_url, css)
+
+def main():
+    """Fingerprint the assets of a site tree and rewrite its pages."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('site', type=Path, help='site tree to rewrite in place (a build copy)')
+    args = parser.parse_args()
+    site = args.site.resolve()
+
+    manifest = fingerprint(site)
+    print(f"Fingerprinted {len(manifest)} assets")
+
+    pages = sorted({page for pattern in PAGE_GLOBS for page in site.glob(pattern)})
+    rewritten = 0
+    for page in pages:
+        page_html = page.read_text(encoding='utf-8')
+        new_html = rewrite_page(page_html, url_base(site, page), site, manifest)
+        if new_html != page_html:
+            page.write_text(new_html, encoding='utf-8')
+            rewritten += 1
+            print(f"  ✓ Rewrote {page.relative_to(site).as_posix()}")
+
+    keep = still_referenced(site, manifest)
+    place_assets(site, manifest, keep)
+    print(f"✓ Renamed {len(manifest) - len(keep)} assets; kept {len(keep)} originals "
+          f"still referenced by path")
+
+    (site / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True),
+                                      encoding='utf-8')
+    print(f"\n✅ Rewrote references in {rewritten}/{len(pages)} pages; mapping in {MANIFEST_NAME}")
+
+if __name__ == "__main__":
+    main()
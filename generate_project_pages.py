@@ -1,16 +1,60 @@
 #!/usr/bin/env python3
 """
 Script to generate dedicated project pages from project card HTML files.
+
+Builds are incremental: projects/.build-manifest.json records a hash of every
+card and of the generator, so only pages whose inputs changed are re-rendered,
+and pages are written atomically and only when their bytes change.
+
+Cards are read with one regex scan per field (tests/test_extractors.py runs
+them over every card in project_cards/).
+
+--jobs N spreads extraction and rendering over N worker processes; output and
+log order stay the same, and failing cards are reported at the end instead of
+aborting the build.
+
+Every build also refreshes project_index.json, a compact filter/search index
+(token and org/year/tag postings) used by js/include-partials.js.
+
+Project images get width/height, loading="lazy" and, once responsive_images.py
+has built their variants, srcset/sizes (AVIF via <picture>); videos get their
+intrinsic size, a poster when converter.py wrote a sidecar, and preload="none"
+with autoplay deferred until they scroll into view. The probed sizes and
+sidecars are part of each page's input hash, so re-encoding a video or
+resizing an image rebuilds the pages that use it.
+
+Pages are streamed straight into their output file: TEMPLATE is split into
+pre-encoded static chunks at import and written out interleaved with each
+project's fragments (tests/test_pages.py checks the result against
+TEMPLATE.format).
+
+--profile build.trace.json times every card's read/extract/render
+(see instrument.py) and prints where the build spent its time.
 """
 
+import argparse
+import contextlib
+import hashlib
+import html
+import io
+import json
 import os
 import re
+import string
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import instrument
+import project_manifest
+import responsive_images
+
 # Base directory
-BASE_DIR = Path("/Users/edgarcancino/Documents/Projects/edgarcancinoe.github.io")
+BASE_DIR = Path(__file__).resolve().parent
 CARDS_DIR = BASE_DIR / "project_cards"
 PROJECTS_DIR = BASE_DIR / "projects"
+# Org of cards without an institution badge (js/include-partials.js uses the same)
+DEFAULT_ORG = "Personal"
 
 # Template for project pages
 TEMPLATE = '''<!DOCTYPE html>
@@ -25,50 +69,7 @@ TEMPLATE = '''<!DOCTYPE html>
         onload="this.rel='stylesheet'" rel="stylesheet" />
     <title>{title} | Jose Edgar Hernandez</title>
     <link href="../logo.webp" rel="icon" type="image/webp" />
-    <script src="https://cdn.tailwindcss.com?plugins=forms,container-queries"></script>
-    <style type="text/tailwindcss">
-        @layer base {{
-      :root {{
-        --bg-root:        #111714;
-        --bg-surface:     #161d1a;
-        --bg-panel:       #1c2620;
-        --bd-muted:       #29382f;
-        --bd-strong:      #3d5245;
-
-        --fg-primary:     #ffffff;
-        --fg-secondary:   #e5e7eb;
-        --fg-muted:       #9eb7a8;
-        --fg-subtle:      #8aa096;
-
-        --brand:          #38e07b;
-        --brand-600:      #2dd06f;
-        --brand-700:      #23b85f;
-        --brand-800:      #1a9e52;
-        --brand-900:      #138446;
-        --brand-tint:     #b9f2cf;
-
-        --teal-600:       #27c1a7;
-        --teal-800:       #126d60;
-
-        --shadow-strong:  0 10px 24px rgba(0,0,0,.35), 0 4px 8px rgba(0,0,0,.25);
-      }}
-    }}
-
-    @layer utilities {{
-      .text-muted  {{ color: var(--fg-muted); }}
-      .text-subtle {{ color: var(--fg-subtle); }}
-      .panel       {{ background: var(--bg-panel); border: 1px solid var(--bd-strong); }}
-      .btn-brand   {{ background: var(--brand); color: var(--bg-root); }}
-      .btn-brand:hover {{ background: var(--brand-600); box-shadow: 0 0 0 6px color-mix(in srgb, var(--brand) 25%, transparent); }}
-    }}
-
-    html {{ scroll-behavior: smooth; }}
-    .reveal {{ opacity: 0; transform: translateY(16px); transition: opacity .6s ease, transform .6s ease; }}
-    .reveal.show {{ opacity: 1; transform: none; }}
-    @media (prefers-reduced-motion: reduce) {{
-      .reveal {{ transition: none; opacity: 1; transform: none; }}
-    }}
-  </style>
+    <link href="../css/site.css" rel="stylesheet" />
 </head>
 
 <body>
@@ -222,45 +223,200 @@ TEMPLATE = '''<!DOCTYPE html>
             }}, {{ threshold: 0.12 }});
             els.forEach(el => io.observe(el));
         }})();
+
+        // Videos load nothing (preload="none") until they scroll into view, then play
+        (function () {{
+            const videos = document.querySelectorAll('video[data-autoplay]');
+            const io = new IntersectionObserver((entries) => {{
+                entries.forEach(entry => {{
+                    if (entry.isIntersecting) entry.target.play().catch(() => {{}});
+                    else entry.target.pause();
+                }});
+            }}, {{ threshold: 0.25 }});
+            videos.forEach(video => io.observe(video));
+        }})();
     </script>
 </body>
 
 </html>'''
 
-def extract_card_data(card_html):
-    """Extract relevant data from a project card HTML file."""
+def empty_card_fields():
+    return {'title': None, 'year': None, 'institution': None, 'list': None,
+            'paragraph': None, 'tags': [], 'video': None, 'img': None, 'links': []}
+
+def extract_fields(card_html):
+    """Extract the raw card fields with one regex scan per field."""
+    fields = empty_card_fields()
     
     # Extract title
     title_match = re.search(r'<h3[^>]*>(.*?)<span class="ml-2', card_html, re.DOTALL)
     if title_match:
-        title = re.sub(r'<[^>]+>', '', title_match.group(1)).strip()
-    else:
-        title = "Project"
+        fields['title'] = title_match.group(1)
     
     # Extract year
     year_match = re.search(r'<span[^>]*>(\d{4})</span>', card_html)
-    year = year_match.group(1) if year_match else "2024"
+    if year_match:
+        fields['year'] = year_match.group(1)
     
     # Extract institution
     inst_match = re.search(r'<span class="text-xs text-white">(.*?)</span>', card_html)
-    institution = inst_match.group(1) if inst_match else "Personal"
+    if inst_match:
+        fields['institution'] = inst_match.group(1)
+    
+    # Extract description - list-based and paragraph-based
+    list_match = re.search(r'<div class="text-\[#9eb7a8\][^>]*>(.*?)</div>', card_html, re.DOTALL)
+    if list_match:
+        fields['list'] = list_match.group(1)
+    desc_match = re.search(r'<p class="text-\[#9eb7a8\][^>]*>(.*?)</p>', card_html, re.DOTALL)
+    if desc_match:
+        fields['paragraph'] = desc_match.group(1)
+    
+    # Extract tags
+    fields['tags'] = re.findall(r'<span class="px-2 py-1 bg-\[#38e07b\]/20[^>]*>(.*?)</span>', card_html)
+    
+    # Extract media (image or video)
+    video_match = re.search(r'<video[^>]*>.*?</video>', card_html, re.DOTALL)
+    if video_match:
+        fields['video'] = video_match.group(0)
+    img_match = re.search(r'<img[^>]*alt="([^"]*)"[^>]*src="([^"]*)"[^>]*/?>', card_html)
+    if img_match:
+        fields['img'] = img_match.groups()
+    
+    # Extract links
+    fields['links'] = re.findall(r'<a href="([^"]*)"[^>]*target="_blank"[^>]*>.*?<span[^>]*>(.*?)</span>', card_html, re.DOTALL)
+    return fields
+
+def compile_template(template):
+    """Split a page template into (static bytes, field) chunks.
+
+    Done once at import, so rendering only encodes the per-project fragments;
+    the static HTML is written out as the same pre-encoded bytes every time.
+    """
+    return [(literal.encode('utf-8'), field)
+            for literal, field, _, _ in string.Formatter().parse(template)]
+
+TEMPLATE_PARTS = compile_template(TEMPLATE)
+
+def write_page(f, data):
+    """Stream a page to a binary file: TEMPLATE's static chunks interleaved with
+    the encoded fragments. Returns the number of bytes written."""
+    size = 0
+    for literal, field in TEMPLATE_PARTS:
+        size += f.write(literal)
+        if field is not None:
+            size += f.write(data[field].encode('utf-8'))
+    return size
+
+def render_page(data):
+    """The page as a string; equivalent to TEMPLATE.format(**data)."""
+    buffer = io.BytesIO()
+    write_page(buffer, data)
+    return buffer.getvalue().decode('utf-8')
+
+def extract_card_data(card_html):
+    """Extract relevant data from a project card HTML file."""
+    return build_card_data(extract_fields(card_html))
+
+# Width of the media panel (max-w-4xl minus padding) for the browser to pick a srcset candidate
+MEDIA_SIZES = '(min-width: 60rem) 54rem, calc(100vw - 4rem)'
+
+def srcset(candidates):
+    return ', '.join(f'../{src} {width}w' for width, src in candidates)
+
+def image_html(img_src, alt_text, variants, root=BASE_DIR):
+    """The project image with srcset/sizes, intrinsic size and lazy loading.
+
+    Variants come from responsive_images.py; AVIF ones are offered through a
+    <picture> source, WebP ones through the <img> srcset.
+    """
+    entry = variants.get(img_src)
+    size = (entry['width'], entry['height']) if entry else responsive_images.image_size(root / img_src)
+    attrs = f'src="../{img_src}" alt="{alt_text}"'
+    if entry and entry['variants'].get('webp'):
+        attrs += f' srcset="{srcset(entry["variants"]["webp"])}" sizes="{MEDIA_SIZES}"'
+    if size:
+        attrs += f' width="{size[0]}" height="{size[1]}"'
+    img = f'<img {attrs} class="w-full rounded-lg" loading="lazy" decoding="async" />'
+    if entry and entry['variants'].get('avif'):
+        return (f'<picture><source type="image/avif" srcset="{srcset(entry["variants"]["avif"])}" '
+                f'sizes="{MEDIA_SIZES}" />{img}</picture>')
+    return img
+
+def size_video(media, root=BASE_DIR):
+    """Give a card's <video> its intrinsic size, a poster from a converter sidecar
+    and lazy loading.
+
+    autoplay becomes data-autoplay next to preload="none", so nothing is fetched
+    until TEMPLATE's script plays the video on scrolling into view.
+    """
+    attrs = ''
+    source = re.search(r'<source[^>]*\ssrc="\.\./([^"]+)"', media)
+    if source and not re.search(r'<video\b[^>]*\swidth=', media):
+        info = responsive_images.video_info(root / source.group(1))
+        if info:
+            attrs += f' width="{info["width"]}" height="{info["height"]}"'
+            if info['poster'] and 'poster=' not in media:
+                attrs += f' poster="../{info["poster"].relative_to(root).as_posix()}"'
+    if not re.search(r'<video\b[^>]*\spreload=', media):
+        attrs += ' preload="none"'
+
+    def lazy(match):
+        return re.sub(r'\sautoplay\b', ' data-autoplay', match.group(0)) + attrs
+
+    return re.sub(r'<video\b[^>]*?(?=\s*/?>)', lazy, media, count=1)
+
+def media_probe(card_html, root=BASE_DIR):
+    """What a card's page takes from its media files, as a string for the input hash.
+
+    Image sizes are probed from their headers; videos contribute their
+    converter sidecar (renditions and poster) verbatim, or their MP4 size.
+    """
+    probes = []
+    for src in sorted(set(re.findall(r'\ssrc="(images/[^"]+)"', card_html))):
+        path = root / src
+        if path.suffix.lower() in ('.mp4', '.webm'):
+            sidecar = responsive_images.sidecar_path(path)
+            if sidecar.exists():
+                probe = sidecar.read_text(encoding='utf-8')
+            else:
+                probe = responsive_images.mp4_size(path) if path.suffix.lower() == '.mp4' else None
+        else:
+            probe = responsive_images.image_size(path)
+        probes.append([src, probe])
+    return json.dumps(probes)
+
+def build_card_data(fields, variants=None, root=BASE_DIR):
+    """Turn raw card fields into the HTML fragments used by TEMPLATE.
+
+    `variants` is the responsive_images.py manifest used for image srcsets;
+    image and video sizes are probed from the files under `root`.
+    """
+    
+    # Title
+    if fields['title'] is not None:
+        title = re.sub(r'<[^>]+>', '', fields['title']).strip()
+    else:
+        title = "Project"
     
-    # Extract description - handle both paragraph and list formats
+    # Year and institution
+    year = fields['year'] or "2024"
+    institution = card_org(fields)
+    
+    # Description - handle both paragraph and list formats
     desc_html = ''
     
-    # Try to find list-based description first
-    list_match = re.search(r'<div class="text-\[#9eb7a8\][^>]*>(.*?)</div>', card_html, re.DOTALL)
-    if list_match and ('<ul' in list_match.group(1) or '<li' in list_match.group(1)):
+    # Try list-based description first
+    list_raw = fields['list']
+    if list_raw is not None and ('<ul' in list_raw or '<li' in list_raw):
         # Found list content
-        list_content = list_match.group(1).strip()
+        list_content = list_raw.strip()
         # Update colors to use CSS variables
         list_content = list_content.replace('text-[#9eb7a8]', 'text-[var(--fg-secondary)]')
         desc_html = f'                            <div class="text-[var(--fg-secondary)] text-lg leading-relaxed mb-6">\n                                {list_content}\n                            </div>'
     else:
         # Try paragraph-based description
-        desc_match = re.search(r'<p class="text-\[#9eb7a8\][^>]*>(.*?)</p>', card_html, re.DOTALL)
-        if desc_match:
-            description_raw = desc_match.group(1).strip()
+        if fields['paragraph'] is not None:
+            description_raw = fields['paragraph'].strip()
             # Split by <br> tags
             desc_parts = [p.strip() for p in re.split(r'<br\s*/?>', description_raw) if p.strip()]
             desc_html = '\n'.join([f'                            <p class="text-[var(--fg-secondary)] text-lg leading-relaxed mb-6">\n                                {part}\n                            </p>' for part in desc_parts])
@@ -268,27 +424,26 @@ def extract_card_data(card_html):
     if not desc_html:
         desc_html = '                            <p class="text-[var(--fg-secondary)] text-lg leading-relaxed mb-6">\n                                Project details coming soon.\n                            </p>'
     
-    # Extract tags
-    tags = re.findall(r'<span class="px-2 py-1 bg-\[#38e07b\]/20[^>]*>(.*?)</span>', card_html)
+    # Tags
+    tags = fields['tags']
     tags_html = '\n'.join([f'                            <span class="px-3 py-1 rounded-full text-sm bg-[var(--brand)]/15 text-[var(--brand)] border border-[var(--brand)]/30">{tag}</span>' for tag in tags])
     
-    # Extract media (image or video)
-    video_match = re.search(r'<video[^>]*>.*?</video>', card_html, re.DOTALL)
-    if video_match:
-        media = video_match.group(0)
+    # Media (image or video)
+    if fields['video'] is not None:
+        media = fields['video']
         # Update paths to go up one level
         media = re.sub(r'src="images/', 'src="../images/', media)
+        media = size_video(media, root)
         media = '                            ' + media.replace('\n', '\n                            ')
     else:
-        img_match = re.search(r'<img[^>]*alt="([^"]*)"[^>]*src="([^"]*)"[^>]*/?>', card_html)
-        if img_match:
-            alt_text, img_src = img_match.groups()
-            media = f'<img src="../{img_src}" alt="{alt_text}" class="w-full rounded-lg" />'
+        if fields['img'] is not None:
+            alt_text, img_src = fields['img']
+            media = image_html(img_src, alt_text, variants or {}, root)
         else:
             media = ''
     
-    # Extract links
-    links_matches = re.findall(r'<a href="([^"]*)"[^>]*target="_blank"[^>]*>.*?<span[^>]*>(.*?)</span>', card_html, re.DOTALL)
+    # Links
+    links_matches = fields['links']
     links_html = []
     for url, link_text in links_matches:
         # Fix relative URLs
@@ -313,53 +468,320 @@ def extract_card_data(card_html):
         'links': '\n'.join(links_html) if links_html else '                                    <p class="text-[var(--fg-muted)]">No additional resources available.</p>'
     }
 
-# Map of card files to output filenames  
-PROJECT_MAP = {
-    'AI/gnn_noisy_labels.html': 'gnn_noisy_labels.html',
-    'AI/xarm_ddpg_her.html': 'xarm_ddpg_her.html',
-    'computer_vision/maybe_obstacle.html': 'maybe_obstacle.html',
-    'data_science/truck_loading_durations.html': 'truck_loading_durations.html',
-    'embedded/air_pressure_control.html': 'air_pressure_control.html',
-    'embedded/sapienza_iot.html': 'sapienza_iot.html',
-    'embedded/smart_parking.html': 'smart_parking.html',
-    'robotics/IBVS.html': 'ibvs.html',
-    'robotics/ekf_corner_detection.html': 'ekf_corner_detection.html',
-    'robotics/final_implementation_manipulator.html': 'puzzlebot_manipulator.html',
-    'robotics/home_ddpg_ros.html': 'home_ddpg_ros.html',
-    'robotics/scene_grasp.html': 'scene_grasp.html',
-    'robotics/self_driving_autonomous_vehicle.html': 'self_driving_autonomous_vehicle.html',
-    'robotics/xarm6_visual_servoing.html': 'xarm6_visual_servoing.html',
-    'signals/music_recognition.html': 'music_recognition.html',
-}
+# Map of card files to output filenames (the generated pages in project_manifest.json)
+PROJECT_MAP = {project['card']: Path(project['page']).name
+               for project in project_manifest.load_projects() if project['generated']}
+
+MANIFEST_FILE = PROJECTS_DIR / ".build-manifest.json"
+MANIFEST_VERSION = 2
+
+# Filter/search index read by js/include-partials.js
+VARIANTS_FILE = BASE_DIR / responsive_images.VARIANTS_DIR / responsive_images.MANIFEST_NAME
+
+SEARCH_INDEX_FILE = BASE_DIR / "project_index.json"
+SEARCH_INDEX_VERSION = 1
+STOPWORDS = {'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into',
+             'is', 'it', 'its', 'of', 'on', 'or', 'our', 'the', 'to', 'using', 'via', 'with'}
+
+def tokenize(text):
+    """Lower-case alphanumeric tokens, minus stopwords and single characters."""
+    return [t for t in re.findall(r'[a-z0-9]+', text.lower())
+            if len(t) > 1 and t not in STOPWORDS]
+
+def card_org(fields):
+    """The card's institution, or DEFAULT_ORG when it has none."""
+    return (fields['institution'] or '').strip() or DEFAULT_ORG
+
+def card_record(fields):
+    """The searchable metadata of a card, as stored in the build manifest."""
+    body = fields['list'] if fields['list'] and ('<ul' in fields['list'] or '<li' in fields['list']) \
+        else (fields['paragraph'] or '')
+    text = ' '.join(html.unescape(re.sub(r'<[^>]+>', ' ', body)).split())
+    title = ' '.join(html.unescape(re.sub(r'<[^>]+>', '', fields['title'] or '')).split())
+    return {
+        'title': title or "Project",
+        'year': fields['year'],
+        'org': card_org(fields),
+        'tags': [html.unescape(tag.strip()) for tag in fields['tags']],
+        'text': text,
+    }
+
+def build_search_index(records, pages):
+    """Build the compact filter/search index from {card path: record}.
+
+    Projects get ids in card-path order. `tokens` is an inverted index of
+    title/description/tag/org tokens and `facets` holds the org, year and tag
+    postings, so the browser can filter and search without scanning markup.
+    """
+    projects, tokens = [], {}
+    facets = {'org': {}, 'year': {}, 'tag': {}}
+    for pid, card_path in enumerate(sorted(records)):
+        record = records[card_path]
+        projects.append({
+            'card': f"{CARDS_DIR.name}/{card_path}",
+            'page': f"{PROJECTS_DIR.name}/{pages[card_path]}" if card_path in pages else None,
+            'title': record['title'], 'year': record['year'],
+            'org': record['org'], 'tags': record['tags'],
+        })
+        words = tokenize(' '.join([record['title'], record['text'], record['org'],
+                                   *record['tags']]))
+        for token in dict.fromkeys(words):
+            tokens.setdefault(token, []).append(pid)
+        facets['org'].setdefault(record['org'], []).append(pid)
+        if record['year']:
+            facets['year'].setdefault(record['year'], []).append(pid)
+        for tag in dict.fromkeys(record['tags']):
+            facets['tag'].setdefault(tag, []).append(pid)
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'stopwords': sorted(STOPWORDS),
+        'projects': projects,
+        'tokens': dict(sorted(tokens.items())),
+        'facets': {name: dict(sorted(postings.items())) for name, postings in facets.items()},
+    }
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def generator_hash():
+    """Hash of TEMPLATE, this script, the image size probes and the variants manifest,
+    so template, extractor or image edits rebuild everything."""
+    variants = VARIANTS_FILE.read_bytes() if VARIANTS_FILE.exists() else b''
+    return sha256_bytes(TEMPLATE.encode('utf-8') + Path(__file__).read_bytes()
+                        + Path(responsive_images.__file__).read_bytes() + variants)
+
+def load_manifest():
+    """Load the previous build's manifest (empty if missing or from another generator)."""
+    try:
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'version': MANIFEST_VERSION, 'generator': None, 'pages': {}}
+    if manifest.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'generator': None, 'pages': {}}
+    return manifest
+
+def write_atomic(path, data):
+    """Write bytes via a temp file + rename; skip the write if the content is identical.
+
+    Returns True if the file was (re)written.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+class PageWriter:
+    """Binary sink that only replaces `path` if the streamed bytes differ from it.
+
+    While the stream matches the existing file it is only compared against it;
+    at the first difference the matched prefix is copied into a temp file next
+    to `path`, the rest is streamed there, and close() renames it into place.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = 0
+        self.tmp = self.out = None
+        try:
+            self.existing = open(path, 'rb')
+        except FileNotFoundError:
+            self.existing = None
+            self.divert()
+
+    def divert(self):
+        fd, self.tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.',
+                                        suffix='.tmp')
+        self.out = os.fdopen(fd, 'wb')
+        if self.existing is not None:
+            self.existing.seek(0)
+            self.out.write(self.existing.read(self.size))
+            self.existing.close()
+            self.existing = None
+
+    def write(self, data):
+        if self.out is None and self.existing.read(len(data)) != data:
+            self.divert()
+        if self.out is not None:
+            self.out.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def close(self):
+        """Finish the page; returns True if the file was (re)written."""
+        if self.out is None:
+            if not self.existing.read(1):  # same bytes and the same length
+                self.existing.close()
+                return False
+            self.divert()
+        self.out.close()
+        os.replace(self.tmp, self.path)
+        return True
+
+    def discard(self):
+        for f in (self.existing, self.out):
+            if f is not None:
+                f.close()
+        if self.tmp is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.tmp)
+
+def write_page_atomic(path, data):
+    """Stream a page into `path` through a PageWriter, so an identical page is left untouched.
+
+    Returns (whether the file was (re)written, page size).
+    """
+    writer = PageWriter(path)
+    try:
+        size = write_page(writer, data)
+        return writer.close(), size
+    except BaseException:
+        writer.discard()
+        raise
+
+def build_page(card_path, card_file, output_file, previous, variants=None):
+    """Read, extract, render and write one page; runs in a worker.
+
+    Returns a result dict with the status ('created', 'unchanged', 'skipped'
+    or 'error'), the log lines to print, the page's new manifest entry and the
+    trace events recorded while building it. Errors are returned rather than
+    raised so one bad card can't stop a build.
+    """
+    result = {'card': card_path, 'output': output_file.name, 'status': 'skipped',
+              'log': [], 'entry': previous, 'error': None, 'events': []}
+    try:
+        with instrument.span('page', card=card_path) as page:
+            # Read the card HTML
+            with instrument.span('read', card=card_path) as info:
+                card_bytes = card_file.read_bytes()
+                card_html = card_bytes.decode('utf-8')
+                input_hash = sha256_bytes(card_bytes + media_probe(card_html).encode('utf-8'))
+                info['bytes'] = len(card_bytes)
+            
+            # Skip pages whose inputs are unchanged and whose output is intact
+            if (previous and previous['card'] == card_path and previous['input'] == input_hash
+                    and output_file.exists() and output_file.stat().st_size == previous['size']):
+                page['status'] = 'skipped'
+                return result
+            
+            result['log'].append(f"Processing {card_path}...")
+            
+            # Extract data
+            with instrument.span('extract', card=card_path):
+                fields = extract_fields(card_html)
+                data = build_card_data(fields, variants)
+            
+            # Generate the page straight into the output file
+            with instrument.span('render', card=card_path, page=output_file.name) as info:
+                written, size = write_page_atomic(output_file, data)
+                info.update(bytes=size, written=written)
+            if written:
+                result['status'] = page['status'] = 'created'
+                result['log'].append(f"  ✓ Created {output_file.name}")
+            else:
+                result['status'] = page['status'] = 'unchanged'
+                result['log'].append(f"  = {output_file.name} unchanged")
+            
+            result['entry'] = {'card': card_path, 'input': input_hash, 'size': size,
+                               'record': card_record(fields)}
+    except Exception as e:
+        result.update(status='error', error=f"{type(e).__name__}: {e}", entry=None)
+        result['log'].append(f"⚠️  {card_path}: {result['error']}")
+    finally:
+        result['events'] = instrument.drain()
+    return result
 
 def main():
-    """Generate all project pages."""
-    created_count = 0
-    
-    for card_path, output_name in PROJECT_MAP.items():
-        card_file = CARDS_DIR / card_path
-        output_file = PROJECTS_DIR / output_name
-        
-        print(f"Processing {card_path}...")
-        
-        # Read the card HTML
-        with open(card_file, 'r', encoding='utf-8') as f:
-            card_html = f.read()
-        
-        # Extract data
-        data = extract_card_data(card_html)
-        
-        # Generate the page
-        page_html = TEMPLATE.format(**data)
-        
-        # Write the output
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(page_html)
-        
-        created_count += 1
-        print(f"  ✓ Created {output_name}")
-    
-    print(f"\n✅ Successfully created {created_count} project pages!")
+    """Generate project pages whose card, template or generator changed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--force', action='store_true',
+                        help='ignore the build manifest and re-render every page')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes for extraction/rendering (0 = one per core)')
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+
+    with instrument.session(args, 'generate_project_pages'):
+        build(args)
+
+def write_manifest(manifest, results):
+    """Record build_page results in the build manifest and write it; returns True if it changed."""
+    for result in results:
+        if result['entry'] is not None:
+            manifest['pages'][result['output']] = result['entry']
+        else:
+            manifest['pages'].pop(result['output'], None)
+    return write_atomic(MANIFEST_FILE, json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+def write_search_index(manifest, failed=()):
+    """Refresh the search index over every card, including ones without a dedicated page.
+
+    Records come from the manifest's pages; other cards are extracted here,
+    except the `failed` ones. Returns True if the index changed.
+    """
+    with instrument.span('search index') as info:
+        records = {entry['card']: entry['record'] for entry in manifest['pages'].values()}
+        for card_file in sorted(CARDS_DIR.rglob('*.html')):
+            card_path = card_file.relative_to(CARDS_DIR).as_posix()
+            if card_path not in records and card_path not in failed:
+                records[card_path] = card_record(
+                    extract_fields(card_file.read_text(encoding='utf-8')))
+        index = build_search_index(records, PROJECT_MAP)
+        index_bytes = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        info['bytes'] = len(index_bytes)
+    if not write_atomic(SEARCH_INDEX_FILE, index_bytes):
+        return False
+    print(f"  ✓ Updated {SEARCH_INDEX_FILE.name} ({len(index['projects'])} projects, "
+          f"{len(index['tokens'])} tokens)")
+    return True
+
+def build(args):
+    """Render the changed pages, then refresh the manifest and the search index."""
+    with instrument.span('manifest'):
+        manifest = load_manifest()
+        gen_hash = generator_hash()
+    if args.force or manifest['generator'] != gen_hash:
+        manifest['pages'] = {}
+    manifest['generator'] = gen_hash
+
+    variants = responsive_images.load_variants(BASE_DIR)
+    tasks = [(card_path, CARDS_DIR / card_path, PROJECTS_DIR / output_name,
+              manifest['pages'].get(output_name), variants)
+             for card_path, output_name in PROJECT_MAP.items()]
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if jobs > 1 and len(tasks) > 1:
+        # map() yields results in submission order, so logs and the manifest
+        # come out the same regardless of which worker finishes first
+        with ProcessPoolExecutor(min(jobs, len(tasks))) as pool:
+            results = list(pool.map(build_page, *zip(*tasks)))
+    else:
+        results = [build_page(*task) for task in tasks]
+
+    counts = {'created': 0, 'unchanged': 0, 'skipped': 0, 'error': 0}
+    for result in results:
+        for line in result['log']:
+            print(line)
+        instrument.merge(result['events'])
+        counts[result['status']] += 1
+    write_manifest(manifest, results)
+    write_search_index(manifest, failed={result['card'] for result in results if result['error']})
+    unchanged = counts['unchanged'] + counts['skipped']
+    if counts['error']:
+        print(f"\n❌ {counts['error']} project pages failed:")
+        for result in results:
+            if result['error']:
+                print(f"  {result['card']}: {result['error']}")
+        raise SystemExit(1)
+    print(f"\n✅ Successfully created {counts['created']} project pages ({unchanged} unchanged)!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Script to inline project cards into the pages that include them.
+
+index.html and projects.html list their cards as placeholders such as
+    <div data-category="Robotics" data-include="project_cards/robotics/IBVS.html"></div>
+which js/include-partials.js fetches one by one on every page load. This
+script resolves each placeholder at build time, producing the same markup the
+loader would (card HTML inside the div, class "project-card", no data-include):
+    <div data-category="Robotics" class="project-card" data-included="project_cards/robotics/IBVS.html">
+    ...card...<!-- /include --></div>
+
+Inlined blocks keep their source path, so re-running refreshes them after a
+card changes and --revert turns them back into placeholders. Includes that
+can't be resolved are left alone and still load at runtime.
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+PAGES = ['index.html', 'projects.html']
+
+END_MARKER = '<!-- /include -->'
+PLACEHOLDER_RE = re.compile(r'<div(?P<attrs>[^>]*?)\sdata-include="(?P<src>[^"]+)"(?P<rest>[^>]*)></div>')
+INLINED_RE = re.compile(
+    r'<div(?P<attrs>[^>]*?)\sdata-included="(?P<src>[^"]+)"(?P<rest>[^>]*)>.*?'
+    + re.escape(END_MARKER) + r'</div>', re.DOTALL)
+CLASS_RE = re.compile(r'\sclass="([^"]*)"')
+
+def add_card_class(attrs):
+    """Add "project-card" to a tag's attribute string (as the JS loader does)."""
+    match = CLASS_RE.search(attrs)
+    if not match:
+        return f'{attrs} class="project-card"'
+    classes = match.group(1).split()
+    if 'project-card' not in classes:
+        classes.append('project-card')
+    return attrs[:match.start()] + f' class="{" ".join(classes)}"' + attrs[match.end():]
+
+def remove_card_class(attrs):
+    match = CLASS_RE.search(attrs)
+    if not match:
+        return attrs
+    classes = [c for c in match.group(1).split() if c != 'project-card']
+    replacement = f' class="{" ".join(classes)}"' if classes else ''
+    return attrs[:match.start()] + replacement + attrs[match.end():]
+
+def revert_includes(page_html):
+    """Turn inlined blocks back into data-include placeholders."""
+    def placeholder(match):
+        attrs = remove_card_class(match.group('attrs') + match.group('rest'))
+        return f'<div{attrs} data-include="{match.group("src")}"></div>'
+    return INLINED_RE.sub(placeholder, page_html)
+
+def inline_includes(page_html, page_dir, cache=None):
+    """Resolve every data-include placeholder in page_html.
+
+    Paths are resolved relative to page_dir, like the browser's fetch() would.
+    Returns (html, inlined sources, missing sources). `cache` maps resolved
+    paths to card HTML so cards shared by several pages are read once.
+    """
+    cache = {} if cache is None else cache
+    inlined, missing = [], []
+
+    def load(src):
+        card_file = (page_dir / src).resolve()
+        if card_file not in cache:
+            try:
+                cache[card_file] = card_file.read_text(encoding='utf-8')
+            except OSError:
+                cache[card_file] = None
+        return cache[card_file]
+
+    def inline(match):
+        src = match.group('src')
+        card_html = load(src)
+        if card_html is None:
+            missing.append(src)
+            return match.group(0)  # keep the placeholder (or the previously inlined copy)
+        inlined.append(src)
+        attrs = add_card_class(remove_card_class(match.group('attrs') + match.group('rest')))
+        return f'<div{attrs} data-included="{src}">\n{card_html}{END_MARKER}</div>'
+
+    # Refresh previously inlined blocks first, so re-running picks up card edits
+    page_html = INLINED_RE.sub(inline, page_html)
+    return PLACEHOLDER_RE.sub(inline, page_html), inlined, missing
+
+def main():
+    """Inline the cards of every page in PAGES."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('pages', nargs='*', default=PAGES,
+                        help='pages to process, relative to --root (default: %(default)s)')
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='site root')
+    parser.add_argument('-o', '--out', type=Path,
+                        help='write results under this directory instead of in place')
+    parser.add_argument('--revert', action='store_true',
+                        help='turn inlined cards back into data-include placeholders')
+    args = parser.parse_args()
+
+    cache = {}
+    total_missing = 0
+    for page in args.pages:
+        page_file = args.root / page
+        page_html = page_file.read_text(encoding='utf-8')
+        print(f"Processing {page}...")
+
+        if args.revert:
+            new_html = revert_includes(page_html)
+        else:
+            new_html, inlined, missing = inline_includes(page_html, page_file.parent, cache)
+            print(f"  ✓ Inlined {len(inlined)} cards")
+            for src in missing:
+                print(f"  ⚠️  Card not found, left as is: {src}")
+            total_missing += len(missing)
+
+        out_file = (args.out / page) if args.out else page_file
+        out_file.parent.mkdir(parents=True, exist_ok=True)
+        if not out_file.exists() or out_file.read_text(encoding='utf-8') != new_html:
+            out_file.write_text(new_html, encoding='utf-8')
+
+    print(f"\n✅ Processed {len(args.pages)} pages"
+          + (f" ({total_missing} includes unresolved)" if total_missing else ""))
+
+if __name__ == "__main__":
+    main()
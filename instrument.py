@@ -0,0 +1,152 @@
+"""
+Timing spans and profiling shared by the build scripts.
+
+generate_project_pages.py, update_project_cards.py and converter.py wrap each
+stage in a span (card read, extract, render, write; download, every ffmpeg
+encode) with its byte counts as arguments:
+    with instrument.span('render', card=card_path):
+        ...
+Spans are only recorded while tracing is on, which is what --profile does
+(see add_arguments/session). The timeline is written as a Chrome trace, so it
+opens in chrome://tracing or https://ui.perfetto.dev, and a per-stage summary
+is printed at the end of the run:
+    python generate_project_pages.py --force --profile build.trace.json
+    python converter.py --manifest clips.json --profile encode.trace.json --cprofile encode.prof
+--cprofile additionally runs the main process under cProfile
+(python -m pstats encode.prof, or snakeviz).
+
+Worker processes inherit tracing through the environment; their spans are
+handed back with drain() and added to the parent's timeline with merge().
+cProfile only covers the main process.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ENV_VAR = 'SITE_TRACE'
+enabled = os.environ.get(ENV_VAR) == '1'
+_events = []
+_lock = threading.Lock()
+# A forked worker starts with a copy of the parent's events; it must only hand back its own
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_events.clear)
+
+def enable():
+    """Start recording spans, here and in worker processes started from now on."""
+    global enabled
+    enabled = True
+    os.environ[ENV_VAR] = '1'
+
+def now_us():
+    return time.perf_counter_ns() // 1000
+
+def _record(event):
+    event.setdefault('pid', os.getpid())
+    event.setdefault('tid', threading.get_native_id())
+    with _lock:
+        _events.append(event)
+
+@contextlib.contextmanager
+def span(name, **args):
+    """Time the block as one complete ('X') trace event.
+
+    Yields the event's args dict, so byte counts and results known only at the
+    end can be added: `with span('write') as info: info['bytes'] = ...`.
+    """
+    if not enabled:
+        yield {}
+        return
+    started = now_us()
+    try:
+        yield args
+    finally:
+        _record({'name': name, 'ph': 'X', 'ts': started, 'dur': now_us() - started,
+                 'args': args})
+
+def counter(name, **values):
+    """Record a counter sample (e.g. ffmpeg fps/speed), drawn as a graph in the viewer."""
+    if enabled:
+        _record({'name': name, 'ph': 'C', 'ts': now_us(), 'args': values})
+
+def drain():
+    """Remove and return the events recorded so far (for handing back from a worker)."""
+    with _lock:
+        events = _events[:]
+        _events.clear()
+    return events
+
+def merge(events):
+    """Add events recorded in another process to this one's timeline."""
+    with _lock:
+        _events.extend(events)
+
+def summary(events):
+    """{span name: (count, total ms)} over the complete events."""
+    totals = defaultdict(lambda: [0, 0.0])
+    for event in events:
+        if event['ph'] == 'X':
+            totals[event['name']][0] += 1
+            totals[event['name']][1] += event['dur'] / 1000
+    return {name: tuple(total) for name, total in totals.items()}
+
+def print_summary(events, wall_ms):
+    stages = summary(events)
+    if not stages:
+        return
+    print(f"\n{'stage':<24} {'count':>6} {'total ms':>10} {'mean ms':>9} {'of wall':>8}")
+    for name, (count, total) in sorted(stages.items(), key=lambda item: -item[1][1]):
+        print(f"{name:<24} {count:>6} {total:>10.1f} {total / count:>9.2f} "
+              f"{total / wall_ms if wall_ms else 0:>8.1%}")
+
+def write_trace(path, events, process_name):
+    """Write events in the Chrome trace event format (JSON object form)."""
+    pids = sorted({event['pid'] for event in events} | {os.getpid()})
+    meta = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+             'args': {'name': process_name if pid == os.getpid() else f'{process_name} worker'}}
+            for pid in pids]
+    trace = {'traceEvents': meta + sorted(events, key=lambda event: event['ts']),
+             'displayTimeUnit': 'ms'}
+    Path(path).write_text(json.dumps(trace), encoding='utf-8')
+
+def add_arguments(parser):
+    """Add --profile and --cprofile to a script's argument parser."""
+    parser.add_argument('--profile', type=Path, metavar='TRACE.json',
+                        help='record per-stage timings and write them as a Chrome trace')
+    parser.add_argument('--cprofile', type=Path, metavar='STATS.prof',
+                        help='also run under cProfile and write the stats here')
+
+@contextlib.contextmanager
+def session(args, process_name):
+    """Trace (and cProfile) the block as requested by add_arguments' flags.
+
+    Outputs are written even when the block fails or exits early, so a slow or
+    broken run can still be inspected.
+    """
+    if not (args.profile or args.cprofile):
+        yield
+        return
+    enable()
+    profiler = cProfile.Profile() if args.cprofile else None
+    started = now_us()
+    if profiler:
+        profiler.enable()
+    try:
+        with span(process_name):
+            yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
+        events = drain()
+        print_summary(events, (now_us() - started) / 1000)
+        if args.profile:
+            write_trace(args.profile, events, process_name)
+            print(f"✓ Trace written to {args.profile} (open in chrome://tracing or ui.perfetto.dev)")
+        if profiler:
+            print(f"✓ cProfile stats written to {args.cprofile} (python -m pstats {args.cprofile})")
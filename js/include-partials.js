@@ -1,4 +1,27 @@
+// Prebuilt filter/search index written by generate_project_pages.py
+const PROJECT_INDEX_URL = 'project_index.json';
+const PROJECT_INDEX_VERSION = 1;
+// Org of cards without an institution badge, as in generate_project_pages.DEFAULT_ORG
+const DEFAULT_ORG = 'Personal';
+
+async function loadProjectIndex() {
+  try {
+    const res = await fetch(PROJECT_INDEX_URL);
+    if (!res.ok) return null;
+    const index = await res.json();
+    return index.version === PROJECT_INDEX_VERSION ? index : null;
+  } catch (err) {
+    return null;
+  }
+}
+
+// Same tokenization as generate_project_pages.tokenize()
+const tokenize = (text, stopwords = new Set()) =>
+  (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter((t) => t.length > 1 && !stopwords.has(t));
+
 document.addEventListener('DOMContentLoaded', async () => {
+  // Fetch the index alongside any cards that still need loading
+  const indexPromise = document.getElementById('categoryChips') ? loadProjectIndex() : Promise.resolve(null);
   const includeNodes = document.querySelectorAll('[data-include]');
   await Promise.all(Array.from(includeNodes).map(async (node) => {
     const url = node.getAttribute('data-include');
@@ -9,6 +32,7 @@ document.addEventListener('DOMContentLoaded', async () => {
       const html = await res.text();
       node.innerHTML = html;
       node.classList.add('project-card');
+      node.setAttribute('data-included', url);
       node.removeAttribute('data-include');
     } catch (err) {
       console.error(err);
@@ -17,12 +41,48 @@ document.addEventListener('DOMContentLoaded', async () => {
   }));
 
   // After all cards are loaded, collect badges and wire up filters
-  initializeFiltering();
+  initializeFiltering(await indexPromise);
 });
 
-function initializeFiltering() {
+function initializeFiltering(index = null) {
   const cards = Array.from(document.querySelectorAll('.project-card'));
 
+  // Map cards to their id in the prebuilt index (cards missing from it fall back to DOM metadata)
+  const idByCard = new Map();
+  if (index) {
+    const idBySrc = new Map(index.projects.map((p, id) => [p.card, id]));
+    cards.forEach((card) => {
+      const id = idBySrc.get(card.dataset.included);
+      if (id !== undefined) idByCard.set(card, id);
+    });
+  }
+  const postings = (facet, value) => new Set((index && index.facets[facet][value]) || []);
+  const sortedTokens = index ? Object.keys(index.tokens).sort() : [];
+  const stopwords = new Set((index && index.stopwords) || []);
+
+  // Ids matching every query token (the last token also matches as a prefix); null = no query
+  const searchIds = (query) => {
+    const terms = tokenize(query, stopwords);
+    if (!terms.length) return null;
+    let result = null;
+    terms.forEach((term, i) => {
+      const ids = new Set(index.tokens[term] || []);
+      if (i === terms.length - 1) {
+        // Binary search for the first token >= term, then walk the prefix range
+        let lo = 0, hi = sortedTokens.length;
+        while (lo < hi) {
+          const mid = (lo + hi) >> 1;
+          if (sortedTokens[mid] < term) lo = mid + 1; else hi = mid;
+        }
+        for (let k = lo; k < sortedTokens.length && sortedTokens[k].startsWith(term); k++) {
+          index.tokens[sortedTokens[k]].forEach((id) => ids.add(id));
+        }
+      }
+      result = result === null ? ids : new Set([...result].filter((id) => ids.has(id)));
+    });
+    return result;
+  };
+
   // Enhance institution badge size inside each project card (padding, icon, text)
   cards.forEach((card) => {
     const badge = card.querySelector('div[class*="border-[#3d5245]"]');
@@ -56,15 +116,28 @@ function initializeFiltering() {
   // Helper: detect year
   const isYear = (txt) => /^\d{4}$/.test(txt);
 
-  // Extract metadata from each card
+  // Metadata for indexed cards comes straight from the prebuilt index
+  cards.forEach((card) => {
+    if (!idByCard.has(card)) return;
+    const project = index.projects[idByCard.get(card)];
+    card.dataset.org = project.org;
+    allOrgs.add(project.org);
+    if (project.year) {
+      card.dataset.year = project.year;
+      allYears.add(project.year);
+    }
+    card.dataset.keywords = project.tags.join('|');
+    project.tags.forEach((tag) => allKeywords.add(tag));
+  });
+
+  // Extract metadata from the markup of any other card
   cards.forEach((card) => {
+    if (idByCard.has(card)) return;
     // Grab org label inside the org badge (supports text-xs or text-sm)
     const orgSpan = card.querySelector('div[class*="border-[#3d5245]"] span');
-    const org = orgSpan ? orgSpan.textContent.trim() : '';
-    if (org) {
-      card.dataset.org = org;
-      allOrgs.add(org);
-    }
+    const org = (orgSpan ? orgSpan.textContent.trim() : '') || DEFAULT_ORG;
+    card.dataset.org = org;
+    allOrgs.add(org);
 
     // Collect all small spans as candidates
     const spans = Array.from(card.querySelectorAll('span.text-xs, span[class*="text-xs"]'));
@@ -115,7 +188,7 @@ function initializeFiltering() {
   };
 
   // Selected filters
-  let selected = { category: 'All', org: 'All', year: 'All', keyword: 'All' };
+  let selected = { category: 'All', org: 'All', year: 'All', keyword: 'All', query: '' };
 
   // Chip style functions (keep chips sized to content)
   const orgStyle = (active) => `inline-flex self-start items-center gap-2 px-2.5 py-1.5 rounded-md border whitespace-nowrap ${active ? 'bg-[#1c2620] text-white border-[#38e07b] ring-1 ring-[#38e07b] font-semibold' : 'bg-[#1c2620]/60 text-gray-200 border-[#3d5245]'} backdrop-blur`;
@@ -126,13 +199,29 @@ function initializeFiltering() {
 
   const applyFilter = () => {
     const category = selected.category || 'All';
+    // Resolve the facet selections and the query to id sets once per filter change
+    const orgIds = selected.org === 'All' ? null : postings('org', selected.org);
+    const yearIds = selected.year === 'All' ? null : postings('year', selected.year);
+    const tagIds = selected.keyword === 'All' ? null : postings('tag', selected.keyword);
+    const queryIds = index ? searchIds(selected.query) : null;
+    const query = selected.query.trim().toLowerCase();
     cards.forEach((card) => {
       const matchCategory = category === 'All' || card.dataset.category === category;
-      const matchOrg = selected.org === 'All' || (card.dataset.org || '') === selected.org;
-      const matchYear = selected.year === 'All' || (card.dataset.year || '') === selected.year;
-      const cardKeywords = (card.dataset.keywords || '').split('|').filter(Boolean);
-      const matchKeyword = selected.keyword === 'All' || cardKeywords.includes(selected.keyword);
-      const visible = matchCategory && matchOrg && matchYear && matchKeyword;
+      let matchOrg, matchYear, matchKeyword, matchQuery;
+      if (idByCard.has(card)) {
+        const id = idByCard.get(card);
+        matchOrg = !orgIds || orgIds.has(id);
+        matchYear = !yearIds || yearIds.has(id);
+        matchKeyword = !tagIds || tagIds.has(id);
+        matchQuery = !queryIds || queryIds.has(id);
+      } else {
+        matchOrg = selected.org === 'All' || (card.dataset.org || '') === selected.org;
+        matchYear = selected.year === 'All' || (card.dataset.year || '') === selected.year;
+        const cardKeywords = (card.dataset.keywords || '').split('|').filter(Boolean);
+        matchKeyword = selected.keyword === 'All' || cardKeywords.includes(selected.keyword);
+        matchQuery = !query || card.textContent.toLowerCase().includes(query);
+      }
+      const visible = matchCategory && matchOrg && matchYear && matchKeyword && matchQuery;
       card.style.display = visible ? '' : 'none';
 
       // Highlight in-card org badge when selected
@@ -295,11 +384,21 @@ function initializeFiltering() {
     });
   });
 
+  // Text search
+  const searchInput = document.getElementById('projectSearch');
+  if (searchInput) {
+    searchInput.addEventListener('input', () => {
+      selected.query = searchInput.value;
+      applyFilter();
+    });
+  }
+
   // Wire reset
   const resetBtn = document.getElementById('resetFilters');
   if (resetBtn) {
     resetBtn.addEventListener('click', () => {
-      selected = { category: 'All', org: 'All', year: 'All', keyword: 'All' };
+      selected = { category: 'All', org: 'All', year: 'All', keyword: 'All', query: '' };
+      if (searchInput) searchInput.value = '';
       applyFilter();
     });
   }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Script to minify the HTML of a build output and precompress its text assets.
+
+Generated pages carry a lot of indentation (TEMPLATE and the fragments
+generate_project_pages.py indents into it). Minification collapses every run
+of whitespace to a single space, tidies whitespace inside tags and drops
+comments, leaving <pre>, <textarea>, <script> and <style> blocks (and quoted
+attribute values) byte-for-byte intact. Conditional comments and the
+<!-- /include --> markers inline_partials.py relies on are kept.
+
+Afterwards every HTML/JS/CSS/JSON/SVG file gets .gz and, if the brotli module
+is installed, .br siblings (served by server.py when the browser accepts
+them); siblings that wouldn't be smaller are not written.
+
+Run it on the build output, not on the sources:
+    python minify_html.py dist
+    python minify_html.py dist --no-compress
+"""
+
+import argparse
+import gzip
+import re
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_EXTS = {'.html', '.js', '.css', '.json', '.svg', '.xml', '.txt'}
+MIN_COMPRESS_SIZE = 512
+
+TOKEN_RE = re.compile(r'''
+    (?P<raw><(?P<rawtag>pre|textarea|script|style)\b(?:[^>"']|"[^"]*"|'[^']*')*>.*?</(?P=rawtag)\s*>)
+  | (?P<comment><!--.*?-->)
+  | (?P<tag><(?:[^>"']|"[^"]*"|'[^']*')*>)
+''', re.DOTALL | re.IGNORECASE | re.VERBOSE)
+KEEP_COMMENT_RE = re.compile(r'<!--\s*(?:\[if|<!|/include)')
+QUOTED_RE = re.compile(r'''("[^"]*"|'[^']*')''')
+SPACE_RE = re.compile(r'\s+')
+
+def minify_tag(tag):
+    """Collapse whitespace between a tag's attributes, leaving quoted values alone."""
+    parts = QUOTED_RE.split(tag)
+    for i in range(0, len(parts), 2):  # even indexes are outside quotes
+        parts[i] = SPACE_RE.sub(' ', parts[i])
+    tag = ''.join(parts)
+    return re.sub(r'\s+(/?>)$', r'\1', tag)
+
+def minify_html(page):
+    out, pos = [], 0
+    for match in TOKEN_RE.finditer(page):
+        out.append(SPACE_RE.sub(' ', page[pos:match.start()]))
+        if match.group('raw'):
+            out.append(match.group('raw'))
+        elif match.group('comment'):
+            if KEEP_COMMENT_RE.match(match.group('comment')):
+                out.append(match.group('comment'))
+        else:
+            out.append(minify_tag(match.group('tag')))
+        pos = match.end()
+    out.append(SPACE_RE.sub(' ', page[pos:]))
+    return ''.join(out).strip() + '\n'
+
+def write_sibling(path, suffix, data):
+    """Write a compressed sibling if it is smaller than the original; returns its size or None."""
+    sibling = path.with_name(path.name + suffix)
+    if len(data) >= path.stat().st_size:
+        sibling.unlink(missing_ok=True)
+        return None
+    sibling.write_bytes(data)
+    return len(data)
+
+def compress(path):
+    """Write .gz (and .br) siblings of a file; returns (gz size, br size)."""
+    raw = path.read_bytes()
+    if len(raw) < MIN_COMPRESS_SIZE:
+        return None, None
+    gz = write_sibling(path, '.gz', gzip.compress(raw, compresslevel=9, mtime=0))
+    br = write_sibling(path, '.br', brotli.compress(raw, quality=11)) if brotli else None
+    return gz, br
+
+def format_size(size):
+    return '-' if size is None else f"{size:,}"
+
+def main():
+    """Minify every HTML file in a build output, then precompress text assets."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('site', type=Path, help='build output to rewrite in place (e.g. dist)')
+    parser.add_argument('--no-compress', action='store_true', help="don't write .gz/.br siblings")
+    args = parser.parse_args()
+    site = args.site.resolve()
+
+    files = sorted(path for path in site.rglob('*')
+                   if path.is_file() and path.suffix.lower() in COMPRESS_EXTS)
+    if not args.no_compress and brotli is None:
+        print("⚠️  brotli module not installed, writing .gz siblings only (pip install brotli)")
+
+    print(f"{'file':<60} {'before':>10} {'after':>10} {'gzip':>10} {'brotli':>10}")
+    totals = [0, 0, 0, 0]
+    for path in files:
+        before = path.stat().st_size
+        if path.suffix.lower() == '.html':
+            page = path.read_text(encoding='utf-8')
+            minified = minify_html(page)
+            if minified != page:
+                path.write_text(minified, encoding='utf-8')
+        after = path.stat().st_size
+        gz, br = (None, None) if args.no_compress else compress(path)
+        print(f"{path.relative_to(site).as_posix():<60} {before:>10,} {after:>10,} "
+              f"{format_size(gz):>10} {format_size(br):>10}")
+        for i, size in enumerate((before, after, gz or after, br or gz or after)):
+            totals[i] += size
+
+    print(f"{'total':<60} {totals[0]:>10,} {totals[1]:>10,} {totals[2]:>10,} {totals[3]:>10,}")
+    saved = totals[0] - totals[1]
+    pages = sum(path.suffix.lower() == '.html' for path in files)
+    print(f"\n✅ Minified {pages} pages, {saved:,} bytes saved "
+          f"({saved / totals[0] * 100 if totals[0] else 0:.1f}%) before compression")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+The project manifest shared by the build scripts.
+
+project_manifest.json lists every linked card under project_cards/, its
+dedicated page and whether generate_project_pages.py generates that page:
+    {"version": 1, "projects": [{"card": "AI/gnn_noisy_labels.html",
+                                 "page": "projects/gnn_noisy_labels.html", "generated": true}]}
+update_project_cards.py links the cards to their pages, generate_project_pages.py
+renders the generated ones and build_site.py does both in one pass. They all
+read it through load_projects(), so linking a card doesn't pull in the page
+generator.
+"""
+
+import json
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+PROJECT_MANIFEST_FILE = BASE_DIR / "project_manifest.json"
+
+def load_projects(path=PROJECT_MANIFEST_FILE):
+    """The project manifest's entries: {'card', 'page', 'generated'} per linked card."""
+    manifest = json.loads(Path(path).read_text(encoding='utf-8'))
+    return manifest['projects']
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Script to build responsive variants of the project images.
+
+Every image under images/projects/ is resized to several widths and written as WebP (and AVIF, when Pillow was built with it) to
+images/variants/, mirroring the source path:
+    images/projects/ibvs/sketch.webp -> images/variants/projects/ibvs/sketch-1a2b3c4d-640.webp
+Variant names carry a hash of the source, so unchanged images are never
+re-encoded, and variants of deleted or edited images are pruned. Everything is
+recorded in images/variants/manifest.json:
+    {"images/projects/ibvs/sketch.webp": {"hash": "...", "width": 1600, "height": 900,
+        "variants": {"webp": [[320, "images/variants/..."], ...], "avif": [...]}}}
+which generate_project_pages.py reads to emit srcset/sizes, width/height and
+loading="lazy".
+
+Only the encoding needs Pillow (pip install pillow). The size probes below
+(image_size, video_info) are plain Python and are also used by the generator.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+SOURCE_WIDTHS = {
+    'images/projects': [320, 640, 960, 1280, 1920],
+}
+SOURCE_EXTS = {'.webp', '.png', '.jpg', '.jpeg'}
+VARIANTS_DIR = 'images/variants'
+MANIFEST_NAME = 'manifest.json'
+FORMATS = {'webp': {'quality': 80, 'method': 6}, 'avif': {'quality': 55}}
+
+def source_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:8]
+
+def image_size(path):
+    """(width, height) of a PNG, GIF, JPEG or WebP file from its header, or None."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(64)
+            if head.startswith(b'\x89PNG\r\n\x1a\n'):
+                return struct.unpack('>II', head[16:24])
+            if head[:6] in (b'GIF87a', b'GIF89a'):
+                return struct.unpack('<HH', head[6:10])
+            if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+                chunk = head[12:16]
+                if chunk == b'VP8 ':
+                    w, h = struct.unpack('<HH', head[26:30])
+                    return w & 0x3fff, h & 0x3fff
+                if chunk == b'VP8L':
+                    bits = int.from_bytes(head[21:25], 'little')
+                    return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+                if chunk == b'VP8X':
+                    return (int.from_bytes(head[24:27], 'little') + 1,
+                            int.from_bytes(head[27:30], 'little') + 1)
+                return None
+            if head[:2] == b'\xff\xd8':
+                f.seek(2)
+                while True:
+                    marker = f.read(2)
+                    if len(marker) < 2 or marker[0] != 0xff:
+                        return None
+                    if marker[1] in (0xd8, 0x01) or 0xd0 <= marker[1] <= 0xd7:
+                        continue  # markers without a length
+                    length = struct.unpack('>H', f.read(2))[0]
+                    if 0xc0 <= marker[1] <= 0xcf and marker[1] not in (0xc4, 0xc8, 0xcc):
+                        h, w = struct.unpack('>xHH', f.read(5))
+                        return w, h
+                    f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        pass
+    return None
+
+def _boxes(f, end):
+    """Yield (type, payload offset, payload size) for the MP4 boxes in f up to `end`."""
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        size, kind = struct.unpack('>I4s', f.read(8))
+        header = 8
+        if size == 1:
+            size, header = struct.unpack('>Q', f.read(8))[0], 16
+        elif size == 0:
+            size = end - start
+        if size < header:
+            return
+        yield kind, start + header, size - header
+        f.seek(start + size)
+
+def mp4_size(path):
+    """Display (width, height) of the first video track of an MP4, from its tkhd box."""
+    try:
+        with open(path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            f.seek(0)
+            for kind, offset, size in _boxes(f, end):
+                if kind != b'moov':
+                    continue
+                for trak, trak_offset, trak_size in list(_boxes(f, offset + size)):
+                    if trak != b'trak':
+                        continue
+                    f.seek(trak_offset)
+                    for tkhd, tkhd_offset, _ in _boxes(f, trak_offset + trak_size):
+                        if tkhd != b'tkhd':
+                            continue
+                        f.seek(tkhd_offset)
+                        version = f.read(1)[0]
+                        # width/height (16.16 fixed point) follow the times, ids and matrix
+                        f.seek(tkhd_offset + (88 if version == 1 else 76))
+                        w, h = struct.unpack('>II', f.read(8))
+                        if w and h:
+                            return w >> 16, h >> 16
+                return None
+    except (OSError, struct.error, IndexError):
+        pass
+    return None
+
+def sidecar_path(path):
+    """The converter.py --widths sidecar of a video: <base>.json for <base>-<width>.mp4."""
+    path = Path(path)
+    return path.with_name(re.sub(r'-\d+$', '', path.stem) + '.json')
+
+def video_info(path):
+    """{'width', 'height', 'poster'} for a video file, or None.
+
+    Prefers the sidecar converter.py --widths writes next to a rendition
+    (<base>.json for <base>-<width>.mp4), which also names a poster frame;
+    otherwise reads the dimensions from the MP4 header.
+    """
+    path = Path(path)
+    sidecar = sidecar_path(path)
+    try:
+        meta = json.loads(sidecar.read_text(encoding='utf-8'))
+        largest = max(meta['renditions'], key=lambda r: r['width'])
+        poster = meta.get('poster')
+        return {'width': largest['width'], 'height': largest['height'],
+                'poster': (sidecar.parent / poster['src']) if poster else None}
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    size = mp4_size(path) if path.suffix.lower() == '.mp4' else None
+    return {'width': size[0], 'height': size[1], 'poster': None} if size else None
+
+def load_variants(base_dir=BASE_DIR):
+    """The variants manifest, or {} if the pipeline hasn't been run."""
+    try:
+        return json.loads((base_dir / VARIANTS_DIR / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def variant_path(rel_path, digest, width, fmt):
+    rel = Path(rel_path).relative_to('images')
+    return (Path(VARIANTS_DIR) / rel.parent / f"{rel.stem}-{digest}-{width}.{fmt}").as_posix()
+
+def plan_widths(source_width, widths):
+    """Target widths smaller than the source, plus the source width unless it exceeds them all."""
+    planned = [w for w in widths if w < source_width]
+    if source_width <= max(widths) or not planned:
+        planned.append(source_width)
+    return planned
+
+def encode_image(base_dir, rel_path, digest, widths, formats):
+    """Write every missing variant of one image; runs in a worker."""
+    from PIL import Image  # only the encoder needs Pillow
+
+    written = 0
+    with Image.open(base_dir / rel_path) as image:
+        image.load()
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = None
+            for fmt in formats:
+                target = base_dir / variant_path(rel_path, digest, width, fmt)
+                if target.exists():
+                    continue
+                if resized is None:
+                    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(f".{target.name}.tmp")
+                resized.save(tmp, format=fmt.upper(), **FORMATS[fmt])
+                os.replace(tmp, target)
+                written += 1
+    return rel_path, written
+
+def available_formats(requested):
+    try:
+        from PIL import features
+    except ImportError:
+        raise SystemExit("❌ Pillow is required to encode variants (pip install pillow)")
+    formats = [fmt for fmt in requested if features.check(fmt)]
+    for fmt in set(requested) - set(formats):
+        print(f"⚠️  Pillow has no {fmt.upper()} support, skipping {fmt} variants")
+    return formats
+
+def main():
+    """Build missing variants and rewrite the manifest."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--root', type=Path, default=BASE_DIR, help='site root')
+    parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=list(FORMATS))
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='worker processes (0 = one per core)')
+    args = parser.parse_args()
+    root = args.root.resolve()
+    formats = available_formats(args.formats)
+
+    manifest, tasks = {}, []
+    for source_dir, widths in SOURCE_WIDTHS.items():
+        for path in sorted((root / source_dir).rglob('*')):
+            if not path.is_file() or path.suffix.lower() not in SOURCE_EXTS:
+                continue
+            rel_path = path.relative_to(root).as_posix()
+            size = image_size(path)
+            if size is None:
+                print(f"⚠️  Can't read the size of {rel_path}, skipping")
+                continue
+            digest = source_hash(path)
+            planned = plan_widths(size[0], widths)
+            manifest[rel_path] = {
+                'hash': digest, 'width': size[0], 'height': size[1],
+                'variants': {fmt: [[w, variant_path(rel_path, digest, w, fmt)] for w in planned]
+                             for fmt in formats},
+            }
+            if any(not (root / variant).exists()
+                   for fmt in formats for _, variant in manifest[rel_path]['variants'][fmt]):
+                tasks.append((root, rel_path, digest, planned, formats))
+
+    print(f"Encoding {len(tasks)} of {len(manifest)} images ({', '.join(formats)})...")
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    with ProcessPoolExecutor(max(1, min(jobs, len(tasks) or 1))) as pool:
+        for rel_path, written in pool.map(encode_image, *zip(*tasks)) if tasks else []:
+            print(f"  ✓ {rel_path} ({written} variants)")
+
+    # Drop variants of images that changed or were removed
+    keep = {variant for entry in manifest.values()
+            for variants in entry['variants'].values() for _, variant in variants}
+    keep.add(f"{VARIANTS_DIR}/{MANIFEST_NAME}")
+    removed = 0
+    for path in (root / VARIANTS_DIR).rglob('*'):
+        if path.is_file() and path.relative_to(root).as_posix() not in keep:
+            path.unlink()
+            removed += 1
+
+    manifest_file = root / VARIANTS_DIR / MANIFEST_NAME
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    manifest_file.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    print(f"\n✅ {len(manifest)} images up to date ({removed} stale variants removed)")
+
+if __name__ == "__main__":
+    main()
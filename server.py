@@ -2,35 +2,677 @@
 """
 Simple HTTP server for local development of the portfolio.
 Compatible with GitHub Pages deployment.
+
+Responses behave like a CDN's: strong ETags with If-None-Match /
+If-Modified-Since revalidation (304), single and multi-range requests (206)
+so <video> seeking doesn't re-download whole files, and precompressed .br/.gz
+siblings served when the browser accepts them.
+
+Requests are served concurrently on keep-alive (HTTP/1.1) connections: file
+bodies go out with sendfile(), and small hot files (pages, cards, scripts) come
+from a bounded in-memory LRU that is invalidated when their mtime changes.
+
+    python server.py                 # serve on :8000 and open the browser
+    python server.py --legacy        # the old one-request-at-a-time server
+    python server.py --bench         # load-test both engines and compare
+    python server.py --watch         # live reload + incremental regeneration
+
+With --watch, edits are picked up by inotify (or by polling where inotify isn't
+available): a changed card gets its link wrapper (update_project_cards.py) and
+its project page (generate_project_pages.py) rebuilt on its own, and open tabs
+reload through a Server-Sent Events stream injected into every HTML page.
 """
 
+import argparse
+import ctypes
+import ctypes.util
+import email.utils
+import functools
+import http.client
 import http.server
+import importlib
+import io
 import socketserver
 import os
+import re
+import select
+import struct
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
 import webbrowser
+from collections import OrderedDict
+from http import HTTPStatus
 from pathlib import Path
 
 PORT = 8000
+BASE_DIR = Path(__file__).resolve().parent
+MAX_RANGES = 16
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_FILE = 256 * 1024
+KEEP_ALIVE_TIMEOUT = 15
+BENCH_PATHS = ['index.html', 'projects.html', 'js/include-partials.js',
+               'project_cards/robotics/IBVS.html', 'images/fototec.webp',
+               'images/projects/ibvs/out.webm']
+RELOAD_PATH = '/__live-reload'
+RELOAD_SNIPPET = (f'<script>new EventSource("{RELOAD_PATH}")'
+                  '.onmessage = () => location.reload();</script>\n').encode('utf-8')
+WATCH_INTERVAL = 0.5
+WATCH_IGNORE = {'.git', 'dist', 'node_modules', '__pycache__'}
+# Precompressed siblings, in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+RANGE_RE = re.compile(r'\s*(\d*)\s*-\s*(\d*)\s*')
+
+def parse_ranges(header, size):
+    """Parse a Range header into [(first, last)] byte ranges.
+
+    Returns None when the header should be ignored (not bytes, malformed or
+    too many ranges) and [] when no range is satisfiable.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec:
+        return None
+    specs = spec.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+    ranges = []
+    for part in specs:
+        m = RANGE_RE.fullmatch(part)
+        if not m or not (m.group(1) or m.group(2)):
+            return None
+        if m.group(1):
+            first = int(m.group(1))
+            last = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+            if m.group(2) and int(m.group(2)) < first:
+                return None
+        else:
+            first, last = max(0, size - int(m.group(2))), size - 1
+            if int(m.group(2)) == 0:
+                continue
+        if first < size:
+            ranges.append((first, last))
+    return ranges
+
+def etag_matches(header, etag):
+    """True if an If-None-Match header matches etag (weak comparison)."""
+    if header.strip() == '*':
+        return True
+    tags = [t.strip() for t in header.split(',')]
+    return etag in tags or f'W/{etag}' in tags
+
+class FileCache:
+    """Bounded LRU of small file contents, keyed by path and validated by mtime."""
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES, max_file=CACHE_MAX_FILE):
+        self.max_bytes = max_bytes
+        self.max_file = max_file
+        self.size = 0
+        self._entries = OrderedDict()  # path -> (mtime_ns, size, data)
+        self._lock = threading.Lock()
+
+    def read(self, path, st):
+        """Return the contents of `path` (stat result `st`), or None if too big to cache."""
+        if st.st_size > self.max_file:
+            return None
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[:2] == (st.st_mtime_ns, st.st_size):
+                self._entries.move_to_end(path)
+                return entry[2]
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) != st.st_size:
+            return data  # changed while reading; serve it but don't cache
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old:
+                self.size -= len(old[2])
+            self._entries[path] = (st.st_mtime_ns, st.st_size, data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+        return data
+
+FILE_CACHE = FileCache()
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive; every response sets Content-Length
+    timeout = KEEP_ALIVE_TIMEOUT   # close idle keep-alive connections
+    disable_nagle_algorithm = True # headers and body go out as separate writes
+    reload_hub = None              # set by --watch
+
+    def end_headers(self):
+        # Always revalidate, but let the browser keep a copy it can confirm with a 304
+        self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+    def do_GET(self):
+        if self.reload_hub and self.path == RELOAD_PATH:
+            self.send_events()
+        else:
+            super().do_GET()
+
+    def send_events(self):
+        """Stream a Server-Sent Event to this tab every time the site is rebuilt."""
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        seen = self.reload_hub.version
+        try:
+            self.wfile.write(b'retry: 500\n\n')
+            while True:
+                version = self.reload_hub.wait(seen, timeout=KEEP_ALIVE_TIMEOUT / 2)
+                self.wfile.write(b'data: reload\n\n' if version != seen else b': ping\n\n')
+                seen = version
+        except OSError:
+            pass  # tab closed or reloaded
+
+    def send_head(self):
+        self._parts = None
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            index = next((os.path.join(path, name) for name in ('index.html', 'index.htm')
+                          if os.path.isfile(os.path.join(path, name))), None)
+            if index is None or not self.path.split('?', 1)[0].endswith('/'):
+                return super().send_head()  # redirects and directory listings
+            path = index
+        if path.endswith('/') or not os.path.isfile(path):
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        ctype = self.guess_type(path)
+        served, encoding = path, None
+        if 'Range' not in self.headers:
+            served, encoding = self.pick_encoding(path)
+        try:
+            st = os.stat(served)
+            data = FILE_CACHE.read(served, st)
+            if self.reload_hub and ctype == 'text/html' and encoding is None:
+                data = inject_reload_script(data if data is not None else Path(served).read_bytes())
+            f = io.BytesIO(data) if data is not None else open(served, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            size = st.st_size if data is None else len(data)
+            etag = f'"{st.st_mtime_ns:x}-{size:x}' + (f'-{encoding}"' if encoding else '"')
+            last_modified = self.date_time_string(int(st.st_mtime))
+
+            if self.not_modified(etag, st.st_mtime):
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_validators(etag, last_modified, encoding)
+                self.end_headers()
+                f.close()
+                return None
+
+            ranges = None
+            if 'Range' in self.headers and self.if_range_ok(etag, st.st_mtime):
+                ranges = parse_ranges(self.headers['Range'], size)
+            if ranges == []:
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{size}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                f.close()
+                return None
+
+            if not ranges:
+                self.send_response(HTTPStatus.OK)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Length', str(size))
+            elif len(ranges) == 1:
+                first, last = ranges[0]
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header('Content-Type', ctype)
+                self.send_header('Content-Range', f'bytes {first}-{last}/{size}')
+                self.send_header('Content-Length', str(last - first + 1))
+                self._parts = [(b'', first, last)]
+            else:
+                boundary = uuid.uuid4().hex
+                self._parts = [
+                    ((f'\r\n--{boundary}\r\nContent-Type: {ctype}\r\n'
+                      f'Content-Range: bytes {first}-{last}/{size}\r\n\r\n').encode('latin-1'),
+                     first, last)
+                    for first, last in ranges]
+                self._parts.append((f'\r\n--{boundary}--\r\n'.encode('latin-1'), 0, -1))
+                length = sum(len(head) + last - first + 1 for head, first, last in self._parts)
+                self.send_response(HTTPStatus.PARTIAL_CONTENT)
+                self.send_header('Content-Type', f'multipart/byteranges; boundary={boundary}')
+                self.send_header('Content-Length', str(length))
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_validators(etag, last_modified, encoding)
+            self.end_headers()
+            return f
+        except:
+            f.close()
+            raise
+
+    def pick_encoding(self, path):
+        """Return (file to serve, Content-Encoding) honouring Accept-Encoding."""
+        accepted = {token.split(';')[0].strip().lower()
+                    for token in self.headers.get('Accept-Encoding', '').split(',')
+                    if not token.replace(' ', '').endswith(';q=0')}
+        for encoding, suffix in ENCODINGS:
+            sibling = path + suffix
+            if (encoding in accepted and os.path.isfile(sibling)
+                    and os.path.getmtime(sibling) >= os.path.getmtime(path)):
+                return sibling, encoding
+        return path, None
+
+    def send_validators(self, etag, last_modified, encoding):
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.send_header('Vary', 'Accept-Encoding')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+
+    def not_modified(self, etag, mtime):
+        if 'If-None-Match' in self.headers:
+            return etag_matches(self.headers['If-None-Match'], etag)
+        if 'If-Modified-Since' in self.headers:
+            try:
+                since = email.utils.parsedate_to_datetime(self.headers['If-Modified-Since'])
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            return since is not None and int(mtime) <= since.timestamp()
+        return False
+
+    def if_range_ok(self, etag, mtime):
+        """A Range is only honoured if If-Range (when sent) still matches."""
+        if_range = self.headers.get('If-Range')
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            return if_range == etag  # If-Range requires a strong match
+        try:
+            return int(mtime) <= email.utils.parsedate_to_datetime(if_range).timestamp()
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+
+    def copyfile(self, source, outputfile):
+        for head, first, last in self._parts or [(b'', 0, None)]:
+            if head:
+                outputfile.write(head)
+            count = None if last is None else last - first + 1
+            if count == 0:
+                continue
+            if isinstance(source, io.BytesIO):
+                outputfile.write(source.getbuffer()[first:None if count is None else first + count])
+            else:
+                # Zero-copy from the page cache to the socket (falls back to send() where unsupported)
+                self.connection.sendfile(source, first, count)
+
+def inject_reload_script(page):
+    """Add the live-reload client just before </body>."""
+    at = page.rfind(b'</body>')
+    return page + RELOAD_SNIPPET if at < 0 else page[:at] + RELOAD_SNIPPET + page[at:]
+
+class ReloadHub:
+    """Version counter that SSE streams wait on; publish() bumps it."""
+
+    def __init__(self):
+        self.version = 0
+        self._cond = threading.Condition()
+
+    def publish(self):
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait(self, seen, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != seen, timeout)
+            return self.version
+
+def watched(root, path):
+    """Whether a change to `path` matters (skips VCS, build output, dotfiles and temp files)."""
+    rel = path.relative_to(root).parts
+    return not any(part in WATCH_IGNORE or part.startswith('.') for part in rel)
+
+class PollingWatcher:
+    """Detects changes by re-scanning mtimes every WATCH_INTERVAL seconds."""
+
+    def __init__(self, root):
+        self.root = root
+        self.snapshot = self.scan()
+
+    def scan(self):
+        mtimes = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_IGNORE and not d.startswith('.')]
+            for name in filenames:
+                if not name.startswith('.'):
+                    path = Path(dirpath) / name
+                    try:
+                        mtimes[path] = path.stat().st_mtime_ns
+                    except OSError:
+                        pass
+        return mtimes
+
+    def changes(self):
+        """Block until something changes; returns the changed paths."""
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = self.scan()
+            changed = {path for path in current.keys() | self.snapshot.keys()
+                       if current.get(path) != self.snapshot.get(path)}
+            self.snapshot = current
+            if changed:
+                return changed
+
+class InotifyWatcher:
+    """Linux inotify watches on every directory under root (via libc)."""
+    IN_MODIFY, IN_CLOSE_WRITE, IN_MOVED_FROM, IN_MOVED_TO = 0x2, 0x8, 0x40, 0x80
+    IN_CREATE, IN_DELETE, IN_ISDIR = 0x100, 0x200, 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct('iIII')
+    SETTLE = 0.05  # editors write in bursts; wait for the burst to end
+
+    def __init__(self, root):
+        self.root = root
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs = {}
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_IGNORE and not d.startswith('.')]
+            self.add(Path(dirpath))
+
+    def add(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd >= 0:
+            self.dirs[wd] = directory
+
+    def read(self):
+        changed = set()
+        buf = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = self.EVENT.unpack_from(buf, offset)
+            name = buf[offset + self.EVENT.size:offset + self.EVENT.size + length].rstrip(b'\0')
+            offset += self.EVENT.size + length
+            if wd not in self.dirs or not name:
+                continue
+            path = self.dirs[wd] / os.fsdecode(name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and watched(self.root, path):
+                    self.add(path)
+            elif watched(self.root, path):
+                changed.add(path)
+        return changed
+
+    def changes(self):
+        """Block until something changes; returns the changed paths."""
+        while True:
+            select.select([self.fd], [], [])
+            changed = self.read()
+            while select.select([self.fd], [], [], self.SETTLE)[0]:
+                changed |= self.read()
+            if changed:
+                return changed
+
+def make_watcher(root, poll=False):
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass  # no inotify in this libc or out of watches
+    return PollingWatcher(root)
+
+class Rebuilder:
+    """Maps changed sources to the outputs that depend on them and rebuilds only those.
+
+    project_cards/<card>      -> link wrapper on the card + projects/<page>.html,
+                                 its build manifest entry and project_index.json
+    generate_project_pages.py -> every project page (the template lives there);
+    responsive_images.py and images/variants/manifest.json likewise (srcsets)
+    project_manifest.json/.py -> every card's link and page
+    pages, scripts, css/site.src.css -> css/site.css, if the classes in use changed
+    anything else             -> nothing to build, just reload
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.projects = importlib.import_module('project_manifest')
+        self.generator = importlib.import_module('generate_project_pages')
+        self.linker = importlib.import_module('update_project_cards')
+        self.images = importlib.import_module('responsive_images')
+        self.styles = importlib.import_module('build_css')
+
+    def rebuild(self, changed):
+        """Rebuild what `changed` affects; returns the files written."""
+        written = []
+        cards = set()
+        for path in changed:
+            if path.name == 'build_css.py':
+                self.styles = importlib.reload(self.styles)
+            if path.name in ('generate_project_pages.py', 'responsive_images.py') or (
+                    path.name == self.images.MANIFEST_NAME
+                    and path.parent == self.root / self.images.VARIANTS_DIR):
+                self.images = importlib.reload(self.images)
+                self.generator = importlib.reload(self.generator)
+                cards.update(self.generator.PROJECT_MAP)
+            elif path.name == 'update_project_cards.py':
+                self.linker = importlib.reload(self.linker)
+            elif (path.name in ('project_manifest.json', 'project_manifest.py')
+                  and path.parent == self.root):
+                self.projects = importlib.reload(self.projects)
+                self.generator = importlib.reload(self.generator)
+                self.linker = importlib.reload(self.linker)
+                cards.update(self.linker.PROJECT_LINKS)
+            elif path.suffix == '.html' and path.is_relative_to(self.root / 'project_cards'):
+                cards.add(path.relative_to(self.root / 'project_cards').as_posix())
+        variants = self.images.load_variants(self.root) if cards else {}
+        results = []
+        for card_path in sorted(cards):
+            card_file = self.root / 'project_cards' / card_path
+            if not card_file.exists():
+                continue
+            link = self.linker.PROJECT_LINKS.get(card_path)
+            card_html = card_file.read_text(encoding='utf-8')
+            if link and not self.linker.is_linked(card_html):
+                card_file.write_text(self.linker.wrap_with_link(card_html, link), encoding='utf-8')
+                written.append(card_file)
+                print(f"  ✓ Added link to {link}")
+            output_name = self.generator.PROJECT_MAP.get(card_path)
+            if output_name:
+                output_file = self.root / 'projects' / output_name
+                result = self.generator.build_page(card_path, card_file, output_file, None,
+                                                   variants=variants)
+                results.append(result)
+                for line in result['log'][1:]:
+                    print(line)
+                if result['status'] == 'created':
+                    written.append(output_file)
+        if cards:
+            # Titles, tags and orgs feed the filter/search index, so keep it current too
+            manifest = self.generator.load_manifest()
+            if results and self.generator.write_manifest(manifest, results):
+                written.append(self.generator.MANIFEST_FILE)
+            failed = {result['card'] for result in results if result['error']}
+            if self.generator.write_search_index(manifest, failed=failed):
+                written.append(self.generator.SEARCH_INDEX_FILE)
+        if any(path.suffix in ('.html', '.js', '.py') or path.name.endswith('.src.css')
+               for path in changed):
+            stylesheet = self.styles.write_stylesheet(self.root)
+            if stylesheet:
+                written.append(stylesheet)
+                print(f"  ✓ Recompiled {self.styles.OUTPUT_CSS}")
+        return written
+
+def watch(root, hub, poll=False):
+    """Watch loop: rebuild what changed, then tell every open tab to reload."""
+    watcher = make_watcher(root, poll)
+    rebuilder = Rebuilder(root)
+    print(f"Watching {root} ({type(watcher).__name__})")
+    own_writes = set()
+    while True:
+        changed = watcher.changes() - own_writes
+        own_writes.clear()
+        if not changed:
+            continue
+        started = time.perf_counter()
+        for path in sorted(changed):
+            print(f"🔄 {path.relative_to(root).as_posix()}")
+        try:
+            own_writes.update(rebuilder.rebuild(changed))
+        except Exception as e:
+            print(f"❌ Rebuild failed: {type(e).__name__}: {e}")
+        hub.publish()
+        print(f"  reloaded in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+class PortfolioServer(http.server.ThreadingHTTPServer):
+    """One thread per connection, so a large video doesn't block everything else."""
+    allow_reuse_address = True
+    request_queue_size = 128  # the browser opens many connections at once
+
+def run_load(base_url, paths, requests, concurrency, keep_alive=True):
+    """Fire `requests` GETs over `concurrency` client threads; returns throughput and latency stats."""
+    url = urllib.parse.urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    latencies, errors, received = [], [0], [0]
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker():
+        conn = None
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            path = '/' + paths[i % len(paths)]
+            began = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection(host, port, timeout=30)
+                conn.request('GET', path, headers={} if keep_alive else {'Connection': 'close'})
+                response = conn.getresponse()
+                body = response.read()
+                if response.status != 200:
+                    raise http.client.HTTPException(response.status)
+                if not keep_alive or response.will_close:
+                    conn.close()
+                    conn = None
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                if conn:
+                    conn.close()
+                conn = None
+                continue
+            elapsed = time.perf_counter() - began
+            with lock:
+                latencies.append(elapsed)
+                received[0] += len(body)
+        if conn:
+            conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - started
+
+    latencies.sort()
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+    return {'requests': len(latencies), 'errors': errors[0], 'seconds': seconds,
+            'rps': len(latencies) / seconds if seconds else 0.0,
+            'mb': received[0] / 1e6, 'p50_ms': percentile(0.50), 'p99_ms': percentile(0.99)}
+
+class LegacyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """The original handler, kept as the --legacy / --bench baseline."""
     def end_headers(self):
         self.send_header('Cache-Control', 'no-cache, no-store, must-revalidate')
         self.send_header('Pragma', 'no-cache')
         self.send_header('Expires', '0')
         super().end_headers()
 
+def make_server(port, legacy=False, directory=BASE_DIR, quiet=False):
+    """The concurrent server, or with legacy=True the original single-threaded one."""
+    handler = LegacyHTTPRequestHandler if legacy else CustomHTTPRequestHandler
+    if quiet:
+        handler = type(handler.__name__, (handler,), {'log_message': lambda self, *args: None})
+    handler = functools.partial(handler, directory=str(directory))
+    if legacy:
+        return socketserver.TCPServer(("", port), handler)
+    return PortfolioServer(("", port), handler)
+
+def benchmark(args):
+    """Load-test both engines (or --target) and print a comparison."""
+    paths = args.paths or [p for p in BENCH_PATHS if (BASE_DIR / p).is_file()]
+    print(f"Benchmark: {args.requests} requests, {args.concurrency} clients, {len(paths)} paths")
+    if args.target:
+        targets = [(args.target, args.target, None)]
+    else:
+        targets = []
+        for name, legacy in (('legacy', True), ('concurrent', False)):
+            httpd = make_server(0, legacy=legacy, quiet=True)
+            threading.Thread(target=httpd.serve_forever, daemon=True).start()
+            targets.append((name, f"http://127.0.0.1:{httpd.server_address[1]}", httpd))
+
+    for name, url, httpd in targets:
+        stats = run_load(url, paths, args.requests, args.concurrency, keep_alive=not args.no_keep_alive)
+        print(f"  {name:>10}: {stats['rps']:8.1f} req/s  p50 {stats['p50_ms']:7.2f} ms  "
+              f"p99 {stats['p99_ms']:7.2f} ms  {stats['mb']:.1f} MB  {stats['errors']} errors")
+        if httpd:
+            httpd.shutdown()
+            httpd.server_close()
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--legacy', action='store_true',
+                        help='use the original single-threaded server')
+    parser.add_argument('--no-browser', action='store_true', help="don't open a browser tab")
+    parser.add_argument('--watch', action='store_true',
+                        help='rebuild changed cards/pages and live-reload open tabs')
+    parser.add_argument('--poll', action='store_true',
+                        help='with --watch: poll for changes instead of using inotify')
+    parser.add_argument('--bench', action='store_true',
+                        help='run the load generator against both engines and exit')
+    parser.add_argument('--target', help='with --bench: load-test this base URL instead')
+    parser.add_argument('--requests', type=int, default=2000, help='with --bench: total requests')
+    parser.add_argument('--concurrency', type=int, default=16, help='with --bench: client threads')
+    parser.add_argument('--paths', nargs='+', help='with --bench: paths to request')
+    parser.add_argument('--no-keep-alive', action='store_true',
+                        help='with --bench: open a new connection per request')
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args)
+        return
+
     # Change to the directory containing this script
     os.chdir(Path(__file__).parent)
+    port = args.port
+    if args.watch:
+        if args.legacy:
+            parser.error('--watch needs the concurrent server')
+        CustomHTTPRequestHandler.reload_hub = ReloadHub()
+        threading.Thread(target=watch, args=(BASE_DIR, CustomHTTPRequestHandler.reload_hub, args.poll),
+                         daemon=True).start()
     
-    with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
-        print(f"Portfolio server running at http://localhost:{PORT}")
-        print(f"Open http://localhost:{PORT}/index.html to view the new layout")
-        print(f"Open http://localhost:{PORT}/projects.html to view the projects page")
+    with make_server(port, legacy=args.legacy) as httpd:
+        print(f"Portfolio server running at http://localhost:{port}")
+        print(f"Open http://localhost:{port}/index.html to view the new layout")
+        print(f"Open http://localhost:{port}/projects.html to view the projects page")
         print("Press Ctrl+C to stop the server")
         
         # Automatically open browser
-        webbrowser.open(f'http://localhost:{PORT}/index.html')
+        if not args.no_browser:
+            webbrowser.open(f'http://localhost:{port}/index.html')
         
         try:
             httpd.serve_forever()
@@ -0,0 +1,284 @@
+"""
+converter.py: range-only fetching against the local stand-in server, the
+chunk planner and the CRF solver behind --target-kb/--target-quality.
+
+The tests that cut a real segment need ffmpeg/ffprobe on PATH and are skipped
+without them; the HTTP side and the full-download fallback run anywhere.
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import contextlib
+import functools
+import http.server
+import io
+import json
+import math
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import converter
+
+PAYLOAD = bytes(range(256)) * 40  # 10240 bytes
+
+def get(url, headers=None, method='GET'):
+    """(status, headers, body) of a request, including error statuses."""
+    request = urllib.request.Request(url, headers=headers or {}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+@contextlib.contextmanager
+def serve_without_ranges(directory):
+    """A plain static server that answers every Range request with the whole file (200)."""
+    handler = functools.partial(QuietHandler, directory=str(directory))
+    httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+class FakeCache:
+    """Stands in for SourceCache: records the full download it was asked for."""
+
+    def __init__(self, path):
+        self.path = path
+        self.fetched = []
+
+    def fetch(self, url):
+        self.fetched.append(url)
+        return self.path, False
+
+class StandInServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = Path(self.tmp.name) / 'source.mp4'
+        self.source.write_bytes(PAYLOAD)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_full_response(self):
+        with converter.serve_file(self.source) as url:
+            status, headers, body = get(url)
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['Accept-Ranges'], 'bytes')
+        self.assertEqual(body, PAYLOAD)
+
+    def test_byte_ranges(self):
+        size = len(PAYLOAD)
+        cases = {'bytes=10-19': (10, 19), 'bytes=10000-': (10000, size - 1),
+                 'bytes=-16': (size - 16, size - 1), 'bytes=10200-99999': (10200, size - 1)}
+        with converter.serve_file(self.source) as url:
+            for header, (first, last) in cases.items():
+                with self.subTest(range=header):
+                    status, headers, body = get(url, {'Range': header})
+                    self.assertEqual(status, 206)
+                    self.assertEqual(headers['Content-Range'], f"bytes {first}-{last}/{size}")
+                    self.assertEqual(body, PAYLOAD[first:last + 1])
+
+    def test_unsatisfiable_range(self):
+        with converter.serve_file(self.source) as url:
+            status, headers, _ = get(url, {'Range': f"bytes={len(PAYLOAD)}-"})
+        self.assertEqual(status, 416)
+        self.assertEqual(headers['Content-Range'], f"bytes */{len(PAYLOAD)}")
+
+    def test_head_has_no_body(self):
+        with converter.serve_file(self.source) as url:
+            status, headers, body = get(url, {'Range': 'bytes=0-0'}, method='HEAD')
+        self.assertEqual((status, headers['Content-Length'], body), (206, '1', b''))
+
+    def test_supports_ranges(self):
+        with converter.serve_file(self.source) as url:
+            self.assertTrue(converter.supports_ranges(url))
+        with serve_without_ranges(self.tmp.name) as base:
+            self.assertFalse(converter.supports_ranges(f"{base}/source.mp4"))
+
+class RangeFetchFallbackTest(unittest.TestCase):
+
+    def test_server_ignoring_ranges_falls_back_to_a_full_download(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'source.mp4').write_bytes(PAYLOAD)
+            cache = FakeCache(Path(tmp) / 'cached.mp4')
+            stderr = io.StringIO()
+            with serve_without_ranges(tmp) as base, contextlib.redirect_stderr(stderr):
+                url = f"{base}/source.mp4"
+                result = converter.fetch_clip_source(url, 10.0, 12.0, Path(tmp) / 'work',
+                                                     cache=cache)
+        self.assertEqual(result, (cache.path, 0.0, None))
+        self.assertIn('downloading the full video', stderr.getvalue())
+        self.assertEqual(cache.fetched, [url])
+
+@unittest.skipUnless(converter.has_ffmpeg(), "needs ffmpeg and ffprobe on PATH")
+class RangeFetchTest(unittest.TestCase):
+    """Cut a segment out of a served 20 s clip with a keyframe every 2 s."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.source = Path(cls.tmp.name) / 'source.mp4'
+        subprocess.run(['ffmpeg', '-y', '-nostdin', '-loglevel', 'error',
+                        '-f', 'lavfi', '-i', 'testsrc=size=160x120:rate=10:duration=20',
+                        '-c:v', 'libx264', '-g', '20', '-keyint_min', '20', '-sc_threshold', '0',
+                        '-pix_fmt', 'yuv420p', str(cls.source)], check=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_segment_covers_the_clip_and_reports_its_offset(self):
+        start, end, margin = 11.0, 13.0, 3.0
+        with tempfile.TemporaryDirectory() as work, converter.serve_file(self.source) as url:
+            segment, offset, source_id = converter.fetch_clip_source(
+                url, start, end, Path(work), margin=margin)
+            self.assertEqual(segment.name, 'segment.mkv')
+            self.assertEqual(source_id, f"{url}#{start - margin:.3f}-{end + margin:.3f}")
+            # -copyts keeps source timestamps: the segment starts at a keyframe
+            # at or before start - margin, and the clip lies inside it
+            self.assertLessEqual(offset, start - margin + 1e-3)
+            self.assertGreaterEqual(offset, start - margin - 2.0 - 1e-3)
+            self.assertAlmostEqual(offset, converter.probe_start_time(str(segment))
+                                   - converter.probe_start_time(str(self.source)), places=3)
+            _, duration = converter.probe_frames(segment)
+            self.assertGreaterEqual(offset + duration, end - 1e-3)
+            self.assertLess(segment.stat().st_size, self.source.stat().st_size)
+
+def bounds(plan):
+    return [at for at, _ in plan] + [plan[-1][0] + plan[-1][1]]
+
+class PlanChunksTest(unittest.TestCase):
+
+    def assertCovers(self, plan, start, end):
+        self.assertAlmostEqual(plan[0][0], start)
+        for (at, length), (next_at, _) in zip(plan, plan[1:]):
+            self.assertAlmostEqual(at + length, next_at)
+        self.assertAlmostEqual(sum(length for _, length in plan), end - start)
+
+    def test_even_split_without_keyframes(self):
+        plan = converter.plan_chunks(10.0, 70.0, 4, fps=12, speed=1.0)
+        self.assertCovers(plan, 10.0, 70.0)
+        self.assertEqual([round(b, 6) for b in bounds(plan)], [10.0, 25.0, 40.0, 55.0, 70.0])
+
+    def test_cuts_snap_to_the_output_frame_grid(self):
+        fps, speed, start = 7, 1.5, 3.3
+        frame = speed / fps
+        plan = converter.plan_chunks(start, 43.3, 3, fps=fps, speed=speed)
+        self.assertCovers(plan, start, 43.3)
+        for cut in bounds(plan)[1:-1]:
+            frames = (cut - start) / frame
+            self.assertAlmostEqual(frames, round(frames), places=6)
+
+    def test_cuts_move_to_the_nearest_keyframe(self):
+        plan = converter.plan_chunks(0.0, 60.0, 3, fps=10, speed=1.0,
+                                     keyframes=[8.0, 18.5, 41.0, 55.0])
+        self.assertCovers(plan, 0.0, 60.0)
+        self.assertEqual([round(b, 6) for b in bounds(plan)], [0.0, 18.5, 41.0, 60.0])
+
+    def test_short_chunks_are_merged(self):
+        # Both ideal cuts land on the same keyframe, and a cut within
+        # MIN_CHUNK_SECONDS of the end is dropped
+        plan = converter.plan_chunks(0.0, 12.0, 3, fps=10, speed=1.0, keyframes=[11.0])
+        self.assertEqual(plan, [(0.0, 12.0)])
+        plan = converter.plan_chunks(0.0, 12.0, 3, fps=10, speed=1.0, keyframes=[5.0])
+        self.assertEqual([round(b, 6) for b in bounds(plan)], [0.0, 5.0, 12.0])
+        for _, length in plan:
+            self.assertGreaterEqual(length, converter.MIN_CHUNK_SECONDS)
+
+    def test_single_chunk(self):
+        self.assertEqual(converter.plan_chunks(2.0, 9.0, 1, fps=10, speed=1.0), [(2.0, 7.0)])
+
+def sample_kb(crf):
+    """Size model for the fake sample encodes: log-size linear in CRF."""
+    return 4000 * math.exp(-0.12 * crf)
+
+def fake_sample(in_video, at, length, core, codec, crf, preset, out, measure_ssim):
+    """(bytes, SSIM) a sample encode at `crf` would give under sample_kb and a linear SSIM."""
+    return round(sample_kb(crf) * 1024 * length / 4.0), (1.0 - 0.002 * crf if measure_ssim else None)
+
+class SolveCrfTest(unittest.TestCase):
+
+    def test_linear_fit(self):
+        points = [(18, 0.99), (24, 0.97), (30, 0.95)]
+        self.assertAlmostEqual(converter._solve_crf(points, 0.96, log=False), 27.0)
+
+    def test_log_fit(self):
+        points = [(crf, sample_kb(crf)) for crf in (18, 24, 30, 36)]
+        self.assertAlmostEqual(converter._solve_crf(points, sample_kb(25.5), log=True), 25.5)
+
+    def test_flat_points(self):
+        self.assertEqual(converter._solve_crf([(20, 0.9), (30, 0.9)], 0.95, log=False), 20)
+
+class PickCrfTest(unittest.TestCase):
+    """pick_crf over a 4 s clip (one sample window) with fake sample encodes."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = Path(self.tmp.name) / 'source.mp4'
+        self.source.write_bytes(PAYLOAD)
+        self.cache = Path(self.tmp.name) / converter.CRF_CACHE_NAME
+        patcher = mock.patch.object(converter, '_encode_sample', side_effect=fake_sample)
+        self.encode = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pick(self, codec='libx264', **target):
+        return converter.pick_crf(self.source, 0.0, 4.0, 'fps=12', codec, 'medium',
+                                  cache_path=self.cache, **target)
+
+    def test_size_target_rounds_up(self):
+        # A fractional CRF rounds up, so the clip stays within the size
+        self.assertEqual(self.pick(target_kb=sample_kb(25.4)), 26)
+
+    def test_quality_target_rounds_down(self):
+        # SSIM 0.951 is reached at CRF 24.5; rounding down keeps at least that quality
+        self.assertEqual(self.pick(target_quality=0.951), 24)
+
+    def test_clamped_to_the_codec_range(self):
+        self.assertEqual(self.pick(target_kb=1e9), converter.CRF_RANGE['libx264'][0])
+        self.assertEqual(self.pick('libvpx-vp9', target_kb=1e-3),
+                         converter.CRF_RANGE['libvpx-vp9'][1])
+
+    def test_decisions_are_cached(self):
+        crf = self.pick(target_kb=sample_kb(30))
+        samples = self.encode.call_count
+        self.assertEqual(self.pick(target_kb=sample_kb(30)), crf)
+        self.assertEqual(self.encode.call_count, samples)
+        decisions = json.loads(self.cache.read_text(encoding='utf-8'))
+        self.assertEqual([entry['crf'] for entry in decisions.values()], [crf])
+
+    def test_concurrent_decisions_are_merged(self):
+        # Another encode records its decision while this one is sampling;
+        # writing this decision must keep it
+        def sample_while_another_clip_decides(*args):
+            if self.encode.call_count == 1:
+                self.other = self.pick('libvpx-vp9', target_kb=sample_kb(40))
+            return fake_sample(*args)
+
+        self.encode.side_effect = sample_while_another_clip_decides
+        crf = self.pick(target_kb=sample_kb(30))
+        decisions = json.loads(self.cache.read_text(encoding='utf-8'))
+        self.assertEqual(sorted((entry['codec'], entry['crf']) for entry in decisions.values()),
+                         [('libvpx-vp9', self.other), ('libx264', crf)])
+
+if __name__ == '__main__':
+    unittest.main()
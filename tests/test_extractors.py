@@ -0,0 +1,59 @@
+"""
+Card extraction in generate_project_pages.py.
+
+Every card in project_cards/ must yield the fields its page and search record
+are built from, and a card missing some of them must still extract.
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_project_pages as generator
+
+CARDS = sorted(generator.CARDS_DIR.rglob('*.html'))
+CARD = ('<h3 class="text-lg">Demo <span class="ml-2">x</span></h3>\n'
+        '<span class="text-sm">2024</span>\n'
+        '<p class="text-[#9eb7a8] text-sm">A demo card.</p>\n'
+        '<span class="px-2 py-1 bg-[#38e07b]/20 rounded">Python</span>\n'
+        '<img alt="Sketch" src="images/projects/demo/sketch.png"/>\n'
+        '<a href="https://example.com/demo" target="_blank"><span>Code</span></a>\n')
+
+class ExtractFieldsTest(unittest.TestCase):
+
+    def test_cards_exist(self):
+        self.assertTrue(CARDS, f"no cards under {generator.CARDS_DIR}")
+
+    def test_every_card_has_its_fields(self):
+        for card_file in CARDS:
+            fields = generator.extract_fields(card_file.read_text(encoding='utf-8'))
+            with self.subTest(card=card_file.relative_to(generator.CARDS_DIR).as_posix()):
+                self.assertEqual(fields.keys(), generator.empty_card_fields().keys())
+                self.assertTrue(fields['title'])
+                self.assertRegex(fields['year'], r'^\d{4}$')
+                self.assertTrue(fields['list'] or fields['paragraph'])
+                self.assertTrue(fields['tags'])
+                self.assertTrue(fields['video'] or fields['img'])
+                self.assertTrue(fields['links'])
+
+    def test_fields_keep_the_card_markup(self):
+        fields = generator.extract_fields(CARD)
+        self.assertEqual(fields['title'], 'Demo ')
+        self.assertEqual(fields['year'], '2024')
+        self.assertIsNone(fields['institution'])
+        self.assertIsNone(fields['list'])
+        self.assertEqual(fields['paragraph'], 'A demo card.')
+        self.assertEqual(fields['tags'], ['Python'])
+        self.assertIsNone(fields['video'])
+        self.assertEqual(fields['img'], ('Sketch', 'images/projects/demo/sketch.png'))
+        self.assertEqual(fields['links'], [('https://example.com/demo', 'Code')])
+
+    def test_empty_card(self):
+        self.assertEqual(generator.extract_fields(''), generator.empty_card_fields())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Media handling in generate_project_pages.py: lazy videos and the media part
+of each page's input hash.
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_project_pages as generator
+
+PNG_HEADER = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR'
+CARD = ('<img alt="Sketch" src="images/projects/demo/sketch.png"/>\n'
+        '<video autoplay loop muted playsinline>\n'
+        '  <source src="images/projects/demo/clip-640.mp4" type="video/mp4">\n'
+        '</video>\n')
+
+def png(width, height):
+    return PNG_HEADER + width.to_bytes(4, 'big') + height.to_bytes(4, 'big') + bytes(8)
+
+class MediaProbeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.media = self.root / 'images' / 'projects' / 'demo'
+        self.media.mkdir(parents=True)
+        (self.media / 'sketch.png').write_bytes(png(800, 600))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_probe_changes_with_image_size(self):
+        before = generator.media_probe(CARD, self.root)
+        (self.media / 'sketch.png').write_bytes(png(1600, 1200))
+        self.assertNotEqual(generator.media_probe(CARD, self.root), before)
+
+    def test_probe_changes_with_sidecar(self):
+        before = generator.media_probe(CARD, self.root)
+        sidecar = {'renditions': [{'width': 640, 'height': 360}], 'poster': {'src': 'clip.webp'}}
+        (self.media / 'clip.json').write_text(json.dumps(sidecar), encoding='utf-8')
+        with_sidecar = generator.media_probe(CARD, self.root)
+        self.assertNotEqual(with_sidecar, before)
+        sidecar['renditions'].append({'width': 1280, 'height': 720})
+        (self.media / 'clip.json').write_text(json.dumps(sidecar), encoding='utf-8')
+        self.assertNotEqual(generator.media_probe(CARD, self.root), with_sidecar)
+
+class LazyVideoTest(unittest.TestCase):
+
+    def test_autoplay_is_deferred(self):
+        media = generator.size_video('<video autoplay loop muted><source src="../x.mp4"></video>')
+        self.assertIn('data-autoplay', media)
+        self.assertIn('preload="none"', media)
+        self.assertNotRegex(media, r'\sautoplay\b')
+
+    def test_lazy_video_is_idempotent(self):
+        media = generator.size_video('<video autoplay muted><source src="../x.mp4"></video>')
+        self.assertEqual(generator.size_video(media), media)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Streamed page rendering in generate_project_pages.py.
+
+Pages are written from TEMPLATE_PARTS (TEMPLATE split into pre-encoded chunks)
+and must come out byte for byte as TEMPLATE.format would render them.
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_project_pages as generator
+
+CARDS = sorted(generator.CARDS_DIR.rglob('*.html'))
+
+def card_data(card_file):
+    return generator.build_card_data(generator.extract_fields(card_file.read_text(encoding='utf-8')))
+
+class RenderEquivalenceTest(unittest.TestCase):
+
+    def test_render_page_matches_template_format(self):
+        for card_file in CARDS:
+            data = card_data(card_file)
+            with self.subTest(card=card_file.relative_to(generator.CARDS_DIR).as_posix()):
+                self.assertEqual(generator.render_page(data), generator.TEMPLATE.format(**data))
+
+    def test_write_page_atomic_writes_the_rendered_page(self):
+        data = card_data(CARDS[0])
+        expected = generator.TEMPLATE.format(**data).encode('utf-8')
+        with tempfile.TemporaryDirectory() as tmp:
+            page = Path(tmp) / 'page.html'
+            self.assertEqual(generator.write_page_atomic(page, data), (True, len(expected)))
+            self.assertEqual(page.read_bytes(), expected)
+            self.assertEqual(generator.write_page_atomic(page, data), (False, len(expected)))
+
+    def test_changed_page_is_rewritten(self):
+        data = card_data(CARDS[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            page = Path(tmp) / 'page.html'
+            generator.write_page_atomic(page, data)
+            for changed in ({**data, 'title': data['title'] + ' (updated)'},
+                            {**data, 'links': ''}):
+                self.assertTrue(generator.write_page_atomic(page, changed)[0])
+                self.assertEqual(page.read_text(encoding='utf-8'),
+                                 generator.TEMPLATE.format(**changed))
+
+    def test_page_and_index_share_the_default_org(self):
+        for institution in (None, '', '  '):
+            fields = {**generator.empty_card_fields(), 'institution': institution}
+            self.assertEqual(generator.build_card_data(fields)['institution'], generator.DEFAULT_ORG)
+            self.assertEqual(generator.card_record(fields)['org'], generator.DEFAULT_ORG)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""
+server.py: ranges, revalidation and precompressed siblings, checked against a
+live make_server(0) instance serving a temporary directory.
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import server
+
+PAYLOAD = bytes(range(256)) * 40  # 10240 bytes
+
+def get(url, headers=None, method='GET'):
+    """(status, headers, body) of a request, including error statuses."""
+    request = urllib.request.Request(url, headers=headers or {}, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+class ServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        (root / 'clip.bin').write_bytes(PAYLOAD)
+        (root / 'app.js').write_text('console.log("plain");\n', encoding='utf-8')
+        (root / 'app.js.br').write_bytes(b'brotli body')
+        (root / 'app.js.gz').write_bytes(b'gzip body')
+        # Siblings are only served when they're at least as new as the original
+        mtime = os.stat(root / 'app.js').st_mtime
+        for sibling in ('app.js.br', 'app.js.gz'):
+            os.utime(root / sibling, (mtime + 1, mtime + 1))
+        cls.httpd = server.make_server(0, directory=root, quiet=True)
+        threading.Thread(target=cls.httpd.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.httpd.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.httpd.shutdown()
+        cls.httpd.server_close()
+        cls.tmp.cleanup()
+
+    def get(self, path, **headers):
+        return get(f"{self.base}/{path}", {k.replace('_', '-'): v for k, v in headers.items()})
+
+    def test_full_file(self):
+        status, headers, body = self.get('clip.bin')
+        self.assertEqual(status, 200)
+        self.assertEqual(body, PAYLOAD)
+        self.assertEqual(headers['Accept-Ranges'], 'bytes')
+
+    def test_closed_range(self):
+        status, headers, body = self.get('clip.bin', Range='bytes=100-199')
+        self.assertEqual(status, 206)
+        self.assertEqual(headers['Content-Range'], f'bytes 100-199/{len(PAYLOAD)}')
+        self.assertEqual(body, PAYLOAD[100:200])
+
+    def test_open_range(self):
+        status, headers, body = self.get('clip.bin', Range='bytes=10000-')
+        self.assertEqual(status, 206)
+        self.assertEqual(headers['Content-Range'], f'bytes 10000-{len(PAYLOAD) - 1}/{len(PAYLOAD)}')
+        self.assertEqual(body, PAYLOAD[10000:])
+
+    def test_suffix_range(self):
+        status, headers, body = self.get('clip.bin', Range='bytes=-500')
+        self.assertEqual(status, 206)
+        self.assertEqual(headers['Content-Range'],
+                         f'bytes {len(PAYLOAD) - 500}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}')
+        self.assertEqual(body, PAYLOAD[-500:])
+
+    def test_multiple_ranges(self):
+        status, headers, body = self.get('clip.bin', Range='bytes=0-9,20-29')
+        self.assertEqual(status, 206)
+        self.assertTrue(headers['Content-Type'].startswith('multipart/byteranges; boundary='))
+        self.assertIn(b'Content-Range: bytes 0-9/10240\r\n\r\n' + PAYLOAD[0:10], body)
+        self.assertIn(b'Content-Range: bytes 20-29/10240\r\n\r\n' + PAYLOAD[20:30], body)
+
+    def test_unsatisfiable_range(self):
+        status, headers, body = self.get('clip.bin', Range=f'bytes={len(PAYLOAD)}-')
+        self.assertEqual(status, 416)
+        self.assertEqual(headers['Content-Range'], f'bytes */{len(PAYLOAD)}')
+        self.assertEqual(body, b'')
+
+    def test_strong_and_weak_etag_revalidate(self):
+        etag = self.get('clip.bin')[1]['ETag']
+        for tag in (etag, f'W/{etag}', f'"other", {etag}'):
+            with self.subTest(if_none_match=tag):
+                status, headers, body = self.get('clip.bin', If_None_Match=tag)
+                self.assertEqual(status, 304)
+                self.assertEqual(headers['ETag'], etag)
+                self.assertEqual(body, b'')
+        self.assertEqual(self.get('clip.bin', If_None_Match='"other"')[0], 200)
+
+    def test_if_range(self):
+        etag = self.get('clip.bin')[1]['ETag']
+        status, _, body = self.get('clip.bin', Range='bytes=0-99', If_Range=etag)
+        self.assertEqual((status, body), (206, PAYLOAD[:100]))
+        # A stale validator means the client's copy is out of date: send it all
+        status, headers, body = self.get('clip.bin', Range='bytes=0-99', If_Range='"stale"')
+        self.assertEqual(status, 200)
+        self.assertNotIn('Content-Range', headers)
+        self.assertEqual(body, PAYLOAD)
+
+    def test_precompressed_siblings(self):
+        for accept, encoding, expected in (('br, gzip', 'br', b'brotli body'),
+                                           ('gzip', 'gzip', b'gzip body'),
+                                           ('gzip, br;q=0', 'gzip', b'gzip body')):
+            with self.subTest(accept_encoding=accept):
+                status, headers, body = self.get('app.js', Accept_Encoding=accept)
+                self.assertEqual(status, 200)
+                self.assertEqual(headers['Content-Encoding'], encoding)
+                self.assertEqual(headers['Vary'], 'Accept-Encoding')
+                self.assertEqual(body, expected)
+        status, headers, body = self.get('app.js', Accept_Encoding='identity')
+        self.assertEqual(status, 200)
+        self.assertIsNone(headers['Content-Encoding'])
+        self.assertEqual(headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(body, b'console.log("plain");\n')
+
+    def test_encodings_get_distinct_etags(self):
+        plain = self.get('app.js')[1]['ETag']
+        brotli = self.get('app.js', Accept_Encoding='br')[1]['ETag']
+        self.assertNotEqual(plain, brotli)
+        self.assertEqual(self.get('app.js', Accept_Encoding='br', If_None_Match=plain)[0], 200)
+
+if __name__ == '__main__':
+    unittest.main()
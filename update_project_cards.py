@@ -1,33 +1,25 @@
 #!/usr/bin/env python3
 """
 Script to update project card HTML files to include clickable links to dedicated pages.
+
+Cards are rewritten in place; build_site.py applies the same links to a copy of
+the cards in an output tree instead. Links come from project_manifest.json.
+
+--profile cards.trace.json times each card's read/wrap/write (see instrument.py).
 """
 
+import argparse
 import os
 from pathlib import Path
 
-BASE_DIR = Path("/Users/edgarcancino/Documents/Projects/edgarcancinoe.github.io")
+import instrument
+from project_manifest import load_projects
+
+BASE_DIR = Path(__file__).resolve().parent
 CARDS_DIR = BASE_DIR / "project_cards"
 
 # Mapping of card paths to dedicated page paths
-PROJECT_LINKS = {
-    'AI/Score-BasedGenerativeModeling.html': 'projects/score_based_generative_modeling.html',
-    'AI/gnn_noisy_labels.html': 'projects/gnn_noisy_labels.html',
-    'AI/xarm_ddpg_her.html': 'projects/xarm_ddpg_her.html',
-    'computer_vision/maybe_obstacle.html': 'projects/maybe_obstacle.html',
-    'data_science/truck_loading_durations.html': 'projects/truck_loading_durations.html',
-    'embedded/air_pressure_control.html': 'projects/air_pressure_control.html',
-    'embedded/sapienza_iot.html': 'projects/sapienza_iot.html',
-    'embedded/smart_parking.html': 'projects/smart_parking.html',
-    'robotics/IBVS.html': 'projects/ibvs.html',
-    'robotics/ekf_corner_detection.html': 'projects/ekf_corner_detection.html',
-    'robotics/final_implementation_manipulator.html': 'projects/puzzlebot_manipulator.html',
-    'robotics/home_ddpg_ros.html': 'projects/home_ddpg_ros.html',
-    'robotics/scene_grasp.html': 'projects/scene_grasp.html',
-    'robotics/self_driving_autonomous_vehicle.html': 'projects/self_driving_autonomous_vehicle.html',
-    'robotics/xarm6_visual_servoing.html': 'projects/xarm6_visual_servoing.html',
-    'signals/music_recognition.html': 'projects/music_recognition.html',
-}
+PROJECT_LINKS = {project['card']: project['page'] for project in load_projects()}
 
 def wrap_with_link(card_html, link_url):
     """Wrap the card div with a clickable link."""
@@ -39,8 +31,19 @@ def wrap_with_link(card_html, link_url):
         return wrapped
     return card_html
 
+def is_linked(card_html):
+    """Whether the card is already wrapped in its link."""
+    return card_html.strip().startswith('<a href=')
+
 def main():
     """Update all project card files with links."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    instrument.add_arguments(parser)
+    args = parser.parse_args()
+    with instrument.session(args, 'update_project_cards'):
+        update_cards()
+
+def update_cards():
     updated_count = 0
     
     for card_path, link_url in PROJECT_LINKS.items():
@@ -53,20 +56,25 @@ def main():
         print(f"Processing {card_path}...")
         
         # Read the card HTML
-        with open(card_file, 'r', encoding='utf-8') as f:
-            card_html = f.read()
+        with instrument.span('read', card=card_path) as info:
+            with open(card_file, 'r', encoding='utf-8') as f:
+                card_html = f.read()
+            info['bytes'] = len(card_html.encode('utf-8'))
         
         # Check if already wrapped
-        if '<a href=' in card_html and card_html.strip().startswith('<a href='):
+        if is_linked(card_html):
             print(f"  → Already has link, skipping")
             continue
         
         # Wrap with link
-        updated_html = wrap_with_link(card_html, link_url)
+        with instrument.span('wrap', card=card_path):
+            updated_html = wrap_with_link(card_html, link_url)
         
         # Write back
-        with open(card_file, 'w', encoding='utf-8') as f:
-            f.write(updated_html)
+        with instrument.span('write', card=card_path) as info:
+            with open(card_file, 'w', encoding='utf-8') as f:
+                f.write(updated_html)
+            info['bytes'] = len(updated_html.encode('utf-8'))
         
         updated_count += 1
         print(f"  ✓ Added link to {link_url}")